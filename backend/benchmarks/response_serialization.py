@@ -0,0 +1,215 @@
+"""Benchmark JSON serialization of the hot read endpoints.
+
+Builds the response payloads of a synthetic 20-hour cook (one probe
+reading per minute) and times, per endpoint, the serialization paths a
+request can take:
+
+- legacy: a validated model, re-validated against the route's
+  `response_model`, `jsonable_encoder` and stdlib `json` (FastAPI's
+  default path before it learned to dump JSON in pydantic-core).
+- fastapi: FastAPI's current default path, if the installed version
+  has it (validated model, re-validated and dumped in pydantic-core).
+- fast: `fast_json_response` on a `model_construct`-ed model.
+- fast+gzip: the same with `Accept-Encoding: gzip`.
+
+Usage (from the repository root):
+
+    python -m backend.benchmarks.response_serialization --hours 20
+"""
+
+import argparse
+import asyncio
+import inspect
+import statistics
+import time
+from datetime import datetime
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from starlette.requests import Request
+
+from ..models.dataclasses import PostCookReport, PredictionResult, SessionSummary
+from ..models.enums import (
+    ConfidenceTier,
+    CookState,
+    QualityRating,
+    WrapType,
+)
+from ..models.schemas import BatchStateResponse, LastReadingResponse, SessionStateEntry
+from ..routers import cook, report
+from ..routers.cook import _prediction_to_response, _summary_to_response
+from ..routers.fast_response import fast_json_response
+from ..routers.report import report_to_response
+
+START = datetime(2026, 7, 4, 5, 30)
+DUMP_JSON_SUPPORTED = "dump_json" in inspect.signature(serialize_response).parameters
+
+
+def build_report(minutes: int, seed: int) -> PostCookReport:
+    rng = np.random.default_rng(seed)
+    elapsed = np.arange(minutes, dtype=float)
+    actual = 40.0 + 163.0 * (1.0 - np.exp(-elapsed / (minutes / 3.0)))
+    actual += rng.normal(0.0, 0.4, minutes)
+    predicted = actual + rng.normal(0.0, 2.0, minutes)
+    return PostCookReport(
+        session_id="bench",
+        total_cook_minutes=float(minutes),
+        final_temp_f=float(actual[-1]),
+        stall_occurred=True,
+        stall_duration_minutes=140.0,
+        was_wrapped=True,
+        wrap_type=WrapType.BUTCHER_PAPER,
+        prediction_accuracy_minutes=12.5,
+        readings_count=minutes,
+        lid_opens_count=3,
+        quality_rating=QualityRating.GOOD,
+        quality_notes="Bark set before the wrap.",
+        predicted_temps=[round(p, 1) for p in predicted],
+        actual_temps=actual.tolist(),
+        residuals=[round(a - p, 1) for a, p in zip(actual, predicted)],
+    )
+
+
+def build_summary(session_id: str, minutes: int) -> SessionSummary:
+    return SessionSummary(
+        session_id=session_id,
+        created_at=START,
+        current_state=CookState.POST_STALL,
+        confidence=ConfidenceTier.MODERATE,
+        wrap_type=WrapType.BUTCHER_PAPER,
+        readings_count=minutes,
+        last_temp_f=188.4,
+        last_elapsed_minutes=float(minutes - 1),
+        lid_opens_count=3,
+        stall_duration_minutes=140.0,
+    )
+
+
+def build_prediction(minutes: int) -> PredictionResult:
+    return PredictionResult(
+        session_id="bench",
+        timestamp=START,
+        p10_minutes=minutes + 35.0,
+        p50_minutes=minutes + 60.0,
+        p90_minutes=minutes + 95.0,
+        confidence=ConfidenceTier.MODERATE,
+        current_state=CookState.POST_STALL,
+        stall_probability=0.05,
+        readings_count=minutes,
+    )
+
+
+def build_batch(n_sessions: int, minutes: int) -> BatchStateResponse:
+    entries = []
+    for i in range(n_sessions):
+        summary = build_summary(f"s{i:04d}", minutes)
+        entries.append(SessionStateEntry.model_construct(
+            session_id=summary.session_id,
+            state=_summary_to_response(summary),
+            prediction=_prediction_to_response(build_prediction(minutes), START),
+            last_reading=LastReadingResponse.model_construct(
+                temp_f=summary.last_temp_f,
+                elapsed_minutes=summary.last_elapsed_minutes,
+            ),
+        ))
+    return BatchStateResponse.model_construct(sessions=entries, missing=[])
+
+
+def _route(router, name: str):
+    return next(r for r in router.routes if r.endpoint.__name__ == name)
+
+
+def _validated(model):
+    """Rebuild a constructed model the way the endpoints used to: validated."""
+    return type(model)(**dict(model))
+
+
+def _request(accept_encoding: str) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def _timed(fn, repeat: int) -> tuple[list[float], int]:
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        size = len(fn())
+        samples.append(time.perf_counter() - t0)
+    return samples, size
+
+
+def _summary(samples: list[float]) -> str:
+    us = sorted(s * 1e6 for s in samples)
+    p95 = us[min(len(us) - 1, int(len(us) * 0.95))]
+    return (
+        f"mean {statistics.fmean(us):9.1f} us   p50 {statistics.median(us):9.1f} us"
+        f"   p95 {p95:9.1f} us"
+    )
+
+
+def measure(label: str, model, route, repeat: int) -> None:
+    loop = asyncio.new_event_loop()
+    exclude_none = route.response_model_exclude_none
+
+    def legacy() -> bytes:
+        content = loop.run_until_complete(serialize_response(
+            field=route.response_field,
+            response_content=_validated(model),
+            exclude_none=exclude_none,
+        ))
+        return JSONResponse(content).body
+
+    def fastapi_default() -> bytes:
+        return loop.run_until_complete(serialize_response(
+            field=route.response_field,
+            response_content=_validated(model),
+            exclude_none=exclude_none,
+            dump_json=True,
+        ))
+
+    def fast(accept_encoding: str):
+        request = _request(accept_encoding)
+        return lambda: fast_json_response(
+            model, request, exclude_none=exclude_none
+        ).body
+
+    paths = [("legacy", legacy)]
+    if DUMP_JSON_SUPPORTED:
+        paths.append(("fastapi", fastapi_default))
+    paths += [("fast", fast("")), ("fast+gzip", fast("gzip"))]
+
+    print(f"[{label}]")
+    try:
+        for name, fn in paths:
+            samples, size = _timed(fn, repeat)
+            print(f"  {name:<10} {_summary(samples)}   {size:8d} bytes")
+    finally:
+        loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=20.0)
+    parser.add_argument("--batch-sessions", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    minutes = int(args.hours * 60)
+    print(f"Payloads for a {args.hours:g}-hour cook ({minutes} readings)")
+    summary = build_summary("bench", minutes)
+    prediction = _prediction_to_response(build_prediction(minutes), START)
+    measure("prediction", prediction, _route(cook.router, "get_prediction"), args.repeat)
+    measure("state", _summary_to_response(summary),
+            _route(cook.router, "get_state"), args.repeat)
+    measure("report", report_to_response(build_report(minutes, args.seed)),
+            _route(report.router, "get_report"), args.repeat)
+    measure(f"batch-state x{args.batch_sessions}",
+            build_batch(args.batch_sessions, minutes),
+            _route(cook.router, "batch_state"), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
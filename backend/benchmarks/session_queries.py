@@ -0,0 +1,182 @@
+"""Benchmark per-session queries before and after the schema migrations.
+
+Builds a baseline-schema database (ISO text timestamps, no indexes) with
+many sessions, times the queries `load_session` issues (including
+timestamp decoding) and the latest-prediction query on a random sample
+of sessions, migrates it in place to the latest schema and times them
+again, along with `repository.load_session` itself.
+
+Usage (from the repository root):
+
+    python -m backend.benchmarks.session_queries --sessions 100000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from ..config import settings
+from ..database import db
+from ..database import repository as repo
+from ..database.migrations import migrate
+from ..database.session_cache import session_cache
+
+LATEST_PREDICTION_SQL = (
+    "SELECT * FROM predictions WHERE session_id = ? "
+    "ORDER BY timestamp DESC LIMIT 1"
+)
+# The queries repository.load_session runs for one session
+LOAD_SESSION_SQL = [
+    "SELECT * FROM cook_sessions WHERE id = ?",
+    "SELECT * FROM probe_readings WHERE session_id = ? ORDER BY elapsed_minutes",
+    "SELECT * FROM lid_open_events WHERE session_id = ? ORDER BY timestamp",
+    "SELECT * FROM intervention_events WHERE session_id = ? ORDER BY timestamp",
+    LATEST_PREDICTION_SQL,
+]
+
+
+async def build_legacy_database(
+    n_sessions: int, readings_per_session: int, predictions_per_session: int
+) -> None:
+    conn = await db.get_db()
+    await migrate(conn, target=1)
+    start = datetime(2025, 1, 1)
+    sessions, readings, predictions = [], [], []
+    for i in range(n_sessions):
+        session_id = f"s{i:07d}"
+        created = start + timedelta(minutes=7 * i)
+        sessions.append((
+            session_id, created.isoformat(), "beef", "brisket", 12.0, 3.0,
+            "offset", 250.0, 203.0,
+        ))
+        for m in range(readings_per_session):
+            stamp = (created + timedelta(minutes=m)).isoformat()
+            readings.append((session_id, stamp, 40.0 + m, 250.0, float(m)))
+        for p in range(predictions_per_session):
+            stamp = (created + timedelta(minutes=p * 5)).isoformat()
+            predictions.append((
+                session_id, stamp, 500.0, 600.0, 700.0, "low", "early_cook",
+            ))
+    await conn.executemany(
+        """
+        INSERT INTO cook_sessions
+            (id, created_at, meat_category, cut_type, weight_lbs,
+             thickness_inches, equipment_type, smoker_temp_f, target_temp_f)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        sessions,
+    )
+    await conn.executemany(
+        """
+        INSERT INTO probe_readings
+            (session_id, timestamp, temp_f, smoker_temp_f, elapsed_minutes)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        readings,
+    )
+    await conn.executemany(
+        """
+        INSERT INTO predictions
+            (session_id, timestamp, p10_minutes, p50_minutes, p90_minutes,
+             confidence, current_state)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        predictions,
+    )
+    await conn.commit()
+
+
+def _summary(samples: list[float]) -> str:
+    ms = sorted(s * 1000.0 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    return (
+        f"mean {statistics.fmean(ms):8.3f} ms   p50 {statistics.median(ms):8.3f} ms"
+        f"   p95 {p95:8.3f} ms"
+    )
+
+
+def _decode_timestamp(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return repo.from_epoch_ms(value)
+
+
+async def _load_session_rows(conn, session_id: str) -> None:
+    for sql in LOAD_SESSION_SQL:
+        cursor = await conn.execute(sql, (session_id,))
+        for row in await cursor.fetchall():
+            key = "created_at" if "created_at" in row.keys() else "timestamp"
+            _decode_timestamp(row[key])
+
+
+async def _timed(samples: list[float], coro) -> None:
+    t0 = time.perf_counter()
+    await coro
+    samples.append(time.perf_counter() - t0)
+
+
+async def _latest_prediction(conn, session_id: str) -> None:
+    cursor = await conn.execute(LATEST_PREDICTION_SQL, (session_id,))
+    await cursor.fetchone()
+
+
+async def measure(label: str, session_ids: list[str], full_load: bool) -> None:
+    conn = await db.get_db()
+    rows, latest, loads = [], [], []
+    for session_id in session_ids:
+        await _timed(rows, _load_session_rows(conn, session_id))
+        await _timed(latest, _latest_prediction(conn, session_id))
+        if full_load:
+            await _timed(loads, repo.load_session(session_id))
+    print(f"[{label}]")
+    print(f"  load_session queries    {_summary(rows)}")
+    print(f"  latest prediction query {_summary(latest)}")
+    if full_load:
+        print(f"  repository.load_session {_summary(loads)}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(
+        f"Building baseline database: {args.sessions} sessions, "
+        f"{args.readings} readings and {args.predictions} predictions each"
+    )
+    try:
+        t0 = time.perf_counter()
+        await build_legacy_database(args.sessions, args.readings, args.predictions)
+        print(f"  built in {time.perf_counter() - t0:.1f} s")
+
+        rng = random.Random(args.seed)
+        sample = [f"s{rng.randrange(args.sessions):07d}" for _ in range(args.samples)]
+        await measure("baseline schema", sample, full_load=False)
+
+        t0 = time.perf_counter()
+        version = await migrate(await db.get_db())
+        print(f"Migrated to version {version} in {time.perf_counter() - t0:.1f} s")
+        await measure(f"schema v{version}", sample, full_load=True)
+    finally:
+        await db.close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--readings", type=int, default=24)
+    parser.add_argument("--predictions", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Measure the database, not the session cache
+    session_cache.max_sessions = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.database_path = os.path.join(tmp, "bench.db")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
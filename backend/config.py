@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,6 +8,41 @@ class Settings(BaseSettings):
     database_path: str = "pitmaster.db"
     mc_iterations: int = 5000
     default_altitude_ft: float = 0.0
+    session_cache_max_sessions: int = 256  # 0 disables the session cache
+    session_cache_max_mb: float = 64.0
+    db_commit_mode: Literal["immediate", "group", "deferred"] = "group"
+    db_group_commit_window_ms: float = 5.0
+    db_group_commit_max_batch: int = 64
+    db_reader_connections: int = 4  # 0 routes reads to the writer connection
+    db_synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"
+    db_cache_size_mb: float = 16.0
+    db_mmap_size_mb: float = 256.0
+    reading_storage: Literal["rows", "chunks"] = "rows"
+    prediction_retention_interval_s: float = 300.0  # 0 disables retention
+    prediction_full_resolution_minutes: float = 60.0
+    prediction_downsample_minutes: float = 15.0
+    retention_vacuum_pages: int = 1000
+    archive_dir: str = "archive"
+    archive_after_days: float = 30.0  # 0 keeps finished sessions in SQLite
+    stream_keepalive_s: float = 15.0
+    stream_buffer_idle_s: float = 3600.0  # high-frequency sample buffers unused this long are dropped
+    response_compression_min_bytes: int = 1024  # 0 disables compression
+    report_cache_max_entries: int = 256  # decimated reports of finished cooks
+    metrics_loop_lag_interval_s: float = 0.5  # 0 disables event-loop lag sampling
+    profiling_token: str = ""  # empty disables X-Pitmaster-Profile request profiling
+    profile_dir: str = "profiles"
+    profile_sample_interval_ms: float = 1.0
+    trace_buffer_size: int = 200  # finished request traces kept for /traces
+    log_path: str = ""  # empty writes logs to stderr
+    log_max_bytes: int = 50 * 1024 * 1024  # rotate log_path past this size, 0 disables
+    log_backup_count: int = 5
+    log_queue_size: int = 10_000  # records beyond this are dropped, not awaited
+    log_batch_size: int = 256
+    log_sample_rates: dict[str, float] = {}  # event type -> fraction of events kept
+    prediction_max_concurrent: int = 2  # 0 runs Monte Carlo inline, without admission control
+    prediction_queue_depth: int = 32  # waiting runs before writes get 503 + Retry-After
+    prediction_degrade_queue_depth: int = 8  # waiting runs before iterations are reduced
+    prediction_degraded_iterations: int = 250
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
 
     model_config = {"env_file": ".env", "env_prefix": "PITMASTER_"}
@@ -0,0 +1,186 @@
+"""Compressed, memory-mapped archive files for finished sessions.
+
+Finished sessions are moved out of the hot SQLite tables into one
+append-only archive file per month (by session creation date). Each
+session is one self-contained segment:
+
+    header   <4sBII  magic b"PARC", format version, metadata length,
+                     reading count
+    metadata zlib-compressed JSON: the cook_sessions row and the
+             lid_open_events, intervention_events and predictions rows,
+             exactly as stored (BLOBs as base64)
+    readings one zlib-compressed block per ReadingColumns column, each
+             prefixed with its compressed length (<I)
+
+The `archived_sessions` table maps a session ID to its file, offset and
+length. Files are memory-mapped for reading, so loading an archived
+session only touches its own segment, and each reading column
+decompresses straight into a NumPy array.
+"""
+
+import base64
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, fields
+from typing import Any
+
+import numpy as np
+
+from ..config import settings
+from .reading_chunks import ReadingColumns, column_dtype
+
+_MAGIC = b"PARC"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBII")
+_BLOCK_LEN = struct.Struct("<I")
+_COLUMNS = [(f.name, np.dtype(column_dtype(f.name))) for f in fields(ReadingColumns)]
+_BYTES_KEY = "$b64"
+
+
+@dataclass
+class ArchivedRows:
+    """A session's stored rows, as kept in an archive segment.
+
+    Also the unit repository.iter_session_rows streams for export, for
+    hot and archived sessions alike.
+    """
+    session: dict[str, Any]
+    lid_open_events: list[dict[str, Any]]
+    intervention_events: list[dict[str, Any]]
+    predictions: list[dict[str, Any]]
+    readings: ReadingColumns
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {_BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _BYTES_KEY in value:
+        return base64.b64decode(value[_BYTES_KEY])
+    return value
+
+
+def _encode_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {k: _encode_value(v) for k, v in row.items()}
+
+
+def _decode_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {k: _decode_value(v) for k, v in row.items()}
+
+
+def encode_segment(rows: ArchivedRows) -> bytes:
+    """Serialize one session into an archive segment."""
+    metadata = zlib.compress(json.dumps({
+        "session": _encode_row(rows.session),
+        "lid_open_events": [_encode_row(r) for r in rows.lid_open_events],
+        "intervention_events": [_encode_row(r) for r in rows.intervention_events],
+        "predictions": [_encode_row(r) for r in rows.predictions],
+    }).encode("utf-8"))
+    parts = [
+        _HEADER.pack(_MAGIC, _FORMAT_VERSION, len(metadata), len(rows.readings)),
+        metadata,
+    ]
+    for name, dtype in _COLUMNS:
+        block = zlib.compress(
+            np.ascontiguousarray(getattr(rows.readings, name), dtype=dtype).tobytes()
+        )
+        parts.append(_BLOCK_LEN.pack(len(block)))
+        parts.append(block)
+    return b"".join(parts)
+
+
+def decode_segment(segment: bytes | memoryview) -> ArchivedRows:
+    """Parse an archive segment written by encode_segment."""
+    view = memoryview(segment)
+    magic, version, meta_len, n_readings = _HEADER.unpack_from(view, 0)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError("Not a session archive segment")
+    pos = _HEADER.size
+    metadata = json.loads(zlib.decompress(view[pos:pos + meta_len]))
+    pos += meta_len
+
+    columns = {}
+    for name, dtype in _COLUMNS:
+        (block_len,) = _BLOCK_LEN.unpack_from(view, pos)
+        pos += _BLOCK_LEN.size
+        raw = zlib.decompress(view[pos:pos + block_len])
+        columns[name] = np.frombuffer(raw, dtype=dtype, count=n_readings)
+        pos += block_len
+
+    return ArchivedRows(
+        session=_decode_row(metadata["session"]),
+        lid_open_events=[_decode_row(r) for r in metadata["lid_open_events"]],
+        intervention_events=[_decode_row(r) for r in metadata["intervention_events"]],
+        predictions=[_decode_row(r) for r in metadata["predictions"]],
+        readings=ReadingColumns(**columns),
+    )
+
+
+class ArchiveStore:
+    """Appends segments to monthly archive files and reads them via mmap."""
+
+    def __init__(self):
+        self._maps: dict[str, mmap.mmap] = {}
+        # Serializes append/discard, so discard only ever cuts its own segment
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def file_for_month(month: str) -> str:
+        return f"sessions-{month}.parc"
+
+    def _path(self, file: str) -> str:
+        return os.path.join(settings.archive_dir, file)
+
+    def append(self, file: str, segment: bytes) -> int:
+        """Append a segment durably; returns its byte offset."""
+        os.makedirs(settings.archive_dir, exist_ok=True)
+        with self._write_lock, open(self._path(file), "ab") as f:
+            offset = f.tell()
+            f.write(segment)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    def discard(self, file: str, offset: int, length: int) -> bool:
+        """Remove a segment that was appended but never recorded.
+
+        Truncates the file if the segment is still its last one; otherwise
+        (a later segment follows) leaves it in place, unreferenced and
+        harmless. Returns True if the bytes were removed.
+        """
+        path = self._path(file)
+        with self._write_lock:
+            if os.path.getsize(path) != offset + length:
+                return False
+            mapped = self._maps.pop(path, None)
+            if mapped is not None:
+                mapped.close()
+            os.truncate(path, offset)
+        return True
+
+    def read(self, file: str, offset: int, length: int) -> ArchivedRows:
+        path = self._path(file)
+        mapped = self._maps.get(path)
+        if mapped is None or offset + length > len(mapped):
+            # First read, or the file has grown since it was mapped
+            if mapped is not None:
+                mapped.close()
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = mapped
+        return decode_segment(memoryview(mapped)[offset:offset + length])
+
+    def close(self) -> None:
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+
+archive_store = ArchiveStore()
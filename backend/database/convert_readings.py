@@ -0,0 +1,68 @@
+"""Convert existing probe_readings rows to columnar reading chunks.
+
+Usage (from the repository root):
+
+    python -m backend.database.convert_readings [--batch 200] [--vacuum]
+
+Each session's rows are appended to its chunks and deleted; `--batch`
+sessions are committed together. The conversion can be interrupted and
+re-run. Set PITMASTER_READING_STORAGE=chunks so new readings are chunked
+too; loaders read both layouts, so the app can keep running meanwhile.
+"""
+
+import argparse
+import asyncio
+import time
+
+from . import repository as repo
+from .db import close_db, get_db, init_db
+from .unit_of_work import flush_pending_commits, unit_of_work
+
+
+async def convert_all(batch: int = 200, vacuum: bool = False) -> tuple[int, int]:
+    """Convert every session that still has row-stored readings.
+
+    Returns:
+        (sessions converted, readings converted)
+    """
+    await init_db()
+    db = await get_db()
+    cursor = await db.execute("SELECT DISTINCT session_id FROM probe_readings")
+    session_ids = [row[0] for row in await cursor.fetchall()]
+
+    readings = 0
+    for start in range(0, len(session_ids), batch):
+        async with unit_of_work():
+            for session_id in session_ids[start:start + batch]:
+                readings += await repo.convert_session_readings(session_id)
+        print(f"  {min(start + batch, len(session_ids))}/{len(session_ids)} sessions")
+    await flush_pending_commits()
+
+    if vacuum:
+        await db.execute("VACUUM")
+    return len(session_ids), readings
+
+
+async def _main(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    try:
+        sessions, readings = await convert_all(args.batch, args.vacuum)
+    finally:
+        await close_db()
+    print(
+        f"Converted {readings} readings in {sessions} sessions "
+        f"in {time.perf_counter() - t0:.1f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=200,
+                        help="sessions per commit")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="reclaim the freed row storage afterwards")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,16 @@
-"""aiosqlite connection management."""
+"""aiosqlite connection management.
+
+One writer connection handles every write (serialized by the unit of
+work) and a small pool of read-only connections serves read-only
+endpoints. SQLite in WAL mode lets readers run alongside the writer, and
+each aiosqlite connection has its own background thread, so reads no
+longer queue behind writes. Readers only see committed data.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
 
 import aiosqlite
 from ..config import settings
@@ -6,29 +18,123 @@ from ..config import settings
 _db: aiosqlite.Connection | None = None
 
 
+async def _apply_pragmas(db: aiosqlite.Connection) -> None:
+    """Per-connection tuning shared by the writer and the readers."""
+    await db.execute(f"PRAGMA synchronous={settings.db_synchronous}")
+    await db.execute(f"PRAGMA cache_size={-int(settings.db_cache_size_mb * 1024)}")
+    await db.execute(f"PRAGMA mmap_size={int(settings.db_mmap_size_mb * 1024 * 1024)}")
+    await db.execute("PRAGMA temp_store=MEMORY")
+
+
 async def get_db() -> aiosqlite.Connection:
-    """Get the database connection, creating it if needed."""
+    """Get the writer connection, creating it if needed."""
     global _db
     if _db is None:
         _db = await aiosqlite.connect(settings.database_path)
         _db.row_factory = aiosqlite.Row
         await _db.execute("PRAGMA journal_mode=WAL")
         await _db.execute("PRAGMA foreign_keys=ON")
+        await _apply_pragmas(_db)
     return _db
 
 
+class ReaderPool:
+    """Fixed set of read-only connections, checked out one caller at a time."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, size: int):
+        self.loop = loop
+        self.size = size
+        self.connections: list[aiosqlite.Connection] = []
+        self._opening = 0
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+
+    async def _open(self) -> aiosqlite.Connection:
+        uri = Path(settings.database_path).absolute().as_uri() + "?mode=ro"
+        db = await aiosqlite.connect(uri, uri=True, isolation_level=None)
+        db.row_factory = aiosqlite.Row
+        await db.execute("PRAGMA query_only=ON")
+        await _apply_pragmas(db)
+        return db
+
+    async def acquire(self) -> aiosqlite.Connection:
+        if self._idle.empty() and len(self.connections) + self._opening < self.size:
+            self._opening += 1
+            try:
+                db = await self._open()
+            finally:
+                self._opening -= 1
+            self.connections.append(db)
+            return db
+        return await self._idle.get()
+
+    def release(self, db: aiosqlite.Connection) -> None:
+        self._idle.put_nowait(db)
+
+    async def close(self) -> None:
+        for db in self.connections:
+            await db.close()
+        self.connections.clear()
+
+
+_readers: ReaderPool | None = None
+
+
+def _readers_enabled() -> bool:
+    return settings.db_reader_connections > 0 and settings.database_path != ":memory:"
+
+
+async def _reader_pool() -> ReaderPool:
+    global _readers
+    loop = asyncio.get_running_loop()
+    if _readers is None or _readers.loop is not loop:
+        if _readers is not None:
+            await _readers.close()
+        _readers = ReaderPool(loop, settings.db_reader_connections)
+    return _readers
+
+
+@asynccontextmanager
+async def read_connection() -> AsyncIterator[aiosqlite.Connection]:
+    """Check out a read-only connection for the duration of the block.
+
+    The block runs in one read transaction, so multi-query loads see a
+    consistent snapshot. Falls back to the writer connection when the
+    reader pool is disabled or the database is in-memory.
+    """
+    if not _readers_enabled():
+        yield await get_db()
+        return
+
+    await get_db()  # the writer creates the file and enables WAL
+    pool = await _reader_pool()
+    db = await pool.acquire()
+    try:
+        await db.execute("BEGIN")
+        try:
+            yield db
+        finally:
+            await db.execute("COMMIT")
+    finally:
+        pool.release(db)
+
+
 async def close_db() -> None:
-    """Close the database connection."""
-    global _db
+    """Close all connections, committing any pending group commit."""
+    from .archive_store import archive_store
+    from .unit_of_work import flush_pending_commits
+
+    global _db, _readers
+    archive_store.close()
+    if _readers is not None:
+        await _readers.close()
+        _readers = None
     if _db is not None:
+        await flush_pending_commits()
         await _db.close()
         _db = None
 
 
 async def init_db() -> None:
-    """Initialize database: create tables if they don't exist."""
-    from .tables import CREATE_TABLES
-    db = await get_db()
-    for sql in CREATE_TABLES:
-        await db.execute(sql)
-    await db.commit()
+    """Initialize database: create or upgrade the schema to the latest version."""
+    from .migrations import migrate
+    await migrate(await get_db())
@@ -0,0 +1,423 @@
+"""Versioned schema migrations, applied in order by init_db.
+
+The schema version lives in SQLite's `PRAGMA user_version`. Each step
+runs in its own transaction together with bumping the version, so an
+interrupted upgrade resumes from the last completed step. Steps that
+SQLite cannot run in a transaction (VACUUM) are marked
+`transactional=False` and must be idempotent. Databases
+created before versioning report version 0; step 1 is idempotent and
+brings both new and pre-versioning databases to the baseline schema.
+
+Steps are frozen once released: a step must not depend on DDL that a
+later step changes, so each one carries its own SQL.
+"""
+
+import math
+import struct
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import aiosqlite
+
+from .reading_chunks import ChunkRow, decode_chunk
+from .tables import ADDED_COLUMNS, CREATE_TABLES
+from ..services.logging_service import log_event
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[aiosqlite.Connection], Awaitable[None]]
+    transactional: bool = True
+
+
+async def _baseline(db: aiosqlite.Connection) -> None:
+    for sql in CREATE_TABLES:
+        await db.execute(sql)
+    for table, column, definition in ADDED_COLUMNS:
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        existing = {row["name"] for row in await cursor.fetchall()}
+        if column not in existing:
+            await db.execute(
+                f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+            )
+
+
+# Child-row indexes matching the repository's per-session lookups
+_V2_INDEXES = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_probe_readings_session
+    ON probe_readings (session_id, elapsed_minutes)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_predictions_session_ts
+    ON predictions (session_id, timestamp)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_lid_open_events_session_ts
+    ON lid_open_events (session_id, timestamp)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_intervention_events_session_ts
+    ON intervention_events (session_id, timestamp)
+    """,
+]
+
+
+async def _add_indexes(db: aiosqlite.Connection) -> None:
+    for sql in _V2_INDEXES:
+        await db.execute(sql)
+
+
+# Version 3 tables: timestamps as INTEGER epoch milliseconds (UTC).
+# `{table}` is filled in with a temporary name while rebuilding.
+_V3_TABLES: dict[str, str] = {
+    "cook_sessions": """
+        CREATE TABLE {table} (
+            id TEXT PRIMARY KEY,
+            created_at INTEGER NOT NULL,
+            meat_category TEXT NOT NULL,
+            cut_type TEXT NOT NULL,
+            weight_lbs REAL NOT NULL,
+            thickness_inches REAL NOT NULL,
+            equipment_type TEXT NOT NULL,
+            smoker_temp_f REAL NOT NULL,
+            target_temp_f REAL NOT NULL,
+            dinner_time INTEGER,
+            altitude_ft REAL DEFAULT 0,
+            wrap_type TEXT DEFAULT 'none',
+            current_state TEXT DEFAULT 'setup',
+            confidence TEXT DEFAULT 'low',
+            weather_ambient_temp REAL,
+            weather_wind_speed REAL,
+            weather_humidity REAL,
+            is_finished INTEGER DEFAULT 0,
+            quality_rating TEXT,
+            quality_notes TEXT DEFAULT '',
+            stall_state BLOB
+        )
+    """,
+    "probe_readings": """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            temp_f REAL NOT NULL,
+            smoker_temp_f REAL,
+            elapsed_minutes REAL NOT NULL,
+            temp_min_f REAL,
+            temp_max_f REAL,
+            temp_mean_f REAL,
+            sample_count INTEGER DEFAULT 1,
+            FOREIGN KEY (session_id) REFERENCES cook_sessions(id)
+        )
+    """,
+    "lid_open_events": """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            duration_seconds REAL DEFAULT 30,
+            FOREIGN KEY (session_id) REFERENCES cook_sessions(id)
+        )
+    """,
+    "intervention_events": """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            wrap_type TEXT NOT NULL,
+            temp_at_wrap_f REAL NOT NULL,
+            elapsed_minutes REAL NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES cook_sessions(id)
+        )
+    """,
+    "predictions": """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            p10_minutes REAL NOT NULL,
+            p50_minutes REAL NOT NULL,
+            p90_minutes REAL NOT NULL,
+            confidence TEXT NOT NULL,
+            current_state TEXT NOT NULL,
+            stall_probability REAL DEFAULT 0,
+            readings_count INTEGER DEFAULT 0,
+            FOREIGN KEY (session_id) REFERENCES cook_sessions(id)
+        )
+    """,
+}
+_V3_TIMESTAMP_COLUMNS = {"created_at", "dinner_time", "timestamp"}
+
+
+def _iso_to_epoch_ms(column: str) -> str:
+    """SQL expression converting an ISO-8601 text column to epoch ms.
+
+    Naive timestamps are taken as UTC, matching timestamps.to_epoch_ms.
+    """
+    return (
+        f"CASE WHEN typeof({column}) = 'text' THEN "
+        f"CAST(ROUND((julianday({column}) - 2440587.5) * 86400000.0) AS INTEGER) "
+        f"ELSE {column} END"
+    )
+
+
+async def _epoch_ms_timestamps(db: aiosqlite.Connection) -> None:
+    # Rebuild each table (SQLite cannot change a column's type in place),
+    # parent first so the children's foreign keys resolve to the new table.
+    for table, create_sql in _V3_TABLES.items():
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        columns = [row["name"] for row in await cursor.fetchall()]
+        select = ", ".join(
+            _iso_to_epoch_ms(c) if c in _V3_TIMESTAMP_COLUMNS else c
+            for c in columns
+        )
+        await db.execute(create_sql.format(table=f"{table}_v3"))
+        await db.execute(
+            f"INSERT INTO {table}_v3 ({', '.join(columns)}) "
+            f"SELECT {select} FROM {table}"
+        )
+        await db.execute(f"DROP TABLE {table}")
+        await db.execute(f"ALTER TABLE {table}_v3 RENAME TO {table}")
+    # Dropping the old tables dropped their indexes
+    await _add_indexes(db)
+
+
+async def _reading_chunks_table(db: aiosqlite.Connection) -> None:
+    await db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reading_chunks (
+            session_id TEXT NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            n_readings INTEGER NOT NULL,
+            base_ts INTEGER NOT NULL,
+            last_ts INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (session_id, chunk_index),
+            FOREIGN KEY (session_id) REFERENCES cook_sessions(id)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+async def _predictions_compacted_column(db: aiosqlite.Connection) -> None:
+    await db.execute(
+        "ALTER TABLE cook_sessions ADD COLUMN predictions_compacted INTEGER DEFAULT 0"
+    )
+    await db.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_cook_sessions_retention
+        ON cook_sessions (is_finished, predictions_compacted)
+        """
+    )
+
+
+async def _incremental_auto_vacuum(db: aiosqlite.Connection) -> None:
+    # auto_vacuum only changes on an empty database or through a VACUUM
+    await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    await db.execute("VACUUM")
+
+
+async def _archived_sessions_table(db: aiosqlite.Connection) -> None:
+    await db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS archived_sessions (
+            session_id TEXT PRIMARY KEY,
+            month TEXT NOT NULL,
+            file TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            archived_at INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+
+
+# Materialized per-session summary, maintained by every repository write
+_V8_SUMMARY_COLUMNS = [
+    ("readings_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("last_temp_f", "REAL"),
+    ("last_elapsed_minutes", "REAL"),
+    ("lid_opens_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("stall_active", "INTEGER NOT NULL DEFAULT 0"),
+    ("stall_start_minutes", "REAL"),
+    ("stall_duration_minutes", "REAL NOT NULL DEFAULT 0"),
+    ("latest_prediction_at", "INTEGER"),
+    ("latest_p10_minutes", "REAL"),
+    ("latest_p50_minutes", "REAL"),
+    ("latest_p90_minutes", "REAL"),
+]
+
+# stall_state blob headers as released when step 8 shipped: version 1
+# (uint16 counters) and 2. Only the stall fields are read here.
+_V8_STALL_STATE_HEADERS = {
+    1: struct.Struct("<BBHHHHdddd"),
+    2: struct.Struct("<BBIIIIdddd"),
+}
+
+
+def _v8_stall_summary(blob: Optional[bytes]) -> tuple[int, Optional[float], float]:
+    """Stall active flag, start minutes and duration of a v1/v2 blob."""
+    header = _V8_STALL_STATE_HEADERS.get(blob[0]) if blob else None
+    if header is None:
+        return 0, None, 0.0
+    _, flags, _, _, _, _, _, start_minutes, duration, _ = header.unpack_from(blob)
+    return flags & 1, None if math.isnan(start_minutes) else start_minutes, duration
+
+
+async def _session_summary_columns(db: aiosqlite.Connection) -> None:
+    for column, definition in _V8_SUMMARY_COLUMNS:
+        await db.execute(f"ALTER TABLE cook_sessions ADD COLUMN {column} {definition}")
+
+    await db.execute(
+        """
+        UPDATE cook_sessions SET
+            readings_count =
+                (SELECT COUNT(*) FROM probe_readings
+                 WHERE session_id = cook_sessions.id)
+                + (SELECT COALESCE(SUM(n_readings), 0) FROM reading_chunks
+                   WHERE session_id = cook_sessions.id),
+            lid_opens_count =
+                (SELECT COUNT(*) FROM lid_open_events
+                 WHERE session_id = cook_sessions.id)
+        """
+    )
+    await db.execute(
+        """
+        UPDATE cook_sessions SET (last_temp_f, last_elapsed_minutes) = (
+            SELECT temp_f, elapsed_minutes FROM probe_readings
+            WHERE session_id = cook_sessions.id
+            ORDER BY elapsed_minutes DESC LIMIT 1
+        )
+        """
+    )
+    await db.execute(
+        """
+        UPDATE cook_sessions SET
+            (latest_prediction_at, latest_p10_minutes, latest_p50_minutes,
+             latest_p90_minutes) = (
+            SELECT timestamp, p10_minutes, p50_minutes, p90_minutes
+            FROM predictions WHERE session_id = cook_sessions.id
+            ORDER BY timestamp DESC, id DESC LIMIT 1
+        )
+        """
+    )
+
+    # Chunked readings: the newest chunk holds the latest reading
+    cursor = await db.execute(
+        """
+        SELECT c.session_id, c.chunk_index, c.n_readings, c.base_ts, c.last_ts,
+               c.data, s.last_elapsed_minutes
+        FROM reading_chunks c JOIN cook_sessions s ON s.id = c.session_id
+        WHERE c.chunk_index = (SELECT MAX(chunk_index) FROM reading_chunks
+                               WHERE session_id = c.session_id)
+        """
+    )
+    updates = []
+    for row in await cursor.fetchall():
+        columns = decode_chunk(ChunkRow(*tuple(row)[1:6]))
+        if len(columns) == 0:
+            continue
+        elapsed = float(columns.elapsed_minutes.max())
+        if row["last_elapsed_minutes"] is None or elapsed >= row["last_elapsed_minutes"]:
+            last = int(columns.elapsed_minutes.argmax())
+            updates.append((float(columns.temp_f[last]), elapsed, row["session_id"]))
+    await db.executemany(
+        "UPDATE cook_sessions SET last_temp_f = ?, last_elapsed_minutes = ? WHERE id = ?",
+        updates,
+    )
+
+    cursor = await db.execute(
+        "SELECT id, stall_state FROM cook_sessions WHERE stall_state IS NOT NULL"
+    )
+    updates = []
+    for row in await cursor.fetchall():
+        updates.append((*_v8_stall_summary(row["stall_state"]), row["id"]))
+    await db.executemany(
+        """
+        UPDATE cook_sessions SET stall_active = ?, stall_start_minutes = ?,
+            stall_duration_minutes = ?
+        WHERE id = ?
+        """,
+        updates,
+    )
+
+
+async def _session_revisions(db: aiosqlite.Connection) -> None:
+    await db.execute(
+        "ALTER TABLE cook_sessions ADD COLUMN revision INTEGER NOT NULL DEFAULT 1"
+    )
+    await db.execute("ALTER TABLE cook_sessions ADD COLUMN updated_at INTEGER")
+    await db.execute(
+        "UPDATE cook_sessions SET updated_at = MAX(created_at, "
+        "COALESCE(latest_prediction_at, created_at))"
+    )
+    await db.execute(
+        "ALTER TABLE archived_sessions ADD COLUMN revision INTEGER NOT NULL DEFAULT 1"
+    )
+    await db.execute("ALTER TABLE archived_sessions ADD COLUMN updated_at INTEGER")
+    await db.execute("UPDATE archived_sessions SET updated_at = archived_at")
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline tables and columns", _baseline),
+    Migration(2, "per-session child row indexes", _add_indexes),
+    Migration(3, "integer epoch-ms timestamps", _epoch_ms_timestamps),
+    Migration(4, "columnar reading chunks", _reading_chunks_table),
+    Migration(5, "prediction retention bookkeeping", _predictions_compacted_column),
+    Migration(6, "incremental auto-vacuum", _incremental_auto_vacuum,
+              transactional=False),
+    Migration(7, "finished session archive index", _archived_sessions_table),
+    Migration(8, "materialized session summary", _session_summary_columns),
+    Migration(9, "per-session revisions", _session_revisions),
+]
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+async def schema_version(db: aiosqlite.Connection) -> int:
+    cursor = await db.execute("PRAGMA user_version")
+    return (await cursor.fetchone())[0]
+
+
+async def migrate(db: aiosqlite.Connection, target: Optional[int] = None) -> int:
+    """Apply every migration newer than the database's version.
+
+    Args:
+        db: Writer connection, with no transaction open.
+        target: Stop after this version (default: latest). Used by tests
+            and benchmarks to build older schemas.
+
+    Returns:
+        The schema version after migrating.
+    """
+    target = SCHEMA_VERSION if target is None else target
+    version = await schema_version(db)
+    pending = [m for m in MIGRATIONS if version < m.version <= target]
+    if not pending:
+        return version
+
+    # Table rebuilds must not cascade or fail on foreign keys, and the
+    # pragma is a no-op inside a transaction
+    await db.execute("PRAGMA foreign_keys=OFF")
+    try:
+        for migration in pending:
+            if not migration.transactional:
+                await migration.apply(db)
+                await db.execute(f"PRAGMA user_version = {migration.version}")
+            else:
+                await db.execute("BEGIN")
+                try:
+                    await migration.apply(db)
+                    await db.execute(f"PRAGMA user_version = {migration.version}")
+                    await db.commit()
+                except BaseException:
+                    await db.rollback()
+                    raise
+            log_event("schema_migrated", version=migration.version,
+                      description=migration.description)
+            version = migration.version
+    finally:
+        await db.execute("PRAGMA foreign_keys=ON")
+    return version
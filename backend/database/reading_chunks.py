@@ -0,0 +1,245 @@
+"""Columnar, chunked storage for probe readings.
+
+A `probe_readings` row carries an AUTOINCREMENT id, a session ID and an
+integer timestamp for a handful of floats. In the chunked layout each
+session's readings are appended to `reading_chunks` BLOBs instead: up to
+READINGS_PER_CHUNK packed 30-byte records of float32 values, with the
+timestamp stored as an int32 millisecond delta from the previous reading
+(the chunk's first reading has delta 0 from `base_ts`).
+
+Chunks decode with np.frombuffer into a ReadingColumns of NumPy arrays,
+so analytics never build per-reading objects. Values are stored as
+float32 and rounded on decode to the precision the app works at
+(0.001 F, 0.0001 min), which float32 holds exactly at cooking ranges.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from ..models.dataclasses import ProbeReading
+from .timestamps import from_epoch_ms, to_epoch_ms
+
+READINGS_PER_CHUNK = 240
+
+# One packed record per reading (little-endian, no padding: 30 bytes)
+RECORD_DTYPE = np.dtype([
+    ("dt_ms", "<i4"),
+    ("temp_f", "<f4"),
+    ("smoker_temp_f", "<f4"),
+    ("elapsed_minutes", "<f4"),
+    ("temp_min_f", "<f4"),
+    ("temp_max_f", "<f4"),
+    ("temp_mean_f", "<f4"),
+    ("sample_count", "<u2"),
+])
+
+_TEMP_DECIMALS = 3
+_ELAPSED_DECIMALS = 4
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+class ChunkRow(NamedTuple):
+    """One `reading_chunks` row."""
+    chunk_index: int
+    n_readings: int
+    base_ts: int  # epoch ms of the chunk's first reading
+    last_ts: int  # epoch ms of the chunk's last reading
+    data: bytes
+
+
+@dataclass
+class ReadingColumns:
+    """A session's readings as parallel arrays, ordered by elapsed time.
+
+    Optional values are NaN; `id` is -1 for readings without a row ID.
+    """
+    timestamp_ms: np.ndarray  # int64
+    temp_f: np.ndarray
+    smoker_temp_f: np.ndarray
+    elapsed_minutes: np.ndarray
+    temp_min_f: np.ndarray
+    temp_max_f: np.ndarray
+    temp_mean_f: np.ndarray
+    sample_count: np.ndarray  # int64
+    id: np.ndarray  # int64
+
+    def __len__(self) -> int:
+        return self.temp_f.size
+
+    @classmethod
+    def empty(cls) -> "ReadingColumns":
+        return cls(**{
+            f.name: np.empty(0, dtype=column_dtype(f.name)) for f in fields(cls)
+        })
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "ReadingColumns":
+        """Build from (id, timestamp_ms, temp_f, smoker_temp_f, elapsed,
+        temp_min_f, temp_max_f, temp_mean_f, sample_count) tuples."""
+        table = np.array(list(rows), dtype=np.float64).reshape(-1, 9)
+        return cls(
+            id=table[:, 0].astype(np.int64),
+            timestamp_ms=table[:, 1].astype(np.int64),
+            temp_f=table[:, 2],
+            smoker_temp_f=table[:, 3],
+            elapsed_minutes=table[:, 4],
+            temp_min_f=table[:, 5],
+            temp_max_f=table[:, 6],
+            temp_mean_f=table[:, 7],
+            sample_count=np.nan_to_num(table[:, 8], nan=1.0).astype(np.int64),
+        )
+
+    @classmethod
+    def from_readings(cls, readings: list[ProbeReading]) -> "ReadingColumns":
+        return cls.from_rows(
+            (
+                r.id if r.id is not None else -1,
+                to_epoch_ms(r.timestamp),
+                r.temp_f,
+                r.smoker_temp_f,
+                r.elapsed_minutes,
+                r.temp_min_f,
+                r.temp_max_f,
+                r.temp_mean_f,
+                r.sample_count,
+            )
+            for r in readings
+        )
+
+    def select(self, index) -> "ReadingColumns":
+        return ReadingColumns(**{
+            f.name: getattr(self, f.name)[index] for f in fields(self)
+        })
+
+    def tail(self, n: int) -> "ReadingColumns":
+        return self.select(slice(max(len(self) - n, 0), None)) if n > 0 else self.empty()
+
+    def to_readings(self, session_id: str) -> list[ProbeReading]:
+        """Materialize ProbeReading objects (for the CookSession aggregate)."""
+        def optional(values: np.ndarray) -> list[Optional[float]]:
+            return [None if v != v else v for v in values.tolist()]
+
+        return [
+            ProbeReading(
+                id=row_id if row_id >= 0 else None,
+                session_id=session_id,
+                timestamp=from_epoch_ms(ts),
+                temp_f=temp,
+                smoker_temp_f=smoker,
+                elapsed_minutes=elapsed,
+                temp_min_f=t_min,
+                temp_max_f=t_max,
+                temp_mean_f=t_mean,
+                sample_count=count,
+            )
+            for row_id, ts, temp, smoker, elapsed, t_min, t_max, t_mean, count in zip(
+                self.id.tolist(),
+                self.timestamp_ms.tolist(),
+                self.temp_f.tolist(),
+                optional(self.smoker_temp_f),
+                self.elapsed_minutes.tolist(),
+                optional(self.temp_min_f),
+                optional(self.temp_max_f),
+                optional(self.temp_mean_f),
+                self.sample_count.tolist(),
+            )
+        ]
+
+
+def column_dtype(name: str) -> type:
+    return np.int64 if name in ("timestamp_ms", "sample_count", "id") else np.float64
+
+
+def concat_columns(parts: list[ReadingColumns]) -> ReadingColumns:
+    """Concatenate column sets and order them by elapsed time (stable)."""
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return ReadingColumns.empty()
+    merged = parts[0] if len(parts) == 1 else ReadingColumns(**{
+        f.name: np.concatenate([getattr(p, f.name) for p in parts])
+        for f in fields(ReadingColumns)
+    })
+    if np.any(np.diff(merged.elapsed_minutes) < 0):
+        merged = merged.select(np.argsort(merged.elapsed_minutes, kind="stable"))
+    return merged
+
+
+def decode_chunk(chunk: ChunkRow) -> ReadingColumns:
+    """Decode one chunk's records into columns."""
+    records = np.frombuffer(chunk.data, dtype=RECORD_DTYPE, count=chunk.n_readings)
+    n = records.size
+
+    def temps(name: str) -> np.ndarray:
+        return np.round(records[name].astype(np.float64), _TEMP_DECIMALS)
+
+    return ReadingColumns(
+        timestamp_ms=chunk.base_ts + np.cumsum(records["dt_ms"], dtype=np.int64),
+        temp_f=temps("temp_f"),
+        smoker_temp_f=temps("smoker_temp_f"),
+        elapsed_minutes=np.round(
+            records["elapsed_minutes"].astype(np.float64), _ELAPSED_DECIMALS
+        ),
+        temp_min_f=temps("temp_min_f"),
+        temp_max_f=temps("temp_max_f"),
+        temp_mean_f=temps("temp_mean_f"),
+        sample_count=records["sample_count"].astype(np.int64),
+        id=np.full(n, -1, dtype=np.int64),
+    )
+
+
+def decode_chunks(chunks: Iterable[ChunkRow]) -> ReadingColumns:
+    return concat_columns([decode_chunk(c) for c in chunks])
+
+
+def append_to_chunks(
+    last_chunk: Optional[ChunkRow], columns: ReadingColumns
+) -> list[ChunkRow]:
+    """Append readings after a session's last chunk.
+
+    Returns the chunks to upsert: the last chunk with records added (if
+    it had room) followed by any new chunks. A new chunk is also started
+    when the time delta would not fit in int32.
+    """
+    timestamps = columns.timestamp_ms
+    records = np.zeros(len(columns), dtype=RECORD_DTYPE)
+    for name in ("temp_f", "smoker_temp_f", "elapsed_minutes",
+                 "temp_min_f", "temp_max_f", "temp_mean_f"):
+        records[name] = getattr(columns, name)
+    records["sample_count"] = columns.sample_count
+
+    out: list[ChunkRow] = []
+    current = last_chunk
+    data = bytearray(current.data) if current else bytearray()
+    dirty = False
+    start = 0
+    while start < len(columns):
+        if current is not None and current.n_readings < READINGS_PER_CHUNK:
+            room = READINGS_PER_CHUNK - current.n_readings
+            deltas = np.diff(timestamps[start:start + room], prepend=current.last_ts)
+            fits = np.abs(deltas) <= _INT32_MAX
+            take = deltas.size if fits.all() else int(np.argmin(fits))
+        else:
+            take = 0
+        if take == 0:
+            if dirty:
+                out.append(current._replace(data=bytes(data)))
+            index = current.chunk_index + 1 if current else 0
+            current = ChunkRow(index, 0, int(timestamps[start]), int(timestamps[start]), b"")
+            data = bytearray()
+            dirty = False
+            continue
+
+        block = records[start:start + take]
+        block["dt_ms"] = deltas[:take]
+        data += block.tobytes()
+        current = current._replace(
+            n_readings=current.n_readings + take,
+            last_ts=int(timestamps[start + take - 1]),
+        )
+        start += take
+        dirty = True
+    if dirty:
+        out.append(current._replace(data=bytes(data)))
+    return out
@@ -1,16 +1,45 @@
 """CRUD operations for cook session data."""
 
+import copy
+import math
+import struct
+import asyncio
+from array import array
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from datetime import datetime
-from typing import Optional
+from itertools import groupby
+from typing import AsyncIterator, Optional
 import aiosqlite
 
-from .db import get_db
+from ..config import settings
+from ..services.metrics import REPOSITORY_SECONDS, instrument_functions
+from ..services.tracing import trace_functions
+from .archive_store import ArchivedRows, archive_store, encode_segment
+from .db import get_db, read_connection
+from .reading_chunks import (
+    ChunkRow,
+    ReadingColumns,
+    append_to_chunks,
+    concat_columns,
+    decode_chunk,
+)
+from .session_cache import session_cache
+from .timestamps import from_epoch_ms, to_epoch_ms
+from .unit_of_work import mark_session_written, unit_of_work
 from ..models.dataclasses import (
     CookSession,
     InterventionEvent,
     LidOpenEvent,
     PredictionResult,
     ProbeReading,
+    SessionCounts,
+    SessionRevision,
+    SessionSummary,
+    SlopeHistory,
+    SlopeWindow,
+    StallState,
     WeatherSnapshot,
 )
 from ..models.enums import (
@@ -24,65 +53,207 @@ from ..models.enums import (
 )
 
 
-async def save_session(session: CookSession) -> None:
-    """Insert or update a cook session."""
-    db = await get_db()
-    await db.execute(
-        """
-        INSERT INTO cook_sessions
-            (id, created_at, meat_category, cut_type, weight_lbs,
-             thickness_inches, equipment_type, smoker_temp_f, target_temp_f,
-             dinner_time, altitude_ft, wrap_type, current_state, confidence,
-             weather_ambient_temp, weather_wind_speed, weather_humidity,
-             is_finished, quality_rating, quality_notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-            wrap_type=excluded.wrap_type,
-            current_state=excluded.current_state,
-            confidence=excluded.confidence,
-            is_finished=excluded.is_finished,
-            quality_rating=excluded.quality_rating,
-            quality_notes=excluded.quality_notes
-        """,
-        (
-            session.id,
-            session.created_at.isoformat(),
-            session.meat_category.value,
-            session.cut_type.value,
-            session.weight_lbs,
-            session.thickness_inches,
-            session.equipment_type.value,
-            session.smoker_temp_f,
-            session.target_temp_f,
-            session.dinner_time.isoformat() if session.dinner_time else None,
-            session.altitude_ft,
-            session.wrap_type.value,
-            session.current_state.value,
-            session.confidence.value,
-            session.weather.ambient_temp_f if session.weather else None,
-            session.weather.wind_speed_mph if session.weather else None,
-            session.weather.humidity_pct if session.weather else None,
-            1 if session.is_finished else 0,
-            None,
-            "",
+# Packed stall_state blob: version, flags, ring capacity/head/count,
+# consecutive-below-threshold run, then stall start temp, stall start
+# minutes, stall duration and last probe temp (NaN encodes None), then
+# the slope window's width, sample count and four running sums (taken
+# from the window's first sample), followed by `capacity` float64
+# slopes and the window's (minutes, temp) samples. Versions 1 (uint16
+# counters) and 2 have no window and are still read, starting with an
+# empty window. Version 3 kept the sums from minute 0; they are rebuilt
+# from its samples.
+_STALL_STATE_VERSION = 4
+_STALL_STATE_HEADER = struct.Struct("<BBIIIIdddddIdddd")
+_STALL_STATE_HEADERS = {
+    1: struct.Struct("<BBHHHHdddd"),
+    2: struct.Struct("<BBIIIIdddd"),
+    3: _STALL_STATE_HEADER,
+    _STALL_STATE_VERSION: _STALL_STATE_HEADER,
+}
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _window_from_samples(window_minutes: float, samples: deque) -> SlopeWindow:
+    """Rebuild a slope window's sums from its (minutes, temp) samples."""
+    window = SlopeWindow(window_minutes=window_minutes, samples=samples)
+    if samples:
+        origin = samples[0][0]
+        for t, y in samples:
+            dt = t - origin
+            window.sum_t += dt
+            window.sum_y += y
+            window.sum_tt += dt * dt
+            window.sum_ty += dt * y
+    return window
+
+
+def encode_stall_state(stall: StallState) -> bytes:
+    """Pack stall detection state into a compact blob."""
+    history = stall.slope_history
+    window = history.window
+    header = _STALL_STATE_HEADER.pack(
+        _STALL_STATE_VERSION,
+        1 if stall.in_stall else 0,
+        history.capacity,
+        history.head,
+        history.count,
+        history.below_threshold_run,
+        _nan_if_none(stall.stall_start_temp_f),
+        _nan_if_none(stall.stall_start_minutes),
+        stall.stall_duration_minutes,
+        _nan_if_none(history.last_temp_f),
+        window.window_minutes,
+        len(window.samples),
+        window.sum_t,
+        window.sum_y,
+        window.sum_tt,
+        window.sum_ty,
+    )
+    samples = array("d", [value for sample in window.samples for value in sample])
+    return header + array("d", history.values).tobytes() + samples.tobytes()
+
+
+def decode_stall_state(blob: Optional[bytes]) -> StallState:
+    """Unpack a stall_state blob. Missing or unknown blobs give a fresh state."""
+    if not blob:
+        return StallState()
+    header = _STALL_STATE_HEADERS.get(blob[0])
+    if header is None:
+        return StallState()
+    fields = header.unpack_from(blob)
+    (
+        _, flags, capacity, head, count, below_run,
+        start_temp, start_minutes, duration, last_temp,
+    ) = fields[:10]
+    ring_end = header.size + 8 * capacity
+    values = array("d")
+    values.frombytes(blob[header.size:ring_end])
+    window = SlopeWindow()
+    if len(fields) > 10:
+        window_minutes, _, sum_t, sum_y, sum_tt, sum_ty = fields[10:]
+        samples = array("d")
+        samples.frombytes(blob[ring_end:])
+        pairs = deque(zip(samples[0::2], samples[1::2]))
+        if blob[0] < _STALL_STATE_VERSION:
+            window = _window_from_samples(window_minutes, pairs)
+        else:
+            window = SlopeWindow(
+                window_minutes=window_minutes,
+                samples=pairs,
+                sum_t=sum_t, sum_y=sum_y, sum_tt=sum_tt, sum_ty=sum_ty,
+            )
+    return StallState(
+        in_stall=bool(flags & 1),
+        stall_start_temp_f=_none_if_nan(start_temp),
+        stall_start_minutes=_none_if_nan(start_minutes),
+        stall_duration_minutes=duration,
+        slope_history=SlopeHistory(
+            capacity=capacity,
+            values=values.tolist(),
+            head=head,
+            count=count,
+            below_threshold_run=below_run,
+            last_temp_f=_none_if_nan(last_temp),
+            window=window,
         ),
     )
-    await db.commit()
 
 
-async def load_session(session_id: str) -> Optional[CookSession]:
-    """Load a cook session with all related data."""
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM cook_sessions WHERE id = ?", (session_id,)
+def _write_through(session_id: Optional[str], apply) -> None:
+    """Apply a committed-with-the-unit change to the cached session."""
+    mark_session_written(session_id)
+    session_cache.update(session_id, apply)
+
+
+async def save_session(session: CookSession) -> None:
+    """Insert or update a cook session."""
+    async with unit_of_work() as db:
+        await db.execute(
+            """
+            INSERT INTO cook_sessions
+                (id, created_at, meat_category, cut_type, weight_lbs,
+                 thickness_inches, equipment_type, smoker_temp_f, target_temp_f,
+                 dinner_time, altitude_ft, wrap_type, current_state, confidence,
+                 weather_ambient_temp, weather_wind_speed, weather_humidity,
+                 is_finished, quality_rating, quality_notes, stall_state,
+                 stall_active, stall_start_minutes, stall_duration_minutes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                    ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                wrap_type=excluded.wrap_type,
+                current_state=excluded.current_state,
+                confidence=excluded.confidence,
+                is_finished=excluded.is_finished,
+                quality_rating=excluded.quality_rating,
+                quality_notes=excluded.quality_notes,
+                stall_state=excluded.stall_state,
+                stall_active=excluded.stall_active,
+                stall_start_minutes=excluded.stall_start_minutes,
+                stall_duration_minutes=excluded.stall_duration_minutes
+            """,
+            (
+                session.id,
+                to_epoch_ms(session.created_at),
+                session.meat_category.value,
+                session.cut_type.value,
+                session.weight_lbs,
+                session.thickness_inches,
+                session.equipment_type.value,
+                session.smoker_temp_f,
+                session.target_temp_f,
+                to_epoch_ms(session.dinner_time) if session.dinner_time else None,
+                session.altitude_ft,
+                session.wrap_type.value,
+                session.current_state.value,
+                session.confidence.value,
+                session.weather.ambient_temp_f if session.weather else None,
+                session.weather.wind_speed_mph if session.weather else None,
+                session.weather.humidity_pct if session.weather else None,
+                1 if session.is_finished else 0,
+                None,
+                "",
+                encode_stall_state(session.stall),
+                *_stall_summary_params(session.stall),
+            ),
+        )
+
+        def _apply(cached: CookSession) -> None:
+            cached.wrap_type = session.wrap_type
+            cached.current_state = session.current_state
+            cached.confidence = session.confidence
+            cached.is_finished = session.is_finished
+            cached.stall = copy.deepcopy(session.stall)
+
+        if session.id in session_cache:
+            _write_through(session.id, _apply)
+        else:
+            # A brand-new session has no child rows in the DB yet
+            mark_session_written(session.id)
+            session_cache.put(replace(
+                session, readings=[], predictions=[], lid_events=[], interventions=[],
+            ))
+
+
+def _stall_summary_params(stall: StallState) -> tuple:
+    return (
+        1 if stall.in_stall else 0,
+        stall.stall_start_minutes,
+        stall.stall_duration_minutes,
     )
-    row = await cursor.fetchone()
-    if row is None:
-        return None
 
+
+def _session_from_row(row: aiosqlite.Row) -> CookSession:
+    """Build a CookSession (no child rows) from a cook_sessions row."""
     session = CookSession(
         id=row["id"],
-        created_at=datetime.fromisoformat(row["created_at"]),
+        created_at=from_epoch_ms(row["created_at"]),
         meat_category=MeatCategory(row["meat_category"]),
         cut_type=CutType(row["cut_type"]),
         weight_lbs=row["weight_lbs"],
@@ -91,7 +262,7 @@ async def load_session(session_id: str) -> Optional[CookSession]:
         smoker_temp_f=row["smoker_temp_f"],
         target_temp_f=row["target_temp_f"],
         dinner_time=(
-            datetime.fromisoformat(row["dinner_time"])
+            from_epoch_ms(row["dinner_time"])
             if row["dinner_time"]
             else None
         ),
@@ -100,6 +271,7 @@ async def load_session(session_id: str) -> Optional[CookSession]:
         current_state=CookState(row["current_state"]),
         confidence=ConfidenceTier(row["confidence"]),
         is_finished=bool(row["is_finished"]),
+        stall=decode_stall_state(row["stall_state"]),
     )
 
     if row["weather_ambient_temp"] is not None:
@@ -108,180 +280,823 @@ async def load_session(session_id: str) -> Optional[CookSession]:
             wind_speed_mph=row["weather_wind_speed"] or 5.0,
             humidity_pct=row["weather_humidity"] or 50.0,
         )
+    return session
+
+
+def _lid_event_from_row(r: aiosqlite.Row) -> LidOpenEvent:
+    return LidOpenEvent(
+        id=r["id"],
+        session_id=r["session_id"],
+        timestamp=from_epoch_ms(r["timestamp"]),
+        duration_seconds=r["duration_seconds"],
+    )
+
+
+def _intervention_from_row(r: aiosqlite.Row) -> InterventionEvent:
+    return InterventionEvent(
+        id=r["id"],
+        session_id=r["session_id"],
+        timestamp=from_epoch_ms(r["timestamp"]),
+        wrap_type=WrapType(r["wrap_type"]),
+        temp_at_wrap_f=r["temp_at_wrap_f"],
+        elapsed_minutes=r["elapsed_minutes"],
+    )
+
+
+def _prediction_from_row(r: aiosqlite.Row) -> PredictionResult:
+    return PredictionResult(
+        id=r["id"],
+        session_id=r["session_id"],
+        timestamp=from_epoch_ms(r["timestamp"]),
+        p10_minutes=r["p10_minutes"],
+        p50_minutes=r["p50_minutes"],
+        p90_minutes=r["p90_minutes"],
+        confidence=ConfidenceTier(r["confidence"]),
+        current_state=CookState(r["current_state"]),
+        stall_probability=r["stall_probability"],
+        readings_count=r["readings_count"],
+    )
+
 
-    # Load readings
+@asynccontextmanager
+async def _connection(readonly: bool) -> AsyncIterator[aiosqlite.Connection]:
+    """Reader-pool connection for read-only callers, else the writer."""
+    if readonly:
+        async with read_connection() as db:
+            yield db
+    else:
+        yield await get_db()
+
+
+async def load_session(
+    session_id: str, readonly: bool = False
+) -> Optional[CookSession]:
+    """Load a cook session with all related data.
+
+    Served from the write-through session cache when possible. With
+    `readonly`, a cache miss is read from the reader pool and the result
+    is not cached: a reader only sees committed rows, so it could be
+    older than writes still pending on the writer connection. Archived
+    sessions are read from their archive file (and not cached).
+    """
+    cached = session_cache.get(session_id)
+    if cached is not None:
+        return cached
+
+    async with _connection(readonly) as db:
+        session = await _fetch_session(db, session_id)
+        if session is None:
+            archived = await _fetch_archived(db, session_id)
+            return _session_from_archive(archived) if archived else None
+    if not readonly:
+        session_cache.put(session)
+    return session
+
+
+async def _fetch_session(
+    db: aiosqlite.Connection, session_id: str
+) -> Optional[CookSession]:
     cursor = await db.execute(
-        "SELECT * FROM probe_readings WHERE session_id = ? ORDER BY elapsed_minutes",
-        (session_id,),
+        "SELECT * FROM cook_sessions WHERE id = ?", (session_id,)
     )
-    rows = await cursor.fetchall()
-    session.readings = [
-        ProbeReading(
-            id=r["id"],
-            session_id=r["session_id"],
-            timestamp=datetime.fromisoformat(r["timestamp"]),
-            temp_f=r["temp_f"],
-            smoker_temp_f=r["smoker_temp_f"],
-            elapsed_minutes=r["elapsed_minutes"],
-        )
-        for r in rows
-    ]
+    row = await cursor.fetchone()
+    if row is None:
+        return None
+    session = _session_from_row(row)
+
+    # Load readings (row and chunk storage)
+    columns = await _fetch_reading_columns(db, session_id)
+    session.readings = columns.to_readings(session_id)
 
     # Load lid events
     cursor = await db.execute(
         "SELECT * FROM lid_open_events WHERE session_id = ? ORDER BY timestamp",
         (session_id,),
     )
-    rows = await cursor.fetchall()
-    session.lid_events = [
-        LidOpenEvent(
-            id=r["id"],
-            session_id=r["session_id"],
-            timestamp=datetime.fromisoformat(r["timestamp"]),
-            duration_seconds=r["duration_seconds"],
-        )
-        for r in rows
-    ]
+    session.lid_events = [_lid_event_from_row(r) for r in await cursor.fetchall()]
 
     # Load interventions
     cursor = await db.execute(
         "SELECT * FROM intervention_events WHERE session_id = ? ORDER BY timestamp",
         (session_id,),
     )
-    rows = await cursor.fetchall()
     session.interventions = [
-        InterventionEvent(
-            id=r["id"],
-            session_id=r["session_id"],
-            timestamp=datetime.fromisoformat(r["timestamp"]),
-            wrap_type=WrapType(r["wrap_type"]),
-            temp_at_wrap_f=r["temp_at_wrap_f"],
-            elapsed_minutes=r["elapsed_minutes"],
-        )
-        for r in rows
+        _intervention_from_row(r) for r in await cursor.fetchall()
     ]
 
     # Load latest prediction
+    prediction = await _fetch_latest_prediction(db, session_id)
+    if prediction:
+        session.predictions = [prediction]
+    return session
+
+
+# --- Projection loaders: fetch only what a caller needs ---
+
+
+# Every projection loader takes `readonly`: read-only endpoints pass True
+# so a cache miss is served by the reader pool instead of the writer.
+# When the hot tables have nothing for a session, loaders fall back to
+# its archive segment, if it has been archived.
+
+
+async def load_session_header(
+    session_id: str, readonly: bool = False
+) -> Optional[CookSession]:
+    """Load only the cook_sessions row, with no readings, events or predictions."""
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        return _header_copy(cached)
+    async with _connection(readonly) as db:
+        session = await _fetch_header(db, session_id)
+        if session is None:
+            archived = await _fetch_archived(db, session_id)
+            if archived is not None:
+                session = _session_from_row(archived.session)
+        return session
+
+
+async def load_recent_readings(
+    session_id: str, limit: int, readonly: bool = False
+) -> list[ProbeReading]:
+    """Load the last `limit` readings, oldest first."""
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        return cached.readings[-limit:] if limit > 0 else []
+    async with _connection(readonly) as db:
+        readings = await _fetch_recent_readings(db, session_id, limit)
+        if not readings and limit > 0:
+            archived = await _fetch_archived(db, session_id)
+            if archived is not None:
+                readings = archived.readings.tail(limit).to_readings(session_id)
+        return readings
+
+
+async def load_latest_prediction(
+    session_id: str, readonly: bool = False
+) -> Optional[PredictionResult]:
+    """Load only the most recent prediction for a session."""
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        return cached.predictions[-1] if cached.predictions else None
+    async with _connection(readonly) as db:
+        prediction = await _fetch_latest_prediction(db, session_id)
+        if prediction is None:
+            archived = await _fetch_archived(db, session_id)
+            if archived is not None:
+                prediction = _latest_archived_prediction(archived)
+        return prediction
+
+
+async def count_session_rows(
+    session_id: str, readonly: bool = False
+) -> SessionCounts:
+    """Count a session's child rows without fetching them."""
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        return SessionCounts(
+            readings=len(cached.readings),
+            lid_events=len(cached.lid_events),
+            interventions=len(cached.interventions),
+        )
+    async with _connection(readonly) as db:
+        counts = await _fetch_counts(db, session_id)
+        if counts == SessionCounts():
+            archived = await _fetch_archived(db, session_id)
+            if archived is not None:
+                counts = SessionCounts(
+                    readings=len(archived.readings),
+                    lid_events=len(archived.lid_open_events),
+                    interventions=len(archived.intervention_events),
+                )
+        return counts
+
+
+async def load_session_summary(
+    session_id: str, readonly: bool = False
+) -> Optional[SessionSummary]:
+    """Load a session's materialized summary: one primary-key row fetch."""
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        return _summary_from_session(cached)
+    async with _connection(readonly) as db:
+        cursor = await db.execute(_SUMMARY_SQL + " WHERE id = ?", (session_id,))
+        row = await cursor.fetchone()
+        if row is not None:
+            return _summary_from_row(row)
+        archived = await _fetch_archived(db, session_id)
+        return _summary_from_archive(archived) if archived else None
+
+
+async def load_session_revision(
+    session_id: str, readonly: bool = False
+) -> Optional[SessionRevision]:
+    """Load only a session's revision and last-modified time.
+
+    One primary-key lookup (hot or archived), for validating HTTP
+    conditional requests before anything else is loaded.
+    """
+    async with _connection(readonly) as db:
+        cursor = await db.execute(
+            """
+            SELECT revision, COALESCE(updated_at, created_at) FROM cook_sessions
+            WHERE id = ?
+            UNION ALL
+            SELECT revision, updated_at FROM archived_sessions WHERE session_id = ?
+            LIMIT 1
+            """,
+            (session_id, session_id),
+        )
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    return SessionRevision(revision=row[0], updated_at=from_epoch_ms(row[1]))
+
+
+async def load_session_summaries(
+    session_ids: list[str], readonly: bool = False
+) -> dict[str, SessionSummary]:
+    """Load many sessions' summaries with one query; unknown IDs are omitted."""
+    summaries: dict[str, SessionSummary] = {}
+    missing = []
+    for session_id in dict.fromkeys(session_ids):
+        cached = session_cache.peek(session_id)
+        if cached is not None:
+            summaries[session_id] = _summary_from_session(cached)
+        else:
+            missing.append(session_id)
+    if not missing:
+        return summaries
+
+    async with _connection(readonly) as db:
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(missing), 500):
+            part = missing[start:start + 500]
+            cursor = await db.execute(
+                _SUMMARY_SQL + f" WHERE id IN ({', '.join('?' * len(part))})",
+                part,
+            )
+            for row in await cursor.fetchall():
+                summaries[row["id"]] = _summary_from_row(row)
+        archived = await _fetch_archived_many(
+            db, [sid for sid in missing if sid not in summaries]
+        )
+        for session_id, rows in archived.items():
+            summaries[session_id] = _summary_from_archive(rows)
+    return summaries
+
+
+async def load_latest_predictions(
+    session_ids: list[str], readonly: bool = False
+) -> dict[str, PredictionResult]:
+    """Load many sessions' latest predictions with one query.
+
+    Sessions without predictions are omitted.
+    """
+    predictions: dict[str, PredictionResult] = {}
+    missing = []
+    for session_id in dict.fromkeys(session_ids):
+        cached = session_cache.peek(session_id)
+        if cached is not None:
+            if cached.predictions:
+                predictions[session_id] = cached.predictions[-1]
+        else:
+            missing.append(session_id)
+    if not missing:
+        return predictions
+
+    async with _connection(readonly) as db:
+        for start in range(0, len(missing), 500):
+            part = missing[start:start + 500]
+            # One indexed latest-row probe per session, in a single statement
+            cursor = await db.execute(
+                f"""
+                SELECT * FROM predictions WHERE id IN (
+                    SELECT (SELECT p.id FROM predictions p
+                            WHERE p.session_id = s.id
+                            ORDER BY p.timestamp DESC, p.id DESC LIMIT 1)
+                    FROM cook_sessions s
+                    WHERE s.id IN ({', '.join('?' * len(part))})
+                )
+                """,
+                part,
+            )
+            for row in await cursor.fetchall():
+                predictions[row["session_id"]] = _prediction_from_row(row)
+        # Sessions with no hot prediction may have been archived
+        archived = await _fetch_archived_many(
+            db, [sid for sid in missing if sid not in predictions]
+        )
+        for session_id, rows in archived.items():
+            prediction = _latest_archived_prediction(rows)
+            if prediction is not None:
+                predictions[session_id] = prediction
+    return predictions
+
+
+async def load_reading_columns(
+    session_id: str, readonly: bool = False
+) -> ReadingColumns:
+    """Load a session's readings as NumPy columns, without ProbeReading objects."""
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        return ReadingColumns.from_readings(cached.readings)
+    async with _connection(readonly) as db:
+        columns = await _fetch_reading_columns(db, session_id)
+        if len(columns) == 0:
+            archived = await _fetch_archived(db, session_id)
+            if archived is not None:
+                columns = archived.readings
+        return columns
+
+
+async def load_session_tail(
+    session_id: str, n_readings: int = 1, readonly: bool = False
+) -> Optional[CookSession]:
+    """Load a session with only its most recent history.
+
+    Includes the header, the last `n_readings` readings, the latest
+    intervention and the latest prediction. `earlier_readings_count`
+    records how many older readings were not loaded, so
+    `session.readings_count` is still the true total.
+    """
+    cached = session_cache.peek(session_id)
+    if cached is not None:
+        session = _header_copy(cached)
+        session.readings = cached.readings[-n_readings:] if n_readings > 0 else []
+        session.earlier_readings_count = len(cached.readings) - len(session.readings)
+        session.interventions = cached.interventions[-1:]
+        session.predictions = cached.predictions[-1:]
+        return session
+
+    async with _connection(readonly) as db:
+        session = await _fetch_tail(db, session_id, n_readings)
+        if session is None:
+            archived = await _fetch_archived(db, session_id)
+            if archived is not None:
+                session = _session_from_archive(archived, with_readings=False)
+                readings = archived.readings.tail(n_readings)
+                session.readings = readings.to_readings(session_id)
+                session.earlier_readings_count = len(archived.readings) - len(readings)
+                session.interventions = session.interventions[-1:]
+        return session
+
+
+async def _fetch_tail(
+    db: aiosqlite.Connection, session_id: str, n_readings: int
+) -> Optional[CookSession]:
     cursor = await db.execute(
-        "SELECT * FROM predictions WHERE session_id = ? ORDER BY timestamp DESC LIMIT 1",
+        "SELECT * FROM cook_sessions WHERE id = ?", (session_id,)
+    )
+    row = await cursor.fetchone()
+    if row is None:
+        return None
+    session = _session_from_row(row)
+    session.readings = await _fetch_recent_readings(db, session_id, n_readings)
+    session.earlier_readings_count = row["readings_count"] - len(session.readings)
+
+    cursor = await db.execute(
+        """
+        SELECT * FROM intervention_events WHERE session_id = ?
+        ORDER BY timestamp DESC LIMIT 1
+        """,
         (session_id,),
     )
-    pred_row = await cursor.fetchone()
-    if pred_row:
-        session.predictions = [
-            PredictionResult(
-                id=pred_row["id"],
-                session_id=pred_row["session_id"],
-                timestamp=datetime.fromisoformat(pred_row["timestamp"]),
-                p10_minutes=pred_row["p10_minutes"],
-                p50_minutes=pred_row["p50_minutes"],
-                p90_minutes=pred_row["p90_minutes"],
-                confidence=ConfidenceTier(pred_row["confidence"]),
-                current_state=CookState(pred_row["current_state"]),
-                stall_probability=pred_row["stall_probability"],
-                readings_count=pred_row["readings_count"],
-            )
-        ]
+    row = await cursor.fetchone()
+    session.interventions = [_intervention_from_row(row)] if row else []
 
+    prediction = await _fetch_latest_prediction(db, session_id)
+    session.predictions = [prediction] if prediction else []
     return session
 
 
-async def save_reading(reading: ProbeReading) -> int:
-    """Save a probe reading. Returns the new row ID."""
-    db = await get_db()
+_SUMMARY_SQL = """
+    SELECT id, created_at, current_state, confidence, wrap_type, is_finished,
+           readings_count, last_temp_f, last_elapsed_minutes, lid_opens_count,
+           stall_active, stall_start_minutes, stall_duration_minutes,
+           latest_p10_minutes, latest_p50_minutes, latest_p90_minutes
+    FROM cook_sessions
+"""
+
+
+def _summary_from_row(row: aiosqlite.Row) -> SessionSummary:
+    return SessionSummary(
+        session_id=row["id"],
+        created_at=from_epoch_ms(row["created_at"]),
+        current_state=CookState(row["current_state"]),
+        confidence=ConfidenceTier(row["confidence"]),
+        wrap_type=WrapType(row["wrap_type"]),
+        is_finished=bool(row["is_finished"]),
+        readings_count=row["readings_count"],
+        last_temp_f=row["last_temp_f"],
+        last_elapsed_minutes=row["last_elapsed_minutes"] or 0.0,
+        lid_opens_count=row["lid_opens_count"],
+        stall_active=bool(row["stall_active"]),
+        stall_start_minutes=row["stall_start_minutes"],
+        stall_duration_minutes=row["stall_duration_minutes"],
+        latest_p10_minutes=row["latest_p10_minutes"],
+        latest_p50_minutes=row["latest_p50_minutes"],
+        latest_p90_minutes=row["latest_p90_minutes"],
+    )
+
+
+def _summary_from_session(session: CookSession) -> SessionSummary:
+    """Summary of a fully loaded (cached) session."""
+    last = None
+    if session.readings:
+        # Same rule as the summary columns: greatest elapsed, newest on ties
+        last = max(reversed(session.readings), key=lambda r: r.elapsed_minutes)
+    latest = session.predictions[-1] if session.predictions else None
+    return SessionSummary(
+        session_id=session.id,
+        created_at=from_epoch_ms(to_epoch_ms(session.created_at)),
+        current_state=session.current_state,
+        confidence=session.confidence,
+        wrap_type=session.wrap_type,
+        is_finished=session.is_finished,
+        readings_count=session.readings_count,
+        last_temp_f=last.temp_f if last else None,
+        last_elapsed_minutes=last.elapsed_minutes if last else 0.0,
+        lid_opens_count=len(session.lid_events),
+        stall_active=session.stall.in_stall,
+        stall_start_minutes=session.stall.stall_start_minutes,
+        stall_duration_minutes=session.stall.stall_duration_minutes,
+        latest_p10_minutes=latest.p10_minutes if latest else None,
+        latest_p50_minutes=latest.p50_minutes if latest else None,
+        latest_p90_minutes=latest.p90_minutes if latest else None,
+    )
+
+
+def _summary_from_archive(archived: ArchivedRows) -> SessionSummary:
+    # Sessions archived before the summary columns existed lack them in
+    # their stored row, so derive everything from the archived rows
+    session = _session_from_archive(archived, with_readings=False)
+    summary = _summary_from_session(session)
+    summary.readings_count = len(archived.readings)
+    if len(archived.readings):
+        summary.last_temp_f = float(archived.readings.temp_f[-1])
+        summary.last_elapsed_minutes = float(archived.readings.elapsed_minutes[-1])
+    return summary
+
+
+def _header_copy(cached: CookSession) -> CookSession:
+    return replace(
+        cached, readings=[], predictions=[], lid_events=[], interventions=[],
+        stall=copy.deepcopy(cached.stall),
+    )
+
+
+async def _fetch_header(
+    db: aiosqlite.Connection, session_id: str
+) -> Optional[CookSession]:
     cursor = await db.execute(
-        """
-        INSERT INTO probe_readings (session_id, timestamp, temp_f, smoker_temp_f, elapsed_minutes)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (
-            reading.session_id,
-            reading.timestamp.isoformat(),
-            reading.temp_f,
-            reading.smoker_temp_f,
-            reading.elapsed_minutes,
-        ),
+        "SELECT * FROM cook_sessions WHERE id = ?", (session_id,)
     )
-    await db.commit()
-    return cursor.lastrowid
+    row = await cursor.fetchone()
+    return _session_from_row(row) if row else None
 
 
-async def save_lid_event(event: LidOpenEvent) -> int:
-    """Save a lid-open event."""
-    db = await get_db()
+# Reading storage: rows in probe_readings and/or chunks in reading_chunks
+# (see reading_chunks.py). Loaders read both and merge by elapsed time, so
+# sessions written under either PITMASTER_READING_STORAGE setting, or
+# partly converted, load the same way.
+
+_READING_COLUMNS_SQL = """
+    SELECT id, timestamp, temp_f, smoker_temp_f, elapsed_minutes,
+           temp_min_f, temp_max_f, temp_mean_f, sample_count
+    FROM probe_readings WHERE session_id = ?
+"""
+
+_CHUNKS_SQL = """
+    SELECT chunk_index, n_readings, base_ts, last_ts, data
+    FROM reading_chunks WHERE session_id = ?
+"""
+
+
+async def _fetch_reading_columns(
+    db: aiosqlite.Connection, session_id: str
+) -> ReadingColumns:
+    cursor = await db.execute(_CHUNKS_SQL + " ORDER BY chunk_index", (session_id,))
+    parts = [decode_chunk(ChunkRow(*r)) for r in await cursor.fetchall()]
     cursor = await db.execute(
-        """
-        INSERT INTO lid_open_events (session_id, timestamp, duration_seconds)
-        VALUES (?, ?, ?)
-        """,
-        (event.session_id, event.timestamp.isoformat(), event.duration_seconds),
+        _READING_COLUMNS_SQL + " ORDER BY elapsed_minutes", (session_id,)
     )
-    await db.commit()
-    return cursor.lastrowid
+    parts.append(ReadingColumns.from_rows(tuple(r) for r in await cursor.fetchall()))
+    return concat_columns(parts)
 
 
-async def save_intervention(event: InterventionEvent) -> int:
-    """Save an intervention event."""
-    db = await get_db()
+async def _fetch_recent_readings(
+    db: aiosqlite.Connection, session_id: str, limit: int
+) -> list[ProbeReading]:
+    if limit <= 0:
+        return []
     cursor = await db.execute(
-        """
-        INSERT INTO intervention_events (session_id, timestamp, wrap_type, temp_at_wrap_f, elapsed_minutes)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (
-            event.session_id,
-            event.timestamp.isoformat(),
-            event.wrap_type.value,
-            event.temp_at_wrap_f,
-            event.elapsed_minutes,
-        ),
+        _READING_COLUMNS_SQL + " ORDER BY elapsed_minutes DESC LIMIT ?",
+        (session_id, limit),
+    )
+    rows = ReadingColumns.from_rows(
+        tuple(r) for r in reversed(await cursor.fetchall())
+    )
+
+    # Newest chunks first, until they hold at least `limit` readings
+    cursor = await db.execute(
+        _CHUNKS_SQL + " ORDER BY chunk_index DESC", (session_id,)
     )
-    await db.commit()
-    return cursor.lastrowid
+    chunks: list[ReadingColumns] = []
+    loaded = 0
+    async for r in cursor:
+        chunks.append(decode_chunk(ChunkRow(*r)))
+        loaded += len(chunks[-1])
+        if loaded >= limit:
+            break
+    columns = concat_columns([*reversed(chunks), rows]).tail(limit)
+    return columns.to_readings(session_id)
 
 
-async def save_prediction(prediction: PredictionResult) -> int:
-    """Save a prediction result."""
-    db = await get_db()
+async def _fetch_latest_prediction(
+    db: aiosqlite.Connection, session_id: str
+) -> Optional[PredictionResult]:
+    cursor = await db.execute(
+        "SELECT * FROM predictions WHERE session_id = ? ORDER BY timestamp DESC LIMIT 1",
+        (session_id,),
+    )
+    row = await cursor.fetchone()
+    return _prediction_from_row(row) if row else None
+
+
+async def _fetch_counts(db: aiosqlite.Connection, session_id: str) -> SessionCounts:
     cursor = await db.execute(
         """
-        INSERT INTO predictions
-            (session_id, timestamp, p10_minutes, p50_minutes, p90_minutes,
-             confidence, current_state, stall_probability, readings_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        SELECT
+            (SELECT COUNT(*) FROM probe_readings WHERE session_id = ?)
+            + (SELECT COALESCE(SUM(n_readings), 0)
+               FROM reading_chunks WHERE session_id = ?),
+            (SELECT COUNT(*) FROM lid_open_events WHERE session_id = ?),
+            (SELECT COUNT(*) FROM intervention_events WHERE session_id = ?)
         """,
-        (
-            prediction.session_id,
-            prediction.timestamp.isoformat(),
-            prediction.p10_minutes,
-            prediction.p50_minutes,
-            prediction.p90_minutes,
-            prediction.confidence.value,
-            prediction.current_state.value,
-            prediction.stall_probability,
-            prediction.readings_count,
-        ),
+        (session_id, session_id, session_id, session_id),
+    )
+    readings, lid_events, interventions = await cursor.fetchone()
+    return SessionCounts(
+        readings=readings, lid_events=lid_events, interventions=interventions
     )
-    await db.commit()
-    return cursor.lastrowid
 
 
-async def update_session_state(
-    session_id: str, state: str, confidence: str, wrap_type: str | None = None
+_INSERT_READING_SQL = """
+    INSERT INTO probe_readings
+        (session_id, timestamp, temp_f, smoker_temp_f, elapsed_minutes,
+         temp_min_f, temp_max_f, temp_mean_f, sample_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _reading_params(reading: ProbeReading) -> tuple:
+    return (
+        reading.session_id,
+        to_epoch_ms(reading.timestamp),
+        reading.temp_f,
+        reading.smoker_temp_f,
+        reading.elapsed_minutes,
+        reading.temp_min_f,
+        reading.temp_max_f,
+        reading.temp_mean_f,
+        reading.sample_count,
+    )
+
+
+# Summary columns on cook_sessions (see SessionSummary) are updated in
+# the same unit of work as the rows they summarize. "Last" reading and
+# "latest" prediction follow the loaders' ordering: greatest elapsed
+# time and greatest timestamp, with ties going to the newest write.
+
+_READING_SUMMARY_SQL = """
+    UPDATE cook_sessions SET
+        readings_count = readings_count + :count,
+        last_temp_f = CASE
+            WHEN last_elapsed_minutes IS NULL OR :elapsed >= last_elapsed_minutes
+            THEN :temp ELSE last_temp_f END,
+        last_elapsed_minutes = MAX(COALESCE(last_elapsed_minutes, :elapsed), :elapsed)
+    WHERE id = :session_id
+"""
+
+
+async def _update_reading_summary(
+    db: aiosqlite.Connection, session_id: str, readings: list[ProbeReading]
 ) -> None:
-    """Update session state fields."""
-    db = await get_db()
-    if wrap_type:
+    # max() keeps the first of equal keys; the newest write should win
+    last = max(reversed(readings), key=lambda r: r.elapsed_minutes)
+    await db.execute(_READING_SUMMARY_SQL, {
+        "count": len(readings),
+        "elapsed": last.elapsed_minutes,
+        "temp": last.temp_f,
+        "session_id": session_id,
+    })
+
+
+_UPSERT_CHUNK_SQL = """
+    INSERT OR REPLACE INTO reading_chunks
+        (session_id, chunk_index, n_readings, base_ts, last_ts, data)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+async def append_reading_chunks(
+    db: aiosqlite.Connection, session_id: str, columns: ReadingColumns
+) -> None:
+    """Append readings to a session's chunks (inside an open unit of work)."""
+    cursor = await db.execute(
+        _CHUNKS_SQL + " ORDER BY chunk_index DESC LIMIT 1", (session_id,)
+    )
+    row = await cursor.fetchone()
+    chunks = append_to_chunks(ChunkRow(*row) if row else None, columns)
+    await db.executemany(_UPSERT_CHUNK_SQL, [(session_id, *c) for c in chunks])
+
+
+async def convert_session_readings(session_id: str) -> int:
+    """Move a session's probe_readings rows into its reading chunks.
+
+    Returns the number of readings converted.
+    """
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            _READING_COLUMNS_SQL + " ORDER BY elapsed_minutes", (session_id,)
+        )
+        columns = ReadingColumns.from_rows(tuple(r) for r in await cursor.fetchall())
+        if len(columns) == 0:
+            return 0
+        await append_reading_chunks(db, session_id, columns)
         await db.execute(
-            "UPDATE cook_sessions SET current_state=?, confidence=?, wrap_type=? WHERE id=?",
-            (state, confidence, wrap_type, session_id),
+            "DELETE FROM probe_readings WHERE session_id = ?", (session_id,)
+        )
+        # Cached readings still carry the row IDs that were just dropped
+        mark_session_written(session_id)
+        session_cache.invalidate(session_id)
+    return len(columns)
+
+
+async def save_reading(reading: ProbeReading) -> Optional[int]:
+    """Save a probe reading. Returns the new row ID (None for chunk storage)."""
+    async with unit_of_work() as db:
+        if settings.reading_storage == "chunks":
+            await append_reading_chunks(
+                db, reading.session_id, ReadingColumns.from_readings([reading])
+            )
+        else:
+            cursor = await db.execute(_INSERT_READING_SQL, _reading_params(reading))
+            reading.id = cursor.lastrowid
+        await _update_reading_summary(db, reading.session_id, [reading])
+        _write_through(
+            reading.session_id, lambda s: s.readings.append(reading)
+        )
+        return reading.id
+
+
+async def save_readings(readings: list[ProbeReading]) -> None:
+    """Save many probe readings in one transaction (one executemany)."""
+    async with unit_of_work() as db:
+        if settings.reading_storage == "chunks":
+            for session_id, group in groupby(readings, key=lambda r: r.session_id):
+                await append_reading_chunks(
+                    db, session_id, ReadingColumns.from_readings(list(group))
+                )
+        else:
+            await db.executemany(
+                _INSERT_READING_SQL, [_reading_params(r) for r in readings]
+            )
+        for session_id, group in groupby(readings, key=lambda r: r.session_id):
+            await _update_reading_summary(db, session_id, list(group))
+        for reading in readings:
+            _write_through(
+                reading.session_id, lambda s, r=reading: s.readings.append(r)
+            )
+
+
+async def save_lid_event(event: LidOpenEvent) -> int:
+    """Save a lid-open event."""
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            """
+            INSERT INTO lid_open_events (session_id, timestamp, duration_seconds)
+            VALUES (?, ?, ?)
+            """,
+            (event.session_id, to_epoch_ms(event.timestamp), event.duration_seconds),
         )
-    else:
         await db.execute(
-            "UPDATE cook_sessions SET current_state=?, confidence=? WHERE id=?",
-            (state, confidence, session_id),
+            "UPDATE cook_sessions SET lid_opens_count = lid_opens_count + 1 WHERE id = ?",
+            (event.session_id,),
         )
-    await db.commit()
+        event.id = cursor.lastrowid
+        _write_through(event.session_id, lambda s: s.lid_events.append(event))
+        return cursor.lastrowid
+
+
+async def save_intervention(event: InterventionEvent) -> int:
+    """Save an intervention event."""
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            """
+            INSERT INTO intervention_events (session_id, timestamp, wrap_type, temp_at_wrap_f, elapsed_minutes)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                event.session_id,
+                to_epoch_ms(event.timestamp),
+                event.wrap_type.value,
+                event.temp_at_wrap_f,
+                event.elapsed_minutes,
+            ),
+        )
+        event.id = cursor.lastrowid
+        _write_through(
+            event.session_id, lambda s: s.interventions.append(event)
+        )
+        return cursor.lastrowid
+
+
+async def save_prediction(prediction: PredictionResult) -> int:
+    """Save a prediction result."""
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            """
+            INSERT INTO predictions
+                (session_id, timestamp, p10_minutes, p50_minutes, p90_minutes,
+                 confidence, current_state, stall_probability, readings_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                prediction.session_id,
+                to_epoch_ms(prediction.timestamp),
+                prediction.p10_minutes,
+                prediction.p50_minutes,
+                prediction.p90_minutes,
+                prediction.confidence.value,
+                prediction.current_state.value,
+                prediction.stall_probability,
+                prediction.readings_count,
+            ),
+        )
+        prediction.id = cursor.lastrowid
+        await db.execute(
+            """
+            UPDATE cook_sessions SET
+                latest_prediction_at = :ts,
+                latest_p10_minutes = :p10,
+                latest_p50_minutes = :p50,
+                latest_p90_minutes = :p90
+            WHERE id = :session_id
+              AND (latest_prediction_at IS NULL OR :ts >= latest_prediction_at)
+            """,
+            {
+                "ts": to_epoch_ms(prediction.timestamp),
+                "p10": prediction.p10_minutes,
+                "p50": prediction.p50_minutes,
+                "p90": prediction.p90_minutes,
+                "session_id": prediction.session_id,
+            },
+        )
+
+        def _apply(cached: CookSession) -> None:
+            cached.predictions = [prediction]  # load_session keeps only the latest
+
+        _write_through(prediction.session_id, _apply)
+        return cursor.lastrowid
+
+
+async def update_session_state(
+    session_id: str,
+    state: str,
+    confidence: str,
+    wrap_type: str | None = None,
+    stall: StallState | None = None,
+) -> None:
+    """Update session state fields, optionally persisting stall state."""
+    async with unit_of_work() as db:
+        assignments = ["current_state=?", "confidence=?"]
+        params: list = [state, confidence]
+        if wrap_type:
+            assignments.append("wrap_type=?")
+            params.append(wrap_type)
+        if stall is not None:
+            assignments.extend([
+                "stall_state=?", "stall_active=?", "stall_start_minutes=?",
+                "stall_duration_minutes=?",
+            ])
+            params.extend([encode_stall_state(stall), *_stall_summary_params(stall)])
+        params.append(session_id)
+        await db.execute(
+            f"UPDATE cook_sessions SET {', '.join(assignments)} WHERE id=?",
+            params,
+        )
+
+        def _apply(cached: CookSession) -> None:
+            cached.current_state = CookState(state)
+            cached.confidence = ConfidenceTier(confidence)
+            if wrap_type:
+                cached.wrap_type = WrapType(wrap_type)
+            if stall is not None:
+                cached.stall = copy.deepcopy(stall)
+
+        _write_through(session_id, _apply)
 
 
 async def finish_session(
@@ -290,9 +1105,439 @@ async def finish_session(
     quality_notes: str = "",
 ) -> None:
     """Mark session as finished."""
+    async with unit_of_work() as db:
+        await db.execute(
+            "UPDATE cook_sessions SET is_finished=1, current_state='done', quality_rating=?, quality_notes=? WHERE id=?",
+            (quality_rating, quality_notes, session_id),
+        )
+
+        def _apply(cached: CookSession) -> None:
+            cached.is_finished = True
+            cached.current_state = CookState.DONE
+
+        _write_through(session_id, _apply)
+
+
+# --- Prediction retention (driven by services/retention_service.py) ---
+
+# Predictions ranked within a session: whether each changed the cook
+# state relative to the previous one, and its recency within its time
+# bucket. The first prediction has state_changed NULL and is always kept.
+_RANKED_PREDICTIONS_SQL = """
+    SELECT id, timestamp,
+           current_state != LAG(current_state) OVER by_time AS state_changed,
+           ROW_NUMBER() OVER (
+               PARTITION BY timestamp / :bucket_ms
+               ORDER BY timestamp DESC, id DESC
+           ) AS bucket_rank,
+           ROW_NUMBER() OVER (ORDER BY timestamp DESC, id DESC) AS recency
+    FROM predictions
+    WHERE session_id = :session_id
+    WINDOW by_time AS (ORDER BY timestamp, id)
+"""
+
+
+async def downsample_predictions(
+    session_id: str, full_resolution_ms: int, bucket_ms: int
+) -> int:
+    """Thin out a session's older prediction history.
+
+    Predictions within `full_resolution_ms` of the session's latest one
+    are kept; older ones are reduced to the latest per `bucket_ms`
+    bucket plus every state change. Returns the number deleted.
+    """
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            f"""
+            DELETE FROM predictions WHERE id IN (
+                SELECT id FROM ({_RANKED_PREDICTIONS_SQL})
+                WHERE timestamp < (
+                        SELECT MAX(timestamp) FROM predictions
+                        WHERE session_id = :session_id
+                    ) - :full_resolution_ms
+                  AND bucket_rank > 1
+                  AND NOT COALESCE(state_changed, 1)
+            )
+            """,
+            {
+                "session_id": session_id,
+                "bucket_ms": bucket_ms,
+                "full_resolution_ms": full_resolution_ms,
+            },
+        )
+        return cursor.rowcount
+
+
+async def compact_predictions(session_id: str) -> int:
+    """Reduce a finished session's predictions to a summary.
+
+    Keeps the first prediction, every state change and the final
+    prediction, and marks the session compacted. Returns the number
+    deleted.
+    """
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            f"""
+            DELETE FROM predictions WHERE id IN (
+                SELECT id FROM ({_RANKED_PREDICTIONS_SQL})
+                WHERE recency > 1 AND NOT COALESCE(state_changed, 1)
+            )
+            """,
+            {"session_id": session_id, "bucket_ms": 1},
+        )
+        await db.execute(
+            "UPDATE cook_sessions SET predictions_compacted = 1 WHERE id = ?",
+            (session_id,),
+        )
+        return cursor.rowcount
+
+
+async def list_retention_candidates(limit: int) -> tuple[list[str], list[str]]:
+    """Session IDs due for retention work: (active, finished uncompacted)."""
     db = await get_db()
-    await db.execute(
-        "UPDATE cook_sessions SET is_finished=1, current_state='done', quality_rating=?, quality_notes=? WHERE id=?",
-        (quality_rating, quality_notes, session_id),
+    cursor = await db.execute(
+        "SELECT id FROM cook_sessions WHERE is_finished = 0"
     )
-    await db.commit()
+    active = [row[0] for row in await cursor.fetchall()]
+    cursor = await db.execute(
+        """
+        SELECT id FROM cook_sessions
+        WHERE is_finished = 1 AND predictions_compacted = 0
+        LIMIT ?
+        """,
+        (limit,),
+    )
+    finished = [row[0] for row in await cursor.fetchall()]
+    return active, finished
+
+
+async def incremental_vacuum(max_pages: int) -> int:
+    """Return up to `max_pages` free pages to the filesystem.
+
+    Returns the number of free pages left afterwards.
+    """
+    async with unit_of_work() as db:
+        cursor = await db.execute(f"PRAGMA incremental_vacuum({int(max_pages)})")
+        await cursor.fetchall()
+        cursor = await db.execute("PRAGMA freelist_count")
+        return (await cursor.fetchone())[0]
+
+
+# --- Archive of finished sessions (see archive_store.py) ---
+
+# Hot tables holding a session's child rows, cleared when it is archived
+_CHILD_TABLES = (
+    "probe_readings",
+    "reading_chunks",
+    "lid_open_events",
+    "intervention_events",
+    "predictions",
+)
+
+
+def _row_dict(row: aiosqlite.Row) -> dict:
+    return dict(zip(row.keys(), row))
+
+
+async def _fetch_archived(
+    db: aiosqlite.Connection, session_id: str
+) -> Optional[ArchivedRows]:
+    cursor = await db.execute(
+        "SELECT file, offset, length FROM archived_sessions WHERE session_id = ?",
+        (session_id,),
+    )
+    row = await cursor.fetchone()
+    if row is None:
+        return None
+    return archive_store.read(row["file"], row["offset"], row["length"])
+
+
+async def _fetch_archived_many(
+    db: aiosqlite.Connection, session_ids: list[str]
+) -> dict[str, ArchivedRows]:
+    """Archived rows for whichever of `session_ids` are archived.
+
+    One set-based index lookup per 500 IDs; segments are then read in
+    file order.
+    """
+    locations = []
+    for start in range(0, len(session_ids), 500):
+        part = session_ids[start:start + 500]
+        cursor = await db.execute(
+            "SELECT session_id, file, offset, length FROM archived_sessions "
+            f"WHERE session_id IN ({', '.join('?' * len(part))})",
+            part,
+        )
+        locations.extend(await cursor.fetchall())
+    locations.sort(key=lambda row: (row["file"], row["offset"]))
+    return {
+        row["session_id"]: archive_store.read(row["file"], row["offset"], row["length"])
+        for row in locations
+    }
+
+
+def _latest_archived_prediction(
+    archived: ArchivedRows,
+) -> Optional[PredictionResult]:
+    if not archived.predictions:
+        return None
+    latest = max(archived.predictions, key=lambda r: (r["timestamp"], r["id"]))
+    return _prediction_from_row(latest)
+
+
+def _session_from_archive(
+    archived: ArchivedRows, with_readings: bool = True
+) -> CookSession:
+    """Rebuild the aggregate load_session would have returned before archiving."""
+    session = _session_from_row(archived.session)
+    if with_readings:
+        session.readings = archived.readings.to_readings(session.id)
+    session.lid_events = [_lid_event_from_row(r) for r in archived.lid_open_events]
+    session.interventions = [
+        _intervention_from_row(r) for r in archived.intervention_events
+    ]
+    prediction = _latest_archived_prediction(archived)
+    session.predictions = [prediction] if prediction else []
+    return session
+
+
+async def archive_session(session_id: str) -> bool:
+    """Move a finished session out of the hot tables into its monthly archive.
+
+    The rows are read from a snapshot and the segment is appended and
+    fsynced before the write lock is taken, so live writes never wait on
+    the disk flush. A short unit of work then records the segment and
+    deletes the hot rows, provided the session's revision has not moved
+    in between. If it has, or the unit fails, the segment is discarded
+    (see ArchiveStore.discard). Returns False if the session does not
+    exist, is not finished, or changed while being archived.
+    """
+    async with _connection(readonly=True) as db:
+        cursor = await db.execute(
+            "SELECT * FROM cook_sessions WHERE id = ? AND is_finished = 1",
+            (session_id,),
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return False
+
+        children = {}
+        for table in ("lid_open_events", "intervention_events", "predictions"):
+            cursor = await db.execute(
+                f"SELECT * FROM {table} WHERE session_id = ? ORDER BY timestamp",
+                (session_id,),
+            )
+            children[table] = [_row_dict(r) for r in await cursor.fetchall()]
+        segment = encode_segment(ArchivedRows(
+            session=_row_dict(row),
+            readings=await _fetch_reading_columns(db, session_id),
+            **children,
+        ))
+
+    month = from_epoch_ms(row["created_at"]).strftime("%Y-%m")
+    file = archive_store.file_for_month(month)
+    offset = await asyncio.to_thread(archive_store.append, file, segment)
+    try:
+        recorded = await _record_archived(session_id, row, month, file, offset, len(segment))
+    except BaseException:
+        await asyncio.to_thread(archive_store.discard, file, offset, len(segment))
+        raise
+    if not recorded:
+        await asyncio.to_thread(archive_store.discard, file, offset, len(segment))
+    return recorded
+
+
+async def _record_archived(
+    session_id: str, row: aiosqlite.Row, month: str, file: str, offset: int, length: int
+) -> bool:
+    """Point a session at its archive segment and drop its hot rows.
+
+    Returns False, changing nothing, if the session was modified after
+    `row` was read.
+    """
+    async with unit_of_work() as db:
+        cursor = await db.execute(
+            "SELECT revision FROM cook_sessions WHERE id = ? AND is_finished = 1",
+            (session_id,),
+        )
+        current = await cursor.fetchone()
+        if current is None or current[0] != row["revision"]:
+            return False
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO archived_sessions
+                (session_id, month, file, offset, length, archived_at,
+                 revision, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (session_id, month, file, offset, length,
+             to_epoch_ms(datetime.utcnow()), row["revision"],
+             row["updated_at"] or row["created_at"]),
+        )
+        for table in _CHILD_TABLES:
+            await db.execute(
+                f"DELETE FROM {table} WHERE session_id = ?", (session_id,)
+            )
+        await db.execute("DELETE FROM cook_sessions WHERE id = ?", (session_id,))
+        mark_session_written(session_id)
+        session_cache.invalidate(session_id)
+    return True
+
+
+async def archive_finished_sessions(created_before_ms: int, limit: int) -> int:
+    """Archive finished, prediction-compacted sessions created before a cutoff.
+
+    Returns the number of sessions archived.
+    """
+    db = await get_db()
+    cursor = await db.execute(
+        """
+        SELECT id FROM cook_sessions
+        WHERE is_finished = 1 AND predictions_compacted = 1 AND created_at < ?
+        LIMIT ?
+        """,
+        (created_before_ms, limit),
+    )
+    session_ids = [row[0] for row in await cursor.fetchall()]
+    archived = 0
+    for session_id in session_ids:
+        archived += await archive_session(session_id)
+    return archived
+
+
+# --- Bulk export (see services/export_service.py) ---
+
+
+def _session_matches(
+    session: dict,
+    since_ms: Optional[int],
+    until_ms: Optional[int],
+    cut_type: Optional[str],
+    equipment_type: Optional[str],
+) -> bool:
+    return (
+        (since_ms is None or session["created_at"] >= since_ms)
+        and (until_ms is None or session["created_at"] < until_ms)
+        and (cut_type is None or session["cut_type"] == cut_type)
+        and (equipment_type is None or session["equipment_type"] == equipment_type)
+    )
+
+
+async def iter_session_rows(
+    since_ms: Optional[int] = None,
+    until_ms: Optional[int] = None,
+    cut_type: Optional[str] = None,
+    equipment_type: Optional[str] = None,
+    readings: bool = False,
+    predictions: bool = False,
+    batch: int = 500,
+) -> AsyncIterator[ArchivedRows]:
+    """Stream the stored rows of every matching session, one session at a time.
+
+    Archived sessions come first (oldest months first), then sessions
+    still in the hot tables, in insertion order. Session rows are paged
+    by key, `batch` at a time, and each page and each session's child
+    rows are read in their own short read transaction. No reader
+    connection or snapshot is held while the caller consumes a session,
+    so a slow client cannot pin a pooled reader or hold back WAL
+    checkpoints. Memory holds at most `batch` session rows plus one
+    session's child rows. Readings and predictions are only loaded when
+    requested; event rows are not exported.
+
+    Without a single snapshot, sessions created during the export are
+    included if their page has not been read yet, and a session archived
+    mid-export may be skipped.
+
+    Args:
+        since_ms: Only sessions created at or after this epoch-ms time.
+        until_ms: Only sessions created before this epoch-ms time.
+        cut_type: Only sessions of this CutType value.
+        equipment_type: Only sessions of this EquipmentType value.
+        readings: Load each session's readings.
+        predictions: Load each session's stored predictions.
+        batch: Session rows per page.
+    """
+    first_month = from_epoch_ms(since_ms).strftime("%Y-%m") if since_ms else ""
+    last_month = (
+        from_epoch_ms(until_ms - 1).strftime("%Y-%m") if until_ms else "9999-12"
+    )
+    last_file, last_offset = "", -1
+    while True:
+        async with read_connection() as db:
+            cursor = await db.execute(
+                """
+                SELECT file, offset, length FROM archived_sessions
+                WHERE month BETWEEN ? AND ? AND (file, offset) > (?, ?)
+                ORDER BY file, offset
+                LIMIT ?
+                """,
+                (first_month, last_month, last_file, last_offset, batch),
+            )
+            rows = await cursor.fetchall()
+        if not rows:
+            break
+        last_file, last_offset = rows[-1]["file"], rows[-1]["offset"]
+        for row in rows:
+            archived = archive_store.read(row["file"], row["offset"], row["length"])
+            if not _session_matches(
+                archived.session, since_ms, until_ms, cut_type, equipment_type
+            ):
+                continue
+            if not readings:
+                archived.readings = ReadingColumns.empty()
+            if not predictions:
+                archived.predictions = []
+            yield archived
+
+    clauses, params = ["rowid > ?"], []
+    for clause, value in (
+        ("created_at >= ?", since_ms),
+        ("created_at < ?", until_ms),
+        ("cut_type = ?", cut_type),
+        ("equipment_type = ?", equipment_type),
+    ):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    query = (
+        f"SELECT rowid AS page_key, * FROM cook_sessions "
+        f"WHERE {' AND '.join(clauses)} ORDER BY rowid LIMIT ?"
+    )
+    last_rowid = 0
+    while True:
+        async with read_connection() as db:
+            cursor = await db.execute(query, (last_rowid, *params, batch))
+            rows = await cursor.fetchall()
+        if not rows:
+            break
+        last_rowid = rows[-1]["page_key"]
+        for row in rows:
+            session = _row_dict(row)
+            del session["page_key"]
+            stored = ArchivedRows(
+                session=session,
+                lid_open_events=[],
+                intervention_events=[],
+                predictions=[],
+                readings=ReadingColumns.empty(),
+            )
+            if readings or predictions:
+                async with read_connection() as db:
+                    if readings:
+                        stored.readings = await _fetch_reading_columns(db, session["id"])
+                    if predictions:
+                        pred_cursor = await db.execute(
+                            "SELECT * FROM predictions WHERE session_id = ? "
+                            "ORDER BY timestamp",
+                            (session["id"],),
+                        )
+                        stored.predictions = [
+                            _row_dict(r) for r in await pred_cursor.fetchall()
+                        ]
+            yield stored
+
+
+# Per-function latency histograms (services/metrics.py) and spans
+# (services/tracing.py)
+instrument_functions(globals(), REPOSITORY_SECONDS)
+trace_functions(globals(), "repository")
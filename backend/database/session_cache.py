@@ -0,0 +1,170 @@
+"""In-process write-through cache of loaded cook sessions.
+
+Every hot endpoint starts from repository.load_session, which otherwise
+re-reads the session row, every reading, every event and the latest
+prediction from SQLite. The cache keeps the assembled CookSession per
+session ID and the repository's write functions apply the same change
+to the cached copy, so after the first load a session's history is never
+re-read while it stays cached.
+
+Entries are evicted least-recently-used once either the session count or
+the estimated memory footprint exceeds its cap. The cache is only
+coherent when this process is the sole writer to the database.
+"""
+
+import copy
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, Optional
+
+from ..config import settings
+from ..models.dataclasses import CookSession
+from ..services.metrics import Counter, Gauge
+
+# Rough per-object costs used to estimate an entry's memory footprint
+SESSION_BASE_BYTES = 4096
+READING_BYTES = 360
+EVENT_BYTES = 320
+
+
+def estimate_session_bytes(session: CookSession) -> int:
+    """Approximate memory held by a cached session and its child rows."""
+    return (
+        SESSION_BASE_BYTES
+        + READING_BYTES * len(session.readings)
+        + EVENT_BYTES
+        * (len(session.lid_events) + len(session.interventions)
+           + len(session.predictions))
+    )
+
+
+def copy_session(session: CookSession) -> CookSession:
+    """Copy a session so callers can mutate it without touching the cache.
+
+    Child rows are shared (they are not mutated once saved); only the
+    containers and the mutable stall state are copied.
+    """
+    return replace(
+        session,
+        readings=list(session.readings),
+        predictions=list(session.predictions),
+        lid_events=list(session.lid_events),
+        interventions=list(session.interventions),
+        stall=copy.deepcopy(session.stall),
+    )
+
+
+class SessionCache:
+    """LRU cache of CookSession aggregates with a session-count and memory cap."""
+
+    def __init__(self, max_sessions: int, max_bytes: int):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CookSession] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_sessions > 0 and self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def get(self, session_id: str) -> Optional[CookSession]:
+        """Return a private copy of the cached session, or None on a miss."""
+        session = self._entries.get(session_id)
+        if session is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(session_id)
+        return copy_session(session)
+
+    def peek(self, session_id: str) -> Optional[CookSession]:
+        """Return the cached session itself, without copying.
+
+        For read-only projections; callers must not mutate the result.
+        """
+        session = self._entries.get(session_id)
+        if session is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(session_id)
+        return session
+
+    def put(self, session: CookSession) -> None:
+        """Cache a copy of a session as loaded from (or written to) the DB."""
+        if not self.enabled:
+            return
+        self._entries[session.id] = copy_session(session)
+        self._entries.move_to_end(session.id)
+        self._resize(session.id)
+        self._evict()
+
+    def update(
+        self, session_id: str, apply: Callable[[CookSession], None]
+    ) -> None:
+        """Apply a write to the cached session, if present."""
+        session = self._entries.get(session_id)
+        if session is None:
+            return
+        apply(session)
+        self._resize(session_id)
+        self._evict()
+
+    def invalidate(self, session_id: str) -> None:
+        if session_id in self._entries:
+            del self._entries[session_id]
+            self.total_bytes -= self._sizes.pop(session_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+
+    def _resize(self, session_id: str) -> None:
+        size = estimate_session_bytes(self._entries[session_id])
+        self.total_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_sessions
+            or self.total_bytes > self.max_bytes
+        ):
+            session_id, _ = self._entries.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(session_id)
+            self.evictions += 1
+
+
+session_cache = SessionCache(
+    max_sessions=settings.session_cache_max_sessions,
+    max_bytes=int(settings.session_cache_max_mb * 1024 * 1024),
+)
+
+
+def _hit_ratio() -> float:
+    lookups = session_cache.hits + session_cache.misses
+    return session_cache.hits / lookups if lookups else 0.0
+
+
+Counter("pitmaster_session_cache_hits_total", "Session cache hits.",
+        function=lambda: session_cache.hits)
+Counter("pitmaster_session_cache_misses_total", "Session cache misses.",
+        function=lambda: session_cache.misses)
+Counter("pitmaster_session_cache_evictions_total", "Session cache evictions.",
+        function=lambda: session_cache.evictions)
+Gauge("pitmaster_session_cache_hit_ratio", "Hits over lookups since start.",
+      function=_hit_ratio)
+Gauge("pitmaster_session_cache_sessions", "Sessions currently cached.",
+      function=lambda: len(session_cache))
+Gauge("pitmaster_session_cache_bytes", "Estimated memory held by the session cache.",
+      function=lambda: session_cache.total_bytes)
@@ -1,4 +1,9 @@
-"""SQL schema: 5 tables for cook session data."""
+"""Baseline SQL schema: 5 tables for cook session data.
+
+This is the schema as first released (migration step 1). Later changes,
+such as indexes and integer timestamps, are versioned steps in
+migrations.py.
+"""
 
 CREATE_TABLES = [
     """
@@ -22,7 +27,8 @@ CREATE_TABLES = [
         weather_humidity REAL,
         is_finished INTEGER DEFAULT 0,
         quality_rating TEXT,
-        quality_notes TEXT DEFAULT ''
+        quality_notes TEXT DEFAULT '',
+        stall_state BLOB
     )
     """,
     """
@@ -33,6 +39,10 @@ CREATE_TABLES = [
         temp_f REAL NOT NULL,
         smoker_temp_f REAL,
         elapsed_minutes REAL NOT NULL,
+        temp_min_f REAL,
+        temp_max_f REAL,
+        temp_mean_f REAL,
+        sample_count INTEGER DEFAULT 1,
         FOREIGN KEY (session_id) REFERENCES cook_sessions(id)
     )
     """,
@@ -72,3 +82,13 @@ CREATE_TABLES = [
     )
     """,
 ]
+
+# Columns added after the initial schema, before versioned migrations.
+# Applied by migration step 1 when missing: (table, column, definition).
+ADDED_COLUMNS = [
+    ("cook_sessions", "stall_state", "BLOB"),
+    ("probe_readings", "temp_min_f", "REAL"),
+    ("probe_readings", "temp_max_f", "REAL"),
+    ("probe_readings", "temp_mean_f", "REAL"),
+    ("probe_readings", "sample_count", "INTEGER DEFAULT 1"),
+]
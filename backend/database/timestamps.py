@@ -0,0 +1,27 @@
+"""Integer epoch-millisecond encoding for stored timestamps."""
+
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """Normalize a timestamp to naive UTC, the app's in-memory convention.
+
+    Naive datetimes are taken as UTC (the app uses datetime.utcnow());
+    aware ones, e.g. parsed from a client's ISO "...Z", are converted.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    """Encode a timestamp as integer epoch milliseconds."""
+    return round((to_naive_utc(dt) - _EPOCH) / _ONE_MS)
+
+
+def from_epoch_ms(ms: int) -> datetime:
+    """Decode epoch milliseconds to a naive UTC datetime."""
+    return _EPOCH + ms * _ONE_MS
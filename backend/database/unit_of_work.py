@@ -0,0 +1,239 @@
+"""Unit of work and group commit for the SQLite repository.
+
+Repository writes run inside a unit of work. A unit executes its
+statements under the process-wide write lock, wrapped in a SAVEPOINT so
+a failing unit rolls back only its own statements, and commits once when
+the outermost unit exits. Nested units (e.g. repository calls made
+inside a service-level unit) join the enclosing one, so a whole request
+commits once.
+
+Every session a unit writes to (see `mark_session_written`) has its
+`revision` incremented and `updated_at` stamped once, just before the
+unit is released, so revisions advance exactly when committed data
+changes. HTTP conditional requests are validated against them.
+
+How the commit happens is set by `settings.db_commit_mode`:
+
+- "immediate": each unit commits before returning (one fsync per unit).
+- "group": units hand off to a background loop that commits every unit
+  pending within `db_group_commit_window_ms` (or once
+  `db_group_commit_max_batch` units are waiting) in a single COMMIT.
+  Callers wait for that commit, so writes are durable on return.
+- "deferred": like "group", but callers return without waiting. Up to
+  one commit window of acknowledged writes can be lost on a crash.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+import aiosqlite
+
+from ..config import settings
+from ..services.metrics import Counter, Gauge
+from .db import get_db
+from .session_cache import session_cache
+from .timestamps import to_epoch_ms
+
+COMMIT_MODES = ("immediate", "group", "deferred")
+
+_active_unit: ContextVar[Optional["_Unit"]] = ContextVar("_active_unit", default=None)
+
+
+class _Unit:
+    """Bookkeeping for one outermost unit of work."""
+
+    def __init__(self):
+        self.touched_sessions: set[str] = set()
+
+
+class GroupCommitter:
+    """Background loop that coalesces pending units into one COMMIT."""
+
+    def __init__(self, lock: asyncio.Lock, window_s: float, max_batch: int):
+        self._lock = lock
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._waiters: list[asyncio.Future] = []
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.commits = 0
+        self.units_committed = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def submit(self, wait: bool) -> None:
+        """Register a finished unit; optionally wait until it is committed."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        self._pending += 1
+        self._wakeup.set()
+        if self._pending >= self.max_batch:
+            self._full.set()
+        if future is not None:
+            await future
+
+    async def flush(self) -> None:
+        """Commit anything pending now and stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            async with self._lock:
+                await self._commit_batch()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if self._pending < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window_s)
+                except asyncio.TimeoutError:
+                    pass
+            async with self._lock:
+                await self._commit_batch()
+
+    async def _commit_batch(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        units, self._pending = self._pending, 0
+        self._wakeup.clear()
+        self._full.clear()
+        db = await get_db()
+        try:
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            session_cache.clear()
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.commits += 1
+        self.units_committed += units
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+
+class _LoopState:
+    """Write lock and committer, bound to the event loop that created them."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.lock = asyncio.Lock()
+        self.committer = GroupCommitter(
+            self.lock,
+            window_s=settings.db_group_commit_window_ms / 1000.0,
+            max_batch=settings.db_group_commit_max_batch,
+        )
+
+
+_state: Optional[_LoopState] = None
+
+
+def _loop_state() -> _LoopState:
+    global _state
+    loop = asyncio.get_running_loop()
+    if _state is None or _state.loop is not loop:
+        _state = _LoopState(loop)
+    return _state
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[aiosqlite.Connection]:
+    """Run repository writes atomically with a single commit.
+
+    Yields the database connection. Nested calls join the outermost unit.
+    """
+    db = await get_db()
+    if _active_unit.get() is not None:
+        yield db
+        return
+
+    state = _loop_state()
+    unit = _Unit()
+    mode = settings.db_commit_mode
+    async with state.lock:
+        token = _active_unit.set(unit)
+        try:
+            if not db.in_transaction:
+                await db.execute("BEGIN")
+            await db.execute("SAVEPOINT unit_of_work")
+            try:
+                yield db
+                await _bump_revisions(db, unit.touched_sessions)
+            except BaseException:
+                await db.execute("ROLLBACK TO unit_of_work")
+                await db.execute("RELEASE unit_of_work")
+                for session_id in unit.touched_sessions:
+                    session_cache.invalidate(session_id)
+                raise
+            await db.execute("RELEASE unit_of_work")
+            if mode == "immediate":
+                await db.commit()
+        finally:
+            _active_unit.reset(token)
+
+    if mode != "immediate":
+        await state.committer.submit(wait=(mode == "group"))
+
+
+async def _bump_revisions(
+    db: aiosqlite.Connection, session_ids: set[str]
+) -> None:
+    if not session_ids:
+        return
+    now = to_epoch_ms(datetime.utcnow())
+    await db.executemany(
+        "UPDATE cook_sessions SET revision = revision + 1, updated_at = ? WHERE id = ?",
+        [(now, session_id) for session_id in session_ids],
+    )
+
+
+def mark_session_written(session_id: Optional[str]) -> None:
+    """Record that the active unit changed a session's data.
+
+    The session's revision is bumped when the unit completes; if the
+    unit rolls back instead, the session is evicted from the cache.
+    """
+    unit = _active_unit.get()
+    if unit is not None and session_id:
+        unit.touched_sessions.add(session_id)
+
+
+async def flush_pending_commits() -> None:
+    """Commit any group-commit backlog; used on shutdown."""
+    if _state is not None and _state.loop is asyncio.get_running_loop():
+        await _state.committer.flush()
+
+
+def group_commit_stats() -> dict[str, int]:
+    """Pending units and commit counters for monitoring."""
+    if _state is None:
+        return {"pending": 0, "commits": 0, "units_committed": 0}
+    committer = _state.committer
+    return {
+        "pending": committer.pending,
+        "commits": committer.commits,
+        "units_committed": committer.units_committed,
+    }
+
+
+Gauge("pitmaster_db_group_commit_pending", "Units waiting for the next group commit.",
+      function=lambda: group_commit_stats()["pending"])
+Counter("pitmaster_db_group_commits_total", "Group COMMITs issued.",
+        function=lambda: group_commit_stats()["commits"])
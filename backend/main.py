@@ -2,14 +2,19 @@
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .config import settings
 from .database.db import init_db, close_db
-from .routers import cook, weather, equipment, report
+from .routers import cook, weather, equipment, report, export, metrics, tracing
+from .routers.profiling import ProfilingMiddleware
 from .models.schemas import HealthResponse
-from .services.logging_service import setup_logging
+from .services.admission import PredictionOverloaded, prediction_admission
+from .services.logging_service import setup_logging, shutdown_logging
+from .services.metrics import start_loop_lag_monitor, stop_loop_lag_monitor
+from .services.retention_service import start_retention, stop_retention
 
 
 @asynccontextmanager
@@ -17,8 +22,13 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     setup_logging()
     await init_db()
+    start_retention()
+    start_loop_lag_monitor()
     yield
+    await stop_loop_lag_monitor()
+    await stop_retention()
     await close_db()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -28,6 +38,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(tracing.TracingMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -37,14 +51,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PredictionOverloaded)
+async def prediction_overloaded(request: Request, exc: PredictionOverloaded):
+    """Shed load with 503 while the prediction queue is full."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Prediction queue is full, retry later"},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
 # Routers
 app.include_router(cook.router)
 app.include_router(weather.router)
 app.include_router(equipment.router)
 app.include_router(report.router)
+app.include_router(export.router)
+app.include_router(metrics.router)
+app.include_router(tracing.router)
 
 
 @app.get("/api/v1/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
-    return HealthResponse(status="ok", version="1.0.0")
+    """Health check endpoint, with prediction queue load."""
+    return HealthResponse(
+        status="ok",
+        version="1.0.0",
+        predictions_running=prediction_admission.running,
+        prediction_queue_depth=prediction_admission.queue_depth,
+        prediction_queue_limit=settings.prediction_queue_depth,
+    )
@@ -1,3 +1,4 @@
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
@@ -51,6 +52,11 @@ class ProbeReading:
     temp_f: float = 0.0
     smoker_temp_f: Optional[float] = None
     elapsed_minutes: float = 0.0
+    # Per-minute aggregate of high-frequency samples (None for single readings)
+    temp_min_f: Optional[float] = None
+    temp_max_f: Optional[float] = None
+    temp_mean_f: Optional[float] = None
+    sample_count: int = 1
 
 
 @dataclass
@@ -88,6 +94,44 @@ class InterventionEvent:
     elapsed_minutes: float = 0.0
 
 
+@dataclass
+class SlopeWindow:
+    """Samples and running sums of a trailing least-squares slope window.
+
+    Times are minutes on the session's elapsed-time axis; the sums take
+    the first sample's time as their origin. The sums let the slope be
+    updated in O(1) as samples enter and leave the window.
+    """
+    window_minutes: float = 10.0
+    samples: deque[tuple[float, float]] = field(default_factory=deque)  # (minutes, temp_f)
+    sum_t: float = 0.0
+    sum_y: float = 0.0
+    sum_tt: float = 0.0
+    sum_ty: float = 0.0
+
+
+@dataclass
+class SlopeHistory:
+    """Fixed-size ring buffer of recent temperature slopes (°F/min).
+
+    Each slope is the least-squares fit over `window`, the readings of
+    the trailing few minutes. `below_threshold_run` counts consecutive
+    slopes under the stall threshold so the stall override can be
+    checked without a scan.
+    """
+    capacity: int = 32
+    values: list[float] = field(default_factory=list)
+    head: int = 0  # next write position
+    count: int = 0  # number of valid slopes (<= capacity)
+    below_threshold_run: int = 0
+    last_temp_f: Optional[float] = None
+    window: SlopeWindow = field(default_factory=SlopeWindow)
+
+    def __post_init__(self) -> None:
+        if len(self.values) != self.capacity:
+            self.values = (self.values + [0.0] * self.capacity)[: self.capacity]
+
+
 @dataclass
 class StallState:
     """Tracks stall detection status."""
@@ -95,7 +139,7 @@ class StallState:
     stall_start_temp_f: Optional[float] = None
     stall_start_minutes: Optional[float] = None
     stall_duration_minutes: float = 0.0
-    slope_history: list[float] = field(default_factory=list)
+    slope_history: SlopeHistory = field(default_factory=SlopeHistory)
 
 
 @dataclass
@@ -122,6 +166,53 @@ class CookSession:
     stall: StallState = field(default_factory=StallState)
     weather: Optional[WeatherSnapshot] = None
     is_finished: bool = False
+    # Older readings not loaded by a projection load (see load_session_tail)
+    earlier_readings_count: int = 0
+
+    @property
+    def readings_count(self) -> int:
+        """Total readings recorded, including any not loaded."""
+        return self.earlier_readings_count + len(self.readings)
+
+
+@dataclass
+class SessionSummary:
+    """Per-session summary materialized on the cook_sessions row.
+
+    Kept current by every repository write, so state queries read one
+    row instead of the session's readings and events.
+    """
+    session_id: str
+    created_at: Optional[datetime] = None
+    current_state: CookState = CookState.SETUP
+    confidence: ConfidenceTier = ConfidenceTier.LOW
+    wrap_type: WrapType = WrapType.NONE
+    is_finished: bool = False
+    readings_count: int = 0
+    last_temp_f: Optional[float] = None
+    last_elapsed_minutes: float = 0.0
+    lid_opens_count: int = 0
+    stall_active: bool = False
+    stall_start_minutes: Optional[float] = None
+    stall_duration_minutes: float = 0.0
+    latest_p10_minutes: Optional[float] = None
+    latest_p50_minutes: Optional[float] = None
+    latest_p90_minutes: Optional[float] = None
+
+
+@dataclass
+class SessionRevision:
+    """A session's change counter, bumped once per committed write."""
+    revision: int
+    updated_at: datetime
+
+
+@dataclass
+class SessionCounts:
+    """Row counts for a session's child tables."""
+    readings: int = 0
+    lid_events: int = 0
+    interventions: int = 0
 
 
 @dataclass
@@ -153,6 +244,7 @@ class PostCookReport:
     predicted_temps: list[float] = field(default_factory=list)
     actual_temps: list[float] = field(default_factory=list)
     residuals: list[float] = field(default_factory=list)
+    elapsed_minutes: list[float] = field(default_factory=list)  # x of each point
 
 
 @dataclass
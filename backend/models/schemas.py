@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +35,26 @@ class ProbeReadingRequest(BaseModel):
     smoker_temp_f: Optional[float] = Field(default=None, ge=100, le=500)
 
 
+class BatchProbeReading(BaseModel):
+    temp_f: float = Field(ge=32, le=212)
+    smoker_temp_f: Optional[float] = Field(default=None, ge=100, le=500)
+    timestamp: Optional[datetime] = None
+
+
+class ProbeReadingBatchRequest(BaseModel):
+    readings: list[BatchProbeReading] = Field(min_length=1, max_length=5000)
+
+
+class ProbeSample(BaseModel):
+    temp_f: float = Field(ge=32, le=212)
+    smoker_temp_f: Optional[float] = Field(default=None, ge=100, le=500)
+    timestamp: Optional[datetime] = None
+
+
+class ProbeSampleBatchRequest(BaseModel):
+    samples: list[ProbeSample] = Field(min_length=1, max_length=5000)
+
+
 class WrapRequest(BaseModel):
     wrap_type: WrapType
 
@@ -48,6 +68,14 @@ class FinishCookRequest(BaseModel):
     quality_notes: str = ""
 
 
+BatchStateField = Literal["state", "prediction", "last_reading"]
+
+
+class BatchStateRequest(BaseModel):
+    session_ids: list[str] = Field(min_length=1, max_length=500)
+    fields: list[BatchStateField] = ["state", "prediction", "last_reading"]
+
+
 # --- Response models ---
 
 class PredictionResponse(BaseModel):
@@ -73,6 +101,23 @@ class StateResponse(BaseModel):
     elapsed_minutes: float
 
 
+class LastReadingResponse(BaseModel):
+    temp_f: float
+    elapsed_minutes: float
+
+
+class SessionStateEntry(BaseModel):
+    session_id: str
+    state: Optional[StateResponse] = None
+    prediction: Optional[PredictionResponse] = None
+    last_reading: Optional[LastReadingResponse] = None
+
+
+class BatchStateResponse(BaseModel):
+    sessions: list[SessionStateEntry]
+    missing: list[str] = []
+
+
 class CookSetupResponse(BaseModel):
     session_id: str
     prediction: PredictionResponse
@@ -94,6 +139,20 @@ class ReadingResponse(BaseModel):
     state: StateResponse
 
 
+class ReadingBatchResponse(BaseModel):
+    readings_accepted: int
+    elapsed_minutes: float
+    prediction: PredictionResponse
+    state: StateResponse
+
+
+class ProbeSampleResponse(BaseModel):
+    samples_accepted: int
+    minutes_aggregated: int
+    prediction: Optional[PredictionResponse] = None
+    state: Optional[StateResponse] = None
+
+
 class WrapResponse(BaseModel):
     wrap_type: WrapType
     prediction: PredictionResponse
@@ -116,6 +175,7 @@ class ReportResponse(BaseModel):
     predicted_temps: list[float]
     actual_temps: list[float]
     residuals: list[float]
+    elapsed_minutes: list[float] = []
 
 
 class EquipmentPresetResponse(BaseModel):
@@ -136,3 +196,6 @@ class WeatherResponse(BaseModel):
 class HealthResponse(BaseModel):
     status: str = "ok"
     version: str = "1.0.0"
+    predictions_running: int = 0
+    prediction_queue_depth: int = 0
+    prediction_queue_limit: int = 0
@@ -0,0 +1,94 @@
+"""Conditional GET (ETag / Last-Modified) for session read endpoints.
+
+Validators come from the session's revision, which every committed
+write bumps (see database/unit_of_work.py). The revision is a single
+indexed lookup, checked before the endpoint loads or builds anything,
+so a poll from a client that is already current costs one row read
+and returns 304 with no body.
+
+ETags are weak (W/"<revision>"): the same revision may be served with
+different encodings. Responses carry `Cache-Control: no-cache` so
+clients revalidate instead of reusing a heuristically fresh copy.
+"""
+
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from ..models.dataclasses import SessionRevision
+from ..services import cook_session_service as svc
+
+
+def etag_for(revision: SessionRevision) -> str:
+    return f'W/"{revision.revision}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def _not_modified_since(if_modified_since: str, revision: SessionRevision) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    modified = revision.updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+    return modified <= since
+
+
+async def check_not_modified(
+    request: Request, response: Response, session_id: str
+) -> Optional[Response]:
+    """Validate a conditional request against the session's revision.
+
+    Sets ETag, Last-Modified and Cache-Control on `response`. Returns a
+    304 response when the client's copy is current, else None (also for
+    unknown sessions, which the endpoint then reports as usual).
+    If-None-Match takes precedence over If-Modified-Since.
+    """
+    _, not_modified = await check_revision(request, response, session_id)
+    return not_modified
+
+
+async def check_revision(
+    request: Request, response: Response, session_id: str
+) -> tuple[Optional[SessionRevision], Optional[Response]]:
+    """Like `check_not_modified`, also returning the revision it checked.
+
+    For endpoints that key further work on the revision, so they need
+    not look it up a second time. The revision is None for unknown
+    sessions.
+    """
+    revision = await svc.get_session_revision(session_id)
+    if revision is None:
+        return None, None
+
+    headers = {
+        "ETag": etag_for(revision),
+        "Last-Modified": format_datetime(
+            revision.updated_at.replace(tzinfo=timezone.utc), usegmt=True
+        ),
+        "Cache-Control": "no-cache",
+    }
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = _etag_matches(if_none_match, headers["ETag"])
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        current = bool(if_modified_since) and _not_modified_since(
+            if_modified_since, revision
+        )
+    return revision, Response(status_code=304, headers=headers) if current else None
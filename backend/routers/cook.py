@@ -1,23 +1,40 @@
 """Cook session API endpoints."""
 
+import asyncio
 from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
 from ..models.schemas import (
+    BatchStateRequest,
+    BatchStateResponse,
     CookSetupRequest,
     CookSetupResponse,
     BackwardPlanResponse,
     FinishCookRequest,
+    LastReadingResponse,
     LidOpenRequest,
     PredictionResponse,
+    ProbeReadingBatchRequest,
     ProbeReadingRequest,
+    ProbeSampleBatchRequest,
+    ProbeSampleResponse,
+    ReadingBatchResponse,
     ReadingResponse,
     ReportResponse,
+    SessionStateEntry,
     StateResponse,
     WrapRequest,
     WrapResponse,
 )
+from ..config import settings
 from ..services import cook_session_service as svc
+from ..services.session_events import SessionEvent, session_events
+from .conditional import check_not_modified, check_revision
+from .fast_response import fast_json_response
+from .report import DecimationParam, MaxPointsParam, report_to_response
 
 router = APIRouter(prefix="/api/v1/cook", tags=["cook"])
 
@@ -25,7 +42,7 @@ router = APIRouter(prefix="/api/v1/cook", tags=["cook"])
 def _prediction_to_response(pred, session_created_at=None) -> PredictionResponse:
     """Convert PredictionResult to PredictionResponse with absolute times."""
     base_time = session_created_at or datetime.utcnow()
-    return PredictionResponse(
+    return PredictionResponse.model_construct(
         p10_minutes=pred.p10_minutes,
         p50_minutes=pred.p50_minutes,
         p90_minutes=pred.p90_minutes,
@@ -39,6 +56,33 @@ def _prediction_to_response(pred, session_created_at=None) -> PredictionResponse
     )
 
 
+def _summary_to_response(summary) -> StateResponse:
+    """Build a StateResponse from a materialized SessionSummary."""
+    return StateResponse.model_construct(
+        current_state=summary.current_state,
+        confidence=summary.confidence,
+        stall_active=summary.stall_active,
+        stall_duration_minutes=summary.stall_duration_minutes,
+        wrap_type=summary.wrap_type,
+        readings_count=summary.readings_count,
+        elapsed_minutes=summary.last_elapsed_minutes,
+    )
+
+
+def _state_to_response(session) -> StateResponse:
+    """Build a StateResponse from a loaded CookSession."""
+    elapsed = session.readings[-1].elapsed_minutes if session.readings else 0.0
+    return StateResponse.model_construct(
+        current_state=session.current_state,
+        confidence=session.confidence,
+        stall_active=session.stall.in_stall,
+        stall_duration_minutes=session.stall.stall_duration_minutes,
+        wrap_type=session.wrap_type,
+        readings_count=session.readings_count,
+        elapsed_minutes=elapsed,
+    )
+
+
 @router.post("/setup", response_model=CookSetupResponse)
 async def setup_cook(request: CookSetupRequest):
     """Create a new cook session, fetch weather, run initial MC."""
@@ -62,6 +106,48 @@ async def setup_cook(request: CookSetupRequest):
     )
 
 
+@router.post(
+    "/batch-state",
+    response_model=BatchStateResponse,
+    response_model_exclude_none=True,
+)
+async def batch_state(body: BatchStateRequest, request: Request):
+    """State, latest prediction and last reading for many sessions.
+
+    `fields` selects which of the three are returned per session.
+    """
+    fields = set(body.fields)
+    summaries, predictions = await svc.get_batch_state(
+        body.session_ids, with_predictions="prediction" in fields
+    )
+
+    entries = []
+    requested = list(dict.fromkeys(body.session_ids))
+    for session_id in requested:
+        summary = summaries.get(session_id)
+        if summary is None:
+            continue
+        entry = SessionStateEntry.model_construct(session_id=session_id)
+        if "state" in fields:
+            entry.state = _summary_to_response(summary)
+        if "prediction" in fields and session_id in predictions:
+            entry.prediction = _prediction_to_response(
+                predictions[session_id], summary.created_at
+            )
+        if "last_reading" in fields and summary.last_temp_f is not None:
+            entry.last_reading = LastReadingResponse.model_construct(
+                temp_f=summary.last_temp_f,
+                elapsed_minutes=summary.last_elapsed_minutes,
+            )
+        entries.append(entry)
+
+    batch = BatchStateResponse.model_construct(
+        sessions=entries,
+        missing=[sid for sid in requested if sid not in summaries],
+    )
+    return fast_json_response(batch, request, exclude_none=True)
+
+
 @router.post("/{session_id}/reading", response_model=ReadingResponse)
 async def add_reading(session_id: str, request: ProbeReadingRequest):
     """Log a probe temperature reading."""
@@ -75,15 +161,46 @@ async def add_reading(session_id: str, request: ProbeReadingRequest):
     return ReadingResponse(
         elapsed_minutes=elapsed,
         prediction=_prediction_to_response(prediction, session.created_at),
-        state=StateResponse(
-            current_state=session.current_state,
-            confidence=session.confidence,
-            stall_active=session.stall.in_stall,
-            stall_duration_minutes=session.stall.stall_duration_minutes,
-            wrap_type=session.wrap_type,
-            readings_count=len(session.readings),
-            elapsed_minutes=elapsed,
-        ),
+        state=_state_to_response(session),
+    )
+
+
+@router.post("/{session_id}/readings:batch", response_model=ReadingBatchResponse)
+async def add_readings_batch(session_id: str, request: ProbeReadingBatchRequest):
+    """Log a burst of buffered probe readings with a single prediction."""
+    try:
+        session, prediction = await svc.add_readings_batch(session_id, request)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    elapsed = session.readings[-1].elapsed_minutes if session.readings else 0.0
+
+    return ReadingBatchResponse(
+        readings_accepted=len(request.readings),
+        elapsed_minutes=elapsed,
+        prediction=_prediction_to_response(prediction, session.created_at),
+        state=_state_to_response(session),
+    )
+
+
+@router.post("/{session_id}/samples", response_model=ProbeSampleResponse)
+async def ingest_samples(session_id: str, request: ProbeSampleBatchRequest):
+    """Ingest high-frequency probe samples, aggregated per minute."""
+    try:
+        session, prediction, minutes = await svc.ingest_samples(session_id, request)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if session is None:
+        return ProbeSampleResponse(
+            samples_accepted=len(request.samples), minutes_aggregated=0
+        )
+
+    return ProbeSampleResponse(
+        samples_accepted=len(request.samples),
+        minutes_aggregated=minutes,
+        prediction=_prediction_to_response(prediction, session.created_at),
+        state=_state_to_response(session),
     )
 
 
@@ -110,84 +227,117 @@ async def apply_wrap(session_id: str, request: WrapRequest):
 
 
 @router.get("/{session_id}/prediction", response_model=PredictionResponse)
-async def get_prediction(session_id: str):
+async def get_prediction(session_id: str, request: Request, response: Response):
     """Get the latest cached prediction."""
+    not_modified = await check_not_modified(request, response, session_id)
+    if not_modified is not None:
+        return not_modified
+
     pred = await svc.get_prediction(session_id)
     if pred is None:
         raise HTTPException(status_code=404, detail="No prediction found")
 
-    session = await svc.get_session(session_id)
+    session = await svc.get_session_header(session_id)
     base_time = session.created_at if session else datetime.utcnow()
-    return _prediction_to_response(pred, base_time)
+    return fast_json_response(_prediction_to_response(pred, base_time), request, response)
 
 
 @router.get("/{session_id}/state", response_model=StateResponse)
-async def get_state(session_id: str):
+async def get_state(session_id: str, request: Request, response: Response):
     """Get current cook state and confidence."""
-    session = await svc.get_session(session_id)
-    if session is None:
+    not_modified = await check_not_modified(request, response, session_id)
+    if not_modified is not None:
+        return not_modified
+
+    summary = await svc.get_session_summary(session_id)
+    if summary is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    elapsed = session.readings[-1].elapsed_minutes if session.readings else 0.0
-    return StateResponse(
-        current_state=session.current_state,
-        confidence=session.confidence,
-        stall_active=session.stall.in_stall,
-        stall_duration_minutes=session.stall.stall_duration_minutes,
-        wrap_type=session.wrap_type,
-        readings_count=len(session.readings),
-        elapsed_minutes=elapsed,
+    return fast_json_response(_summary_to_response(summary), request, response)
+
+
+def _event_frame(event: SessionEvent) -> bytes:
+    """Encode an event as a Server-Sent Events frame (once per event)."""
+    if event.frame is None:
+        if event.kind == "prediction":
+            data = _prediction_to_response(event.payload, event.session_created_at)
+        else:
+            data = _summary_to_response(event.payload)
+        event.frame = (
+            f"event: {event.kind}\ndata: {data.model_dump_json()}\n\n".encode()
+        )
+    return event.frame
+
+
+async def _event_stream(session_id: str) -> AsyncIterator[bytes]:
+    """Current state and prediction, then every pushed update."""
+    queue = session_events.subscribe(session_id)
+    try:
+        # Snapshot after subscribing, so no update falls in between
+        summary = await svc.get_session_summary(session_id)
+        if summary is not None:
+            yield _event_frame(SessionEvent("state", summary))
+        prediction = await svc.get_prediction(session_id)
+        if prediction is not None:
+            header = await svc.get_session_header(session_id)
+            yield _event_frame(SessionEvent(
+                "prediction", prediction,
+                session_created_at=header.created_at if header else None,
+            ))
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), settings.stream_keepalive_s
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield _event_frame(event)
+    finally:
+        session_events.unsubscribe(session_id, queue)
+
+
+@router.get("/{session_id}/stream")
+async def stream_updates(session_id: str):
+    """Push prediction, state and stall updates as Server-Sent Events."""
+    if await svc.get_session_summary(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return StreamingResponse(
+        _event_stream(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.post("/{session_id}/finish", response_model=ReportResponse)
-async def finish_cook(session_id: str, request: FinishCookRequest = FinishCookRequest()):
+async def finish_cook(
+    session_id: str, request: Request, body: FinishCookRequest = FinishCookRequest()
+):
     """End cook and compute report."""
     try:
-        report = await svc.finish_cook(session_id, request)
+        report = await svc.finish_cook(session_id, body)
     except ValueError:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    return ReportResponse(
-        session_id=report.session_id,
-        total_cook_minutes=report.total_cook_minutes,
-        final_temp_f=report.final_temp_f,
-        stall_occurred=report.stall_occurred,
-        stall_duration_minutes=report.stall_duration_minutes,
-        was_wrapped=report.was_wrapped,
-        wrap_type=report.wrap_type,
-        prediction_accuracy_minutes=report.prediction_accuracy_minutes,
-        readings_count=report.readings_count,
-        lid_opens_count=report.lid_opens_count,
-        quality_rating=report.quality_rating,
-        quality_notes=report.quality_notes,
-        predicted_temps=report.predicted_temps,
-        actual_temps=report.actual_temps,
-        residuals=report.residuals,
-    )
+    return fast_json_response(report_to_response(report), request)
 
 
 @router.get("/{session_id}/report", response_model=ReportResponse)
-async def get_report(session_id: str):
-    """Get post-cook report for a finished session."""
-    report = await svc.get_report(session_id)
+async def get_report(
+    session_id: str,
+    request: Request,
+    response: Response,
+    max_points: MaxPointsParam = None,
+    decimation: DecimationParam = "lttb",
+):
+    """Get post-cook report for a finished session, optionally decimated."""
+    revision, not_modified = await check_revision(request, response, session_id)
+    if not_modified is not None:
+        return not_modified
+
+    report = await svc.get_report(session_id, max_points, decimation, revision)
     if report is None:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return ReportResponse(
-        session_id=report.session_id,
-        total_cook_minutes=report.total_cook_minutes,
-        final_temp_f=report.final_temp_f,
-        stall_occurred=report.stall_occurred,
-        stall_duration_minutes=report.stall_duration_minutes,
-        was_wrapped=report.was_wrapped,
-        wrap_type=report.wrap_type,
-        prediction_accuracy_minutes=report.prediction_accuracy_minutes,
-        readings_count=report.readings_count,
-        lid_opens_count=report.lid_opens_count,
-        quality_rating=report.quality_rating,
-        quality_notes=report.quality_notes,
-        predicted_temps=report.predicted_temps,
-        actual_temps=report.actual_temps,
-        residuals=report.residuals,
-    )
+    return fast_json_response(report_to_response(report), request, response)
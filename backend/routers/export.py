@@ -0,0 +1,37 @@
+"""Bulk export API endpoint — streams sessions, readings or predictions."""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..models.enums import CutType, EquipmentType
+from ..services import export_service
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+
+@router.get("/{table}")
+async def export_table(
+    table: Literal["sessions", "readings", "predictions"],
+    format: Literal["ndjson", "csv", "arrow"] = Query("ndjson"),
+    since: Optional[datetime] = Query(None, description="Created at or after (UTC)"),
+    until: Optional[datetime] = Query(None, description="Created before (UTC)"),
+    cut_type: Optional[CutType] = None,
+    equipment_type: Optional[EquipmentType] = None,
+):
+    """Stream a bulk export in constant memory."""
+    if format == "arrow" and not export_service.arrow_available():
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+
+    query = export_service.ExportQuery(
+        table=table, since=since, until=until,
+        cut_type=cut_type, equipment_type=equipment_type,
+    )
+    filename = f"{table}.{export_service.FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        export_service.stream_export(query, format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
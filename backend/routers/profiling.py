@@ -0,0 +1,119 @@
+"""Opt-in request profiling, gated by a shared token header.
+
+Set `PITMASTER_PROFILING_TOKEN` and send the same value in an
+`X-Pitmaster-Profile` header to profile that request with the stack
+sampler in services/profiling.py. The request runs inside a "profile"
+span, so the tracing spans below it time each layer. The response
+then carries:
+
+- `Server-Timing` with wall time per layer (router, service,
+  repository, simulation, other) plus the total, in milliseconds, as
+  shown by browser dev tools;
+- `X-Profile-File`, the name of the collapsed-stack profile written to
+  `settings.profile_dir`, which flamegraph tools render directly.
+
+With no token configured, the middleware passes requests straight
+through after one settings lookup.
+"""
+
+import asyncio
+import hmac
+import os
+import re
+import time
+
+from ..config import settings
+from ..services.logging_service import log_event
+from ..services.profiling import (
+    StackProfile,
+    finish_sampler,
+    layer_seconds,
+    try_start_sampler,
+)
+from ..services.tracing import Span, span
+
+PROFILE_HEADER = b"x-pitmaster-profile"
+
+
+def _header(scope, name: bytes):
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value
+    return None
+
+
+def _store_profile(scope, profile: StackProfile) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    filename = f"{int(time.time() * 1000)}-{scope['method']}-{slug}.collapsed"
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    with open(os.path.join(settings.profile_dir, filename), "w") as f:
+        f.write(profile.collapsed())
+    return filename
+
+
+async def _profile_headers(
+    scope, profile: StackProfile, root: Span
+) -> list[tuple[bytes, bytes]]:
+    layers = layer_seconds(root)
+    # Keep the file write off the event loop
+    filename = await asyncio.to_thread(_store_profile, scope, profile)
+    timing = [f"{layer};dur={seconds * 1000:.2f}" for layer, seconds in layers.items()]
+    timing.append(f"total;dur={root.duration_ms:.2f}")
+    log_event(
+        "request_profiled",
+        method=scope["method"],
+        path=scope["path"],
+        file=filename,
+        samples=profile.samples,
+        **{f"{layer}_ms": round(seconds * 1000, 2) for layer, seconds in layers.items()},
+    )
+    return [
+        (b"server-timing", ", ".join(timing).encode()),
+        (b"x-profile-file", filename.encode()),
+    ]
+
+
+class ProfilingMiddleware:
+    """Sample the event-loop thread while a token-bearing request runs.
+
+    Sits outside TracingMiddleware, so the request's span nests in the
+    "profile" span opened here.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        token = settings.profiling_token
+        if not token or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        supplied = _header(scope, PROFILE_HEADER)
+        if supplied is None or not hmac.compare_digest(supplied, token.encode()):
+            await self.app(scope, receive, send)
+            return
+        sampler = try_start_sampler(settings.profile_sample_interval_ms / 1000.0)
+        if sampler is None:  # another request is being profiled
+            await self.app(scope, receive, send)
+            return
+
+        finished = False
+
+        with span("profile") as root:
+
+            async def send_wrapper(message):
+                nonlocal finished
+                if message["type"] == "http.response.start" and not finished:
+                    finished = True
+                    profile = finish_sampler(sampler)
+                    root.finish()
+                    headers = list(message.get("headers", ()))
+                    headers.extend(await _profile_headers(scope, profile, root))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if not finished:
+                    finish_sampler(sampler)
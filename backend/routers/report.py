@@ -1,21 +1,27 @@
 """Report API endpoint."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
 from ..models.schemas import ReportResponse
 from ..services import cook_session_service as svc
+from .conditional import check_revision
+from .fast_response import fast_json_response
 
 router = APIRouter(prefix="/api/v1/report", tags=["report"])
 
+MaxPointsParam = Annotated[Optional[int], Query(
+    ge=10, le=10_000, description="Decimate the temperature series to at most this many points",
+)]
+DecimationParam = Annotated[Literal["lttb", "minmax"], Query(
+    description="Decimation method used with max_points",
+)]
 
-@router.get("/{session_id}", response_model=ReportResponse)
-async def get_report(session_id: str):
-    """Get post-cook report."""
-    report = await svc.get_report(session_id)
-    if report is None:
-        raise HTTPException(status_code=404, detail="Report not found or cook not finished")
 
-    return ReportResponse(
+def report_to_response(report) -> ReportResponse:
+    """Build a ReportResponse from a PostCookReport without re-validating."""
+    return ReportResponse.model_construct(
         session_id=report.session_id,
         total_cook_minutes=report.total_cook_minutes,
         final_temp_f=report.final_temp_f,
@@ -31,4 +37,25 @@ async def get_report(session_id: str):
         predicted_temps=report.predicted_temps,
         actual_temps=report.actual_temps,
         residuals=report.residuals,
+        elapsed_minutes=report.elapsed_minutes,
     )
+
+
+@router.get("/{session_id}", response_model=ReportResponse)
+async def get_report(
+    session_id: str,
+    request: Request,
+    response: Response,
+    max_points: MaxPointsParam = None,
+    decimation: DecimationParam = "lttb",
+):
+    """Get post-cook report, optionally decimated for plotting."""
+    revision, not_modified = await check_revision(request, response, session_id)
+    if not_modified is not None:
+        return not_modified
+
+    report = await svc.get_report(session_id, max_points, decimation, revision)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found or cook not finished")
+
+    return fast_json_response(report_to_response(report), request, response)
@@ -0,0 +1,49 @@
+"""Request tracing middleware and trace export endpoint."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from ..services.tracing import Trace, export_traces, recent_traces, span
+
+router = APIRouter(prefix="/api/v1/traces", tags=["traces"])
+
+
+@router.get("")
+async def list_traces(limit: int = Query(50, ge=1, le=1000)):
+    """Recent request traces (span trees with durations), newest first."""
+    return JSONResponse(export_traces(limit))
+
+
+class TracingMiddleware:
+    """Open a root span per HTTP request and keep the finished trace.
+
+    The root span ends at response start, matching the request latency
+    metric; streamed bodies (SSE, exports) are not part of the trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = datetime.utcnow()
+        with span("http", method=scope["method"], path=scope["path"]) as root:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and root.end is None:
+                    root.attributes["status"] = message["status"]
+                    root.finish()
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                root.name = f"{scope['method']} {route}"
+                root.finish()
+                recent_traces.append(Trace(root, started_at))
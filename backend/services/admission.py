@@ -0,0 +1,197 @@
+"""Admission control for prediction jobs (Monte Carlo runs).
+
+Setup, every reading, sample batch and wrap re-run the Monte Carlo
+engine, which is CPU-bound. Run inline on the event loop, a burst of
+readings stalls every other request behind it. `PredictionAdmission`
+bounds that work:
+
+- at most `prediction_max_concurrent` runs execute at once, each in a
+  worker thread, so the event loop keeps serving reads meanwhile;
+- further runs wait their turn in a FIFO queue;
+- a write path reserves its place with `reserve()` before it loads the
+  session or waits on the session's lock, so requests that have been
+  admitted but not reached `run()` yet count toward the queue too;
+- once `prediction_degrade_queue_depth` runs are waiting, new runs use
+  `prediction_degraded_iterations` iterations, trading a wider
+  confidence interval for a shorter queue;
+- once `prediction_queue_depth` runs are waiting, write paths fail fast
+  with `PredictionOverloaded` (503 with `Retry-After`) before touching
+  the session, so the client can resend the same request later.
+  Checking and reserving happen without an await in between, so a
+  burst of concurrent requests cannot all pass the check.
+
+Queue depth is exposed on /api/v1/health and /metrics. Setting
+`prediction_max_concurrent` to 0 turns admission control off and runs
+Monte Carlo inline, as before.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from ..config import settings
+from ..models.dataclasses import CookSession, PredictionResult
+from .metrics import Counter, Gauge
+from .tracing import span
+
+# Weight of the newest run in the moving average used for Retry-After
+RUN_TIME_SMOOTHING = 0.2
+
+
+class PredictionOverloaded(Exception):
+    """The prediction queue is full; retry after `retry_after_s` seconds."""
+
+    def __init__(self, retry_after_s: int):
+        super().__init__(f"Prediction queue full, retry in {retry_after_s}s")
+        self.retry_after_s = retry_after_s
+
+
+class _Reservation:
+    """A queue place held from `reserve()` until the run asks for a slot."""
+
+    __slots__ = ("admission", "held")
+
+    def __init__(self, admission: "PredictionAdmission"):
+        self.admission = admission
+        self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.admission.reserved -= 1
+
+
+_reservation: ContextVar[Optional[_Reservation]] = ContextVar("_reservation", default=None)
+
+
+class PredictionAdmission:
+    """Concurrency cap and bounded FIFO queue in front of Monte Carlo runs."""
+
+    def __init__(self):
+        self.running = 0
+        self.reserved = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.degraded = 0
+        self.rejected = 0
+        self.average_run_s = 1.0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.prediction_max_concurrent > 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Runs waiting for a free slot, or bound to wait for one.
+
+        Reserved requests still loading their session or waiting on its
+        lock count once they outnumber the free slots.
+        """
+        free = max(settings.prediction_max_concurrent - self.running, 0)
+        return len(self._waiters) + max(self.reserved - free, 0)
+
+    def retry_after_s(self) -> int:
+        """Seconds until the current queue has likely drained."""
+        slots = max(settings.prediction_max_concurrent, 1)
+        rounds = self.queue_depth / slots + 1
+        return max(1, math.ceil(rounds * self.average_run_s))
+
+    def check(self) -> None:
+        """Raise PredictionOverloaded if no further run can be queued.
+
+        Write paths call this before changing anything, so a rejected
+        request leaves the session as it was.
+        """
+        if self.enabled and self.queue_depth >= settings.prediction_queue_depth:
+            self.rejected += 1
+            raise PredictionOverloaded(self.retry_after_s())
+
+    @contextmanager
+    def reserve(self) -> Iterator[None]:
+        """Check, then hold a queue place until `run()` (or the block) ends.
+
+        Write paths wrap everything from loading the session to saving
+        the prediction in this block. The place is given up when the
+        block's `run()` asks for a slot, or when the block exits without
+        running (unknown session, nothing to predict, errors).
+        """
+        self.check()
+        reservation = _Reservation(self)
+        self.reserved += 1
+        token = _reservation.set(reservation)
+        try:
+            yield
+        finally:
+            _reservation.reset(token)
+            reservation.release()
+
+    async def run(
+        self,
+        simulate: Callable[..., PredictionResult],
+        session: CookSession,
+        n_iterations: int,
+    ) -> PredictionResult:
+        """Call `simulate(session, n_iterations=...)` once a slot is free.
+
+        Uses fewer iterations when the queue is already deep.
+        """
+        reservation = _reservation.get()
+        if reservation is not None:
+            # From here on the run is counted as running or waiting
+            reservation.release()
+        if not self.enabled:
+            return simulate(session, n_iterations=n_iterations)
+
+        if self.queue_depth >= settings.prediction_degrade_queue_depth:
+            n_iterations = min(n_iterations, settings.prediction_degraded_iterations)
+            self.degraded += 1
+        with span("queued"):
+            await self._acquire()
+        start = time.perf_counter()
+        try:
+            return await asyncio.to_thread(simulate, session, n_iterations=n_iterations)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.average_run_s += RUN_TIME_SMOOTHING * (elapsed - self.average_run_s)
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self.running < settings.prediction_max_concurrent and not self._waiters:
+            self.running += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was already handed over; pass it on
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot straight to the oldest waiter, so newcomers
+        # cannot overtake the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+
+prediction_admission = PredictionAdmission()
+
+Gauge("pitmaster_prediction_queue_depth", "Admitted prediction runs waiting for a free slot.",
+      function=lambda: prediction_admission.queue_depth)
+Counter("pitmaster_prediction_degraded_total",
+        "Prediction runs made with reduced iterations because the queue was deep.",
+        function=lambda: prediction_admission.degraded)
+Counter("pitmaster_prediction_rejected_total",
+        "Requests rejected with 503 because the prediction queue was full.",
+        function=lambda: prediction_admission.rejected)
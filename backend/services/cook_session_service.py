@@ -3,11 +3,20 @@
 This is the central service that coordinates all cook session operations.
 """
 
+import asyncio
+import dataclasses
+import time
 import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+import numpy as np
 
 from ..models.enums import CookState, WrapType
+from ..config import settings
 from ..models.dataclasses import (
     BackwardPlan,
     CookSession,
@@ -16,11 +25,16 @@ from ..models.dataclasses import (
     PostCookReport,
     PredictionResult,
     ProbeReading,
+    SessionRevision,
+    SessionSummary,
+    StallState,
     WeatherSnapshot,
 )
 from ..models.schemas import (
     CookSetupRequest,
     FinishCookRequest,
+    ProbeReadingBatchRequest,
+    ProbeSampleBatchRequest,
     ProbeReadingRequest,
     WrapRequest,
 )
@@ -29,21 +43,127 @@ from ..state_machine.cook_states import CookStateMachine
 from ..state_machine.trust import TrustEvaluator
 from ..planning.backward_planner import compute_backward_plan
 from ..planning.wrap_intervention import get_wrap_tradeoff, should_suggest_wrap
+from ..services.admission import prediction_admission
+from ..services.decimation import decimate_indices
 from ..services.weather_service import fetch_weather
+from ..services.probe_stream import ProbeStreamBuffer
 from ..database import repository as repo
+from ..database.timestamps import to_naive_utc
+from ..database.unit_of_work import unit_of_work
 from ..services.logging_service import log_event
+from ..services.tracing import span, span_breakdown, trace_functions
+from ..services.session_events import SessionEvent, session_events
 
 
 # In-memory trust evaluators per session
 _trust_evaluators: dict[str, TrustEvaluator] = {}
 
 
+# In-memory high-frequency sample buffers per session with their last use
+# (time.monotonic()), least recently used first. Buffers unused for
+# `stream_buffer_idle_s` are dropped, open minute and all, so abandoned
+# sessions do not accumulate; a resumed stream starts a new buffer.
+_stream_buffers: OrderedDict[str, tuple[float, ProbeStreamBuffer]] = OrderedDict()
+
+
+# Per-session write locks. Monte Carlo runs in a worker thread, so two
+# requests for one session would otherwise both load the same tail and
+# the last save would win. Entries vanish once no request holds or
+# awaits the lock.
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+# Decimated reports, LRU by (session_id, revision, max_points, method).
+# The revision moves on whenever the session changes, so entries never
+# go stale; they are only evicted.
+_decimated_reports: OrderedDict[tuple, PostCookReport] = OrderedDict()
+
+
 def _get_trust(session_id: str) -> TrustEvaluator:
     if session_id not in _trust_evaluators:
         _trust_evaluators[session_id] = TrustEvaluator()
     return _trust_evaluators[session_id]
 
 
+def _stall_occurred(stall: StallState) -> bool:
+    """Whether a report counts the cook as stalled (including a stall still open)."""
+    return stall.in_stall or stall.stall_duration_minutes > 0
+
+
+def _keep_buffer(session_id: str, buffer: ProbeStreamBuffer) -> None:
+    """Store a session's sample buffer and drop buffers left idle."""
+    now = time.monotonic()
+    _stream_buffers[session_id] = (now, buffer)
+    _stream_buffers.move_to_end(session_id)
+    cutoff = now - settings.stream_buffer_idle_s
+    while _stream_buffers:
+        oldest, (used, _) = next(iter(_stream_buffers.items()))
+        if used > cutoff:
+            break
+        del _stream_buffers[oldest]
+
+
+def _session_lock(session_id: str) -> asyncio.Lock:
+    """Lock held across load, state machine, MC and save of one session."""
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = _session_locks[session_id] = asyncio.Lock()
+    return lock
+
+
+def _elapsed_minutes(last: Optional[ProbeReading], timestamp: datetime) -> float:
+    """Minutes from the session's first reading to `timestamp`.
+
+    Only the latest stored reading is loaded, so this continues from its
+    elapsed time by the gap between the two timestamps; the first reading
+    is minute 0. A timestamp before the latest reading does not move
+    elapsed time backwards.
+    """
+    if last is None:
+        return 0.0
+    gap = (to_naive_utc(timestamp) - last.timestamp).total_seconds() / 60.0
+    return last.elapsed_minutes + max(gap, 0.0)
+
+
+@asynccontextmanager
+async def _admitted_write(session_id: str) -> AsyncIterator[None]:
+    """Reserve a prediction queue place, then hold the session's lock.
+
+    The reservation comes first and raises PredictionOverloaded when the
+    queue is full, so requests waiting on a busy session's lock count
+    toward the queue depth and a burst to one session is still bounded.
+    """
+    with prediction_admission.reserve():
+        async with _session_lock(session_id):
+            yield
+
+
+async def _publish_update(
+    session: CookSession,
+    prediction: Optional[PredictionResult],
+    stall_was_active: bool,
+) -> None:
+    """Push a committed update to the session's stream subscribers.
+
+    Emits the new prediction (if any) and state, plus a stall event when
+    the update entered or left the stall.
+    """
+    if not session_events.has_subscribers(session.id):
+        return
+    summary = await repo.load_session_summary(session.id)
+    if summary is None:
+        return
+    if prediction is not None:
+        session_events.publish(session.id, SessionEvent(
+            "prediction", prediction, session_created_at=session.created_at,
+        ))
+    session_events.publish(session.id, SessionEvent("state", summary))
+    if summary.stall_active != stall_was_active:
+        session_events.publish(session.id, SessionEvent("stall", summary))
+
+
 async def create_session(
     request: CookSetupRequest,
 ) -> tuple[CookSession, PredictionResult, Optional[BackwardPlan]]:
@@ -52,45 +172,53 @@ async def create_session(
     Returns:
         (session, prediction, backward_plan or None)
     """
-    session_id = str(uuid.uuid4())[:8]
-
-    # Fetch weather if location provided
-    weather: Optional[WeatherSnapshot] = None
-    if request.latitude is not None and request.longitude is not None:
-        weather = await fetch_weather(request.latitude, request.longitude)
-
-    session = CookSession(
-        id=session_id,
-        created_at=datetime.utcnow(),
-        meat_category=request.meat_category,
-        cut_type=request.cut_type,
-        weight_lbs=request.weight_lbs,
-        thickness_inches=request.thickness_inches,
-        equipment_type=request.equipment_type,
-        smoker_temp_f=request.smoker_temp_f,
-        target_temp_f=request.target_temp_f,
-        dinner_time=request.dinner_time,
-        altitude_ft=request.altitude_ft,
-        weather=weather,
-        current_state=CookState.PREHEAT,
-    )
-
-    # Run initial MC prediction
-    prediction = run_monte_carlo(session, n_iterations=1000)  # fewer for initial
-    prediction.session_id = session_id
-    session.predictions.append(prediction)
-
-    # Backward plan if dinner time specified
-    backward_plan = None
-    if request.dinner_time:
-        backward_plan = compute_backward_plan(request.dinner_time, prediction)
-
-    # Save to DB
-    await repo.save_session(session)
-    await repo.save_prediction(prediction)
+    with prediction_admission.reserve():
+        session_id = str(uuid.uuid4())[:8]
+
+        # Fetch weather if location provided
+        weather: Optional[WeatherSnapshot] = None
+        if request.latitude is not None and request.longitude is not None:
+            with span("weather"):
+                weather = await fetch_weather(request.latitude, request.longitude)
+
+        session = CookSession(
+            id=session_id,
+            created_at=datetime.utcnow(),
+            meat_category=request.meat_category,
+            cut_type=request.cut_type,
+            weight_lbs=request.weight_lbs,
+            thickness_inches=request.thickness_inches,
+            equipment_type=request.equipment_type,
+            smoker_temp_f=request.smoker_temp_f,
+            target_temp_f=request.target_temp_f,
+            dinner_time=request.dinner_time,
+            altitude_ft=request.altitude_ft,
+            weather=weather,
+            current_state=CookState.PREHEAT,
+        )
+
+        # Run initial MC prediction
+        with span("monte_carlo"):
+            # fewer iterations for the initial prediction
+            prediction = await prediction_admission.run(run_monte_carlo, session, n_iterations=1000)
+        prediction.session_id = session_id
+        session.predictions.append(prediction)
+
+        # Backward plan if dinner time specified
+        backward_plan = None
+        if request.dinner_time:
+            with span("backward_plan"):
+                backward_plan = compute_backward_plan(request.dinner_time, prediction)
+
+        # Save to DB (one commit)
+        with span("save"):
+            async with unit_of_work():
+                await repo.save_session(session)
+                await repo.save_prediction(prediction)
 
     log_event("session_created", session_id=session_id,
-              cut=request.cut_type.value, weight=request.weight_lbs)
+              cut=request.cut_type.value, weight=request.weight_lbs,
+              spans_ms=span_breakdown())
 
     return session, prediction, backward_plan
 
@@ -103,49 +231,207 @@ async def add_reading(
     Returns:
         (updated session, new prediction)
     """
-    session = await repo.load_session(session_id)
-    if session is None:
-        raise ValueError(f"Session {session_id} not found")
+    async with _admitted_write(session_id):
+        # Only the last reading is needed for elapsed time and trust checks
+        with span("load"):
+            session = await repo.load_session_tail(session_id, n_readings=1)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+
+        now = datetime.utcnow()
+        last = session.readings[-1] if session.readings else None
+        reading = ProbeReading(
+            session_id=session_id,
+            timestamp=now,
+            temp_f=request.temp_f,
+            smoker_temp_f=request.smoker_temp_f,
+            elapsed_minutes=_elapsed_minutes(last, now),
+        )
+
+        session.readings.append(reading)
+        stall_was_active = session.stall.in_stall
+
+        # Advance state machine
+        with span("state_machine"):
+            sm = CookStateMachine(session)
+            sm.advance(reading)
+
+        # Run MC with updated data
+        with span("monte_carlo"):
+            prediction = await prediction_admission.run(run_monte_carlo, session, n_iterations=1000)
+        prediction.session_id = session_id
+
+        # Evaluate trust
+        with span("trust"):
+            trust = _get_trust(session_id)
+            prediction.confidence = trust.evaluate(session, prediction)
+        session.confidence = prediction.confidence
+
+        # Reading, prediction and state are written with a single commit
+        with span("save"):
+            async with unit_of_work():
+                await repo.save_reading(reading)
+                await repo.save_prediction(prediction)
+                await repo.update_session_state(
+                    session_id, session.current_state.value, session.confidence.value,
+                    stall=session.stall,
+                )
+
+        with span("publish"):
+            await _publish_update(session, prediction, stall_was_active)
+
+        log_event("reading_added", session_id=session_id,
+                  temp=request.temp_f, state=session.current_state.value,
+                  spans_ms=span_breakdown())
 
-    # Compute elapsed time
-    elapsed = 0.0
-    if session.readings:
-        # Assume readings come ~every minute, or compute from timestamps
-        elapsed = session.readings[-1].elapsed_minutes + 1.0
+    return session, prediction
 
-    reading = ProbeReading(
-        session_id=session_id,
-        timestamp=datetime.utcnow(),
-        temp_f=request.temp_f,
-        smoker_temp_f=request.smoker_temp_f,
-        elapsed_minutes=elapsed,
-    )
 
-    await repo.save_reading(reading)
-    session.readings.append(reading)
+async def add_readings_batch(
+    session_id: str, request: ProbeReadingBatchRequest
+) -> tuple[CookSession, PredictionResult]:
+    """Log a burst of buffered probe readings, then re-run MC once.
 
-    # Advance state machine
-    sm = CookStateMachine(session)
-    sm.advance(reading)
+    Readings are inserted in a single transaction and replayed in order
+    through the state machine and trust evaluator, so the resulting state
+    matches posting them one at a time. Elapsed time comes from each
+    reading's timestamp (readings without one are taken as arriving now),
+    and readings are replayed sorted by timestamp, so a backlog uploaded
+    after a connection drop keeps its real spacing.
 
-    # Run MC with updated data
-    prediction = run_monte_carlo(session, n_iterations=1000)
-    prediction.session_id = session_id
+    Returns:
+        (updated session, new prediction)
+    """
+    async with _admitted_write(session_id):
+        session = await repo.load_session_tail(session_id, n_readings=1)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+
+        now = datetime.utcnow()
+        stamped = sorted(
+            ((to_naive_utc(item.timestamp) if item.timestamp else now, item)
+             for item in request.readings),
+            key=lambda pair: pair[0],
+        )
+        # Measured from one anchor, so readings older than the stored tail
+        # (held at its elapsed time) do not shift the ones after them
+        anchor = session.readings[-1] if session.readings else None
+        readings: list[ProbeReading] = []
+        for timestamp, item in stamped:
+            reading = ProbeReading(
+                session_id=session_id,
+                timestamp=timestamp,
+                temp_f=item.temp_f,
+                smoker_temp_f=item.smoker_temp_f,
+                elapsed_minutes=_elapsed_minutes(anchor, timestamp),
+            )
+            if anchor is None:
+                anchor = reading
+            readings.append(reading)
+
+        prediction = await _ingest_readings(session, readings)
+
+    log_event("readings_batch_added", session_id=session_id,
+              count=len(readings), state=session.current_state.value,
+              spans_ms=span_breakdown())
 
-    # Evaluate trust
-    trust = _get_trust(session_id)
-    prediction.confidence = trust.evaluate(session, prediction)
-    session.confidence = prediction.confidence
+    return session, prediction
 
-    await repo.save_prediction(prediction)
-    await repo.update_session_state(
-        session_id, session.current_state.value, session.confidence.value
-    )
 
-    log_event("reading_added", session_id=session_id,
-              temp=request.temp_f, state=session.current_state.value)
+async def ingest_samples(
+    session_id: str, request: ProbeSampleBatchRequest
+) -> tuple[Optional[CookSession], Optional[PredictionResult], int]:
+    """Buffer high-frequency probe samples, downsampling to 1-minute readings.
 
-    return session, prediction
+    Elapsed time is derived from sample timestamps. Only closed minute
+    aggregates are persisted, and the state machine and MC run once per
+    call that closes at least one minute. Samples are staged on a copy
+    of the session's buffer, which replaces it only after the closed
+    minutes are committed, so a failed call can be resent as-is.
+
+    Returns:
+        (updated session, new prediction, minutes closed). Session and
+        prediction are None when no minute bucket was closed.
+    """
+    # Checked before the buffer consumes any samples, so a rejected
+    # batch can be resent as-is
+    async with _admitted_write(session_id):
+        session = None
+        entry = _stream_buffers.get(session_id)
+        if entry is None:
+            session = await repo.load_session_tail(session_id, n_readings=1)
+            if session is None:
+                raise ValueError(f"Session {session_id} not found")
+            buffer = ProbeStreamBuffer.for_readings(
+                session_id, session.readings,
+                now=request.samples[0].timestamp or datetime.utcnow(),
+            )
+        else:
+            buffer = entry[1].copy()
+
+        closed: list[ProbeReading] = []
+        for sample in request.samples:
+            closed.extend(buffer.add(
+                sample.timestamp or datetime.utcnow(),
+                sample.temp_f,
+                sample.smoker_temp_f,
+            ))
+
+        if not closed:
+            _keep_buffer(session_id, buffer)
+            return None, None, 0
+
+        if session is None:
+            session = await repo.load_session_tail(session_id, n_readings=1)
+            if session is None:
+                raise ValueError(f"Session {session_id} not found")
+        prediction = await _ingest_readings(session, closed)
+        _keep_buffer(session_id, buffer)
+
+    log_event("samples_aggregated", session_id=session_id,
+              samples=len(request.samples), minutes=len(closed),
+              state=session.current_state.value)
+
+    return session, prediction, len(closed)
+
+
+async def _ingest_readings(
+    session: CookSession, readings: list[ProbeReading]
+) -> PredictionResult:
+    """Replay readings, re-run MC once, and persist everything in one commit.
+
+    Callers hold the session's lock from loading `session` until this returns.
+    """
+    stall_was_active = session.stall.in_stall
+
+    # Replay through state machine and trust in arrival order
+    with span("state_machine"):
+        sm = CookStateMachine(session)
+        trust = _get_trust(session.id)
+        for i, reading in enumerate(readings):
+            session.readings.append(reading)
+            sm.advance(reading)
+            if i < len(readings) - 1:
+                trust.observe(session)
+
+    with span("monte_carlo"):
+        prediction = await prediction_admission.run(run_monte_carlo, session, n_iterations=1000)
+    prediction.session_id = session.id
+    with span("trust"):
+        prediction.confidence = trust.evaluate(session, prediction)
+    session.confidence = prediction.confidence
+
+    with span("save"):
+        async with unit_of_work():
+            await repo.save_readings(readings)
+            await repo.save_prediction(prediction)
+            await repo.update_session_state(
+                session.id, session.current_state.value, session.confidence.value,
+                stall=session.stall,
+            )
+    with span("publish"):
+        await _publish_update(session, prediction, stall_was_active)
+    return prediction
 
 
 async def apply_wrap(
@@ -156,43 +442,51 @@ async def apply_wrap(
     Returns:
         (updated session, new prediction, tradeoff message)
     """
-    session = await repo.load_session(session_id)
-    if session is None:
-        raise ValueError(f"Session {session_id} not found")
-
-    current_temp = session.readings[-1].temp_f if session.readings else 160.0
-    elapsed = session.readings[-1].elapsed_minutes if session.readings else 0.0
-
-    intervention = InterventionEvent(
-        session_id=session_id,
-        timestamp=datetime.utcnow(),
-        wrap_type=request.wrap_type,
-        temp_at_wrap_f=current_temp,
-        elapsed_minutes=elapsed,
-    )
-
-    await repo.save_intervention(intervention)
-    session.interventions.append(intervention)
-    session.wrap_type = request.wrap_type
-
-    # Re-run MC with wrap applied
-    prediction = run_monte_carlo(session, n_iterations=1000)
-    prediction.session_id = session_id
-
-    trust = _get_trust(session_id)
-    prediction.confidence = trust.evaluate(session, prediction)
-
-    await repo.save_prediction(prediction)
-    await repo.update_session_state(
-        session_id, session.current_state.value,
-        session.confidence.value, request.wrap_type.value
-    )
+    async with _admitted_write(session_id):
+        with span("load"):
+            session = await repo.load_session_tail(session_id, n_readings=1)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+
+        current_temp = session.readings[-1].temp_f if session.readings else 160.0
+        elapsed = session.readings[-1].elapsed_minutes if session.readings else 0.0
+
+        intervention = InterventionEvent(
+            session_id=session_id,
+            timestamp=datetime.utcnow(),
+            wrap_type=request.wrap_type,
+            temp_at_wrap_f=current_temp,
+            elapsed_minutes=elapsed,
+        )
+
+        session.interventions.append(intervention)
+        session.wrap_type = request.wrap_type
+
+        # Re-run MC with wrap applied
+        with span("monte_carlo"):
+            prediction = await prediction_admission.run(run_monte_carlo, session, n_iterations=1000)
+        prediction.session_id = session_id
+
+        with span("trust"):
+            trust = _get_trust(session_id)
+            prediction.confidence = trust.evaluate(session, prediction)
+
+        with span("save"):
+            async with unit_of_work():
+                await repo.save_intervention(intervention)
+                await repo.save_prediction(prediction)
+                await repo.update_session_state(
+                    session_id, session.current_state.value,
+                    session.confidence.value, request.wrap_type.value
+                )
+        with span("publish"):
+            await _publish_update(session, prediction, session.stall.in_stall)
 
     tradeoff = get_wrap_tradeoff(request.wrap_type)
     message = f"{tradeoff['title']}: {tradeoff['effect']}"
 
     log_event("wrap_applied", session_id=session_id,
-              wrap_type=request.wrap_type.value)
+              wrap_type=request.wrap_type.value, spans_ms=span_breakdown())
 
     return session, prediction, message
 
@@ -212,15 +506,29 @@ async def finish_cook(
     session_id: str, request: FinishCookRequest
 ) -> PostCookReport:
     """End cook, compute post-cook report."""
-    session = await repo.load_session(session_id)
-    if session is None:
-        raise ValueError(f"Session {session_id} not found")
-
-    await repo.finish_session(
-        session_id,
-        quality_rating=request.quality_rating.value if request.quality_rating else None,
-        quality_notes=request.quality_notes,
-    )
+    async with _session_lock(session_id):
+        # A partially filled minute from a high-frequency stream goes
+        # through the same ingest (state machine, trust, MC) as closed ones
+        entry = _stream_buffers.get(session_id)
+        tail = entry[1].copy().flush() if entry is not None else None
+        if tail is not None:
+            with prediction_admission.reserve():
+                current = await repo.load_session_tail(session_id, n_readings=1)
+                if current is None:
+                    raise ValueError(f"Session {session_id} not found")
+                await _ingest_readings(current, [tail])
+        _stream_buffers.pop(session_id, None)
+
+        session = await repo.load_session(session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+
+        await repo.finish_session(
+            session_id,
+            quality_rating=request.quality_rating.value if request.quality_rating else None,
+            quality_notes=request.quality_notes,
+        )
+        await _publish_update(session, None, session.stall.in_stall)
 
     # Build report
     actual_temps = [r.temp_f for r in session.readings]
@@ -250,7 +558,7 @@ async def finish_cook(
         session_id=session_id,
         total_cook_minutes=total_minutes,
         final_temp_f=final_temp,
-        stall_occurred=session.stall.in_stall or session.stall.stall_duration_minutes > 0,
+        stall_occurred=_stall_occurred(session.stall),
         stall_duration_minutes=session.stall.stall_duration_minutes,
         was_wrapped=session.wrap_type != WrapType.NONE,
         wrap_type=session.wrap_type,
@@ -262,6 +570,7 @@ async def finish_cook(
         predicted_temps=predicted_temps,
         actual_temps=actual_temps,
         residuals=residuals,
+        elapsed_minutes=[r.elapsed_minutes for r in session.readings],
     )
 
     log_event("cook_finished", session_id=session_id,
@@ -272,10 +581,7 @@ async def finish_cook(
 
 async def get_prediction(session_id: str) -> Optional[PredictionResult]:
     """Get latest cached prediction for a session."""
-    session = await repo.load_session(session_id)
-    if session is None:
-        return None
-    return session.predictions[-1] if session.predictions else None
+    return await repo.load_latest_prediction(session_id, readonly=True)
 
 
 async def get_session(session_id: str) -> Optional[CookSession]:
@@ -283,42 +589,142 @@ async def get_session(session_id: str) -> Optional[CookSession]:
     return await repo.load_session(session_id)
 
 
-async def get_report(session_id: str) -> Optional[PostCookReport]:
-    """Build a report for a finished session."""
-    session = await repo.load_session(session_id)
+async def get_session_header(session_id: str) -> Optional[CookSession]:
+    """Load a session's own fields, without readings or events."""
+    return await repo.load_session_header(session_id, readonly=True)
+
+
+async def get_session_revision(session_id: str) -> Optional[SessionRevision]:
+    """Revision and last-modified time, for conditional requests."""
+    return await repo.load_session_revision(session_id, readonly=True)
+
+
+async def get_session_summary(session_id: str) -> Optional[SessionSummary]:
+    """Materialized state summary, for state queries."""
+    return await repo.load_session_summary(session_id, readonly=True)
+
+
+async def get_batch_state(
+    session_ids: list[str], with_predictions: bool = True
+) -> tuple[dict[str, SessionSummary], dict[str, PredictionResult]]:
+    """State summaries and latest predictions for many sessions at once.
+
+    Two set-based queries regardless of the number of sessions; unknown
+    IDs are absent from the result.
+    """
+    summaries = await repo.load_session_summaries(session_ids, readonly=True)
+    predictions: dict[str, PredictionResult] = {}
+    if with_predictions and summaries:
+        predictions = await repo.load_latest_predictions(list(summaries), readonly=True)
+    return summaries, predictions
+
+
+async def get_report(
+    session_id: str,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+    revision: Optional[SessionRevision] = None,
+) -> Optional[PostCookReport]:
+    """Build a report for a finished session.
+
+    Readings are loaded as NumPy columns rather than ProbeReading objects.
+    With `max_points`, the series are decimated to at most that many
+    points (see services/decimation.py) and the result is cached under
+    the session's revision. Callers that already looked the revision up
+    (conditional GETs) pass it as `revision` to skip a second lookup.
+    """
+    key = None
+    if max_points is not None:
+        if revision is None:
+            revision = await repo.load_session_revision(session_id, readonly=True)
+        if revision is None:
+            return None
+        key = (session_id, revision.revision, max_points, method)
+        cached = _decimated_reports.get(key)
+        if cached is not None:
+            _decimated_reports.move_to_end(key)
+            return cached
+
+    session = await repo.load_session_header(session_id, readonly=True)
     if session is None or not session.is_finished:
         return None
+    columns = await repo.load_reading_columns(session_id, readonly=True)
+    counts = await repo.count_session_rows(session_id, readonly=True)
+    latest = await repo.load_latest_prediction(session_id, readonly=True)
 
-    actual_temps = [r.temp_f for r in session.readings]
-    total_minutes = session.readings[-1].elapsed_minutes if session.readings else 0.0
-    final_temp = actual_temps[-1] if actual_temps else 0.0
+    n = len(columns)
+    actual_temps = columns.temp_f.tolist()
+    total_minutes = float(columns.elapsed_minutes[-1]) if n else 0.0
+    final_temp = actual_temps[-1] if n else 0.0
 
-    predicted_temps: list[float] = []
-    residuals: list[float] = []
-    n = len(actual_temps)
-    if n > 0:
-        for i in range(n):
-            frac = i / max(n - 1, 1)
-            pred_temp = 40.0 + frac * (session.target_temp_f - 40.0)
-            predicted_temps.append(round(pred_temp, 1))
-            residuals.append(round(actual_temps[i] - pred_temp, 1))
+    # Straight line from 40F to target, as in finish_cook
+    frac = np.arange(n) / max(n - 1, 1)
+    pred_temps = (40.0 + frac * (session.target_temp_f - 40.0)).tolist()
+    predicted_temps = [round(p, 1) for p in pred_temps]
+    residuals = [round(a - p, 1) for a, p in zip(actual_temps, pred_temps)]
 
     accuracy = 0.0
-    if session.predictions:
-        accuracy = abs(session.predictions[-1].p50_minutes - total_minutes)
+    if latest is not None:
+        accuracy = abs(latest.p50_minutes - total_minutes)
 
-    return PostCookReport(
+    report = PostCookReport(
         session_id=session_id,
         total_cook_minutes=total_minutes,
         final_temp_f=final_temp,
-        stall_occurred=session.stall.stall_duration_minutes > 0,
+        stall_occurred=_stall_occurred(session.stall),
         stall_duration_minutes=session.stall.stall_duration_minutes,
         was_wrapped=session.wrap_type != WrapType.NONE,
         wrap_type=session.wrap_type,
         prediction_accuracy_minutes=round(accuracy, 1),
-        readings_count=len(session.readings),
-        lid_opens_count=len(session.lid_events),
+        readings_count=n,
+        lid_opens_count=counts.lid_events,
         predicted_temps=predicted_temps,
         actual_temps=actual_temps,
         residuals=residuals,
+        elapsed_minutes=columns.elapsed_minutes.tolist(),
     )
+    if key is None:
+        return report
+
+    report = _decimate_report(report, session.stall, max_points, method)
+    _decimated_reports[key] = report
+    while len(_decimated_reports) > settings.report_cache_max_entries:
+        _decimated_reports.popitem(last=False)
+    return report
+
+
+def _decimate_report(
+    report: PostCookReport, stall: StallState, max_points: int, method: str
+) -> PostCookReport:
+    """Thin the report's aligned series to at most `max_points` points.
+
+    Points are chosen on the actual temperature curve, with the stall's
+    first and last readings pinned so the plateau stays flat; the finish
+    point is always kept.
+    """
+    x = np.asarray(report.elapsed_minutes)
+    keep = []
+    if stall.stall_start_minutes is not None:
+        bounds = [
+            stall.stall_start_minutes,
+            stall.stall_start_minutes + stall.stall_duration_minutes,
+        ]
+        keep = np.searchsorted(x, bounds).tolist()
+    indices = decimate_indices(
+        x, np.asarray(report.actual_temps), max_points, method, keep
+    ).tolist()
+
+    def pick(values: list[float]) -> list[float]:
+        return [values[i] for i in indices] if values else values
+
+    return dataclasses.replace(
+        report,
+        predicted_temps=pick(report.predicted_temps),
+        actual_temps=pick(report.actual_temps),
+        residuals=pick(report.residuals),
+        elapsed_minutes=pick(report.elapsed_minutes),
+    )
+
+
+# Each public service call runs in its own span (services/tracing.py)
+trace_functions(globals(), "service")
@@ -0,0 +1,104 @@
+"""Decimation of long temperature series for plotting.
+
+A 20-hour cook logs 1200+ readings, several times more points than a
+phone chart can draw. These helpers pick a subset of sample indices
+that keeps the curve's visual shape:
+
+- "lttb": Largest-Triangle-Three-Buckets. The first and last points are
+  kept; every bucket in between contributes the point forming the
+  largest triangle with the previously chosen point and the mean of the
+  next bucket, which keeps peaks, dips and slope changes.
+- "minmax": the minimum and maximum of each bucket, which keeps the full
+  envelope of noisy series.
+
+Callers may pin extra indices (e.g. stall start and end) that are
+always kept, so plateaus render flat instead of being cut across.
+Indices, not values, are returned so that several aligned series can
+share one selection.
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+DECIMATION_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Indices of at most `max_points` points chosen by LTTB."""
+    n = len(y)
+    if max_points >= n or n <= 2:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1])
+
+    # Interior points split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    # Mean of the bucket after each bucket; the last one's is the end point
+    next_x = np.append(np.add.reduceat(x[:n - 1], starts)[1:] / counts[1:], x[n - 1])
+    next_y = np.append(np.add.reduceat(y[:n - 1], starts)[1:] / counts[1:], y[n - 1])
+
+    chosen = np.empty(max_points, dtype=np.int64)
+    chosen[0] = 0
+    chosen[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the triangle area, up to sign
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        chosen[i + 1] = a
+    return chosen
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """Indices of each bucket's minimum and maximum, plus both ends."""
+    n = len(y)
+    if max_points >= n or n <= 2:
+        return np.arange(n)
+    n_buckets = max((max_points - 2) // 2, 1)
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    chosen = [0, n - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            bucket = y[start:stop]
+            chosen.append(start + int(np.argmin(bucket)))
+            chosen.append(start + int(np.argmax(bucket)))
+    return np.unique(chosen)
+
+
+def decimate_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int,
+    method: str = "lttb",
+    keep: Iterable[int] = (),
+) -> np.ndarray:
+    """Sorted indices of at most `max_points` points to plot.
+
+    Args:
+        x: Sample positions (e.g. elapsed minutes), increasing.
+        y: Sample values.
+        max_points: Size limit of the selection; at least 3.
+        method: One of DECIMATION_METHODS.
+        keep: Indices that must be part of the selection. They count
+            against `max_points`; out-of-range indices are ignored.
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Unknown decimation method: {method}")
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+
+    pinned = {i for i in keep if 0 < i < n - 1}
+    budget = max(max_points - len(pinned), 3)
+    if method == "lttb":
+        chosen = lttb_indices(x, y, budget)
+    else:
+        chosen = minmax_indices(y, budget)
+    return np.union1d(chosen, np.fromiter(pinned, dtype=np.int64, count=len(pinned)))
@@ -0,0 +1,302 @@
+"""Streaming bulk export of sessions, readings and predictions.
+
+Usage (from the repository root):
+
+    python -m backend.services.export_service readings --format csv \\
+        --since 2026-01-01 --cut-type brisket --output readings.csv
+
+Three flat tables can be exported, filtered by session creation date,
+cut and equipment: `sessions` (one row per cook), `readings` (one row
+per stored probe reading) and `predictions` (the stored prediction
+history, as left by retention). Rows are produced from key-paged reads
+of the repository (hot and archived sessions alike) and encoded batch by batch
+as NDJSON, CSV or an Arrow IPC stream, so memory stays constant however
+much is exported. The same generator backs the /api/v1/export endpoint.
+
+Timestamps are epoch milliseconds internally; NDJSON and CSV render
+them as ISO 8601 UTC, Arrow as timestamp[ms]. Arrow output needs the
+optional `pyarrow` package.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import math
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import repeat
+from typing import AsyncIterator, Iterable, Optional
+
+from ..database import repository as repo
+from ..database.archive_store import ArchivedRows
+from ..database.db import close_db, init_db
+from ..database.timestamps import from_epoch_ms, to_epoch_ms
+from ..models.enums import CutType, EquipmentType
+
+# Column name and type per exported table. Types: str, int, float,
+# bool, and ts (epoch ms).
+EXPORT_TABLES: dict[str, tuple[tuple[str, str], ...]] = {
+    "sessions": (
+        ("session_id", "str"),
+        ("created_at", "ts"),
+        ("meat_category", "str"),
+        ("cut_type", "str"),
+        ("weight_lbs", "float"),
+        ("thickness_inches", "float"),
+        ("equipment_type", "str"),
+        ("smoker_temp_f", "float"),
+        ("target_temp_f", "float"),
+        ("dinner_time", "ts"),
+        ("altitude_ft", "float"),
+        ("wrap_type", "str"),
+        ("current_state", "str"),
+        ("confidence", "str"),
+        ("weather_ambient_temp", "float"),
+        ("weather_wind_speed", "float"),
+        ("weather_humidity", "float"),
+        ("is_finished", "bool"),
+        ("quality_rating", "str"),
+        ("quality_notes", "str"),
+    ),
+    "readings": (
+        ("session_id", "str"),
+        ("timestamp", "ts"),
+        ("elapsed_minutes", "float"),
+        ("temp_f", "float"),
+        ("smoker_temp_f", "float"),
+        ("temp_min_f", "float"),
+        ("temp_max_f", "float"),
+        ("temp_mean_f", "float"),
+        ("sample_count", "int"),
+    ),
+    "predictions": (
+        ("session_id", "str"),
+        ("timestamp", "ts"),
+        ("p10_minutes", "float"),
+        ("p50_minutes", "float"),
+        ("p90_minutes", "float"),
+        ("confidence", "str"),
+        ("current_state", "str"),
+        ("stall_probability", "float"),
+        ("readings_count", "int"),
+    ),
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+FILE_EXTENSIONS = {"ndjson": "ndjson", "csv": "csv", "arrow": "arrows"}
+
+# Rows per encoded batch (one Arrow record batch, one response chunk)
+EXPORT_BATCH_ROWS = 5000
+
+# Arrow IPC end-of-stream marker: continuation token, zero length
+_ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+@dataclass
+class ExportQuery:
+    """Which table to export and which sessions to include."""
+    table: str
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    cut_type: Optional[CutType] = None
+    equipment_type: Optional[EquipmentType] = None
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _floats(values: Iterable[float]) -> list[Optional[float]]:
+    return [None if math.isnan(v) else v for v in values]
+
+
+def _table_rows(table: str, stored: ArchivedRows) -> Iterable[tuple]:
+    """Flatten one session's stored rows into the table's column order."""
+    session = stored.session
+    session_id = session["id"]
+    if table == "sessions":
+        row = {**session, "session_id": session_id,
+               "is_finished": bool(session["is_finished"])}
+        return [tuple(row[name] for name, _ in EXPORT_TABLES["sessions"])]
+    if table == "predictions":
+        names = [name for name, _ in EXPORT_TABLES["predictions"]]
+        return [tuple(p[name] for name in names) for p in stored.predictions]
+
+    c = stored.readings
+    return zip(
+        repeat(session_id),
+        c.timestamp_ms.tolist(),
+        c.elapsed_minutes.tolist(),
+        c.temp_f.tolist(),
+        _floats(c.smoker_temp_f.tolist()),
+        _floats(c.temp_min_f.tolist()),
+        _floats(c.temp_max_f.tolist()),
+        _floats(c.temp_mean_f.tolist()),
+        c.sample_count.tolist(),
+    )
+
+
+async def iter_export_rows(
+    query: ExportQuery, batch_rows: int = EXPORT_BATCH_ROWS
+) -> AsyncIterator[list[tuple]]:
+    """Yield the table's rows in batches of about `batch_rows`."""
+    sessions = repo.iter_session_rows(
+        since_ms=to_epoch_ms(query.since) if query.since else None,
+        until_ms=to_epoch_ms(query.until) if query.until else None,
+        cut_type=query.cut_type.value if query.cut_type else None,
+        equipment_type=query.equipment_type.value if query.equipment_type else None,
+        readings=query.table == "readings",
+        predictions=query.table == "predictions",
+    )
+    batch: list[tuple] = []
+    async for stored in sessions:
+        batch.extend(_table_rows(query.table, stored))
+        if len(batch) >= batch_rows:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _text_value(value, kind: str):
+    if value is None:
+        return None
+    if kind == "ts":
+        return from_epoch_ms(value).isoformat() + "Z"
+    return value
+
+
+def _encode_ndjson(columns, rows: list[tuple]) -> bytes:
+    names = [name for name, _ in columns]
+    kinds = [kind for _, kind in columns]
+    lines = [
+        json.dumps({
+            name: _text_value(value, kind)
+            for name, kind, value in zip(names, kinds, row)
+        })
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _encode_csv(columns, rows: list[tuple], header: bool) -> bytes:
+    kinds = [kind for _, kind in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(name for name, _ in columns)
+    writer.writerows(
+        [_text_value(value, kind) for kind, value in zip(kinds, row)]
+        for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    types = {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "ts": pa.timestamp("ms"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+def _encode_arrow_batch(schema, rows: list[tuple]) -> bytes:
+    import pyarrow as pa
+
+    arrays = [
+        pa.array(list(values), type=field.type)
+        for field, values in zip(schema, zip(*rows))
+    ]
+    return pa.record_batch(arrays, schema=schema).serialize().to_pybytes()
+
+
+async def stream_export(query: ExportQuery, fmt: str) -> AsyncIterator[bytes]:
+    """Encode an export as a stream of byte chunks, one per row batch.
+
+    Raises:
+        ValueError: Unknown table or format.
+        RuntimeError: Arrow requested but pyarrow is not installed.
+    """
+    if query.table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table: {query.table}")
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "arrow" and not arrow_available():
+        raise RuntimeError("Arrow export requires the pyarrow package")
+
+    columns = EXPORT_TABLES[query.table]
+    if fmt == "arrow":
+        # An IPC stream is the schema message, one message per record
+        # batch, then the end-of-stream marker
+        schema = _arrow_schema(columns)
+        yield schema.serialize().to_pybytes()
+        async for rows in iter_export_rows(query):
+            yield _encode_arrow_batch(schema, rows)
+        yield _ARROW_EOS
+        return
+
+    header = True
+    async for rows in iter_export_rows(query):
+        if fmt == "ndjson":
+            yield _encode_ndjson(columns, rows)
+        else:
+            yield _encode_csv(columns, rows, header)
+            header = False
+    if fmt == "csv" and header:
+        yield _encode_csv(columns, [], header=True)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    query = ExportQuery(
+        table=args.table,
+        since=args.since,
+        until=args.until,
+        cut_type=CutType(args.cut_type) if args.cut_type else None,
+        equipment_type=(
+            EquipmentType(args.equipment_type) if args.equipment_type else None
+        ),
+    )
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        await init_db()
+        async for chunk in stream_export(query, args.format):
+            out.write(chunk)
+    finally:
+        await close_db()
+        if args.output:
+            out.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("--format", choices=sorted(MEDIA_TYPES), default="ndjson")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="sessions created at or after (ISO date/time, UTC)")
+    parser.add_argument("--until", type=datetime.fromisoformat,
+                        help="sessions created before (ISO date/time, UTC)")
+    parser.add_argument("--cut-type", choices=[c.value for c in CutType])
+    parser.add_argument("--equipment-type", choices=[e.value for e in EquipmentType])
+    parser.add_argument("--output", "-o", help="file to write (default: stdout)")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,62 @@
-"""Structured event logging for cook sessions."""
+"""Structured event logging for cook sessions.
+
+Request handlers only pay for building a small dict. Once
+`setup_logging` has run, `log_event` puts that dict straight on a queue
+(no LogRecord, no handler lock, no JSON), and all other logging is
+routed to the same queue by a QueueHandler on the root logger. A
+background writer thread drains the queue in batches, encodes each
+event as one line of newline-delimited JSON (other records are
+formatted "%(message)s" when logged) and writes a batch with a single write +
+flush. With `settings.log_path` set it writes to that file, rotating by
+size; otherwise to stderr. A file that cannot be rotated keeps growing,
+and one that cannot be opened is replaced by stderr, so a full or
+read-only disk never stops the writer; a batch the file refuses is
+written to stderr instead. Before setup (tests, CLI tools) events go
+through the "pitmaster" logger as before.
+
+High-volume event types can be sampled with `settings.log_sample_rates`
+(event type -> fraction kept); kept events carry their `sample_rate`
+so counts can be scaled back up. When the queue is full, records are
+dropped and counted rather than blocking the caller; records that
+neither the file nor stderr would take are counted as lost.
+"""
 
-import logging
 import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler
+from typing import Optional, TextIO
+
+from ..config import settings
+from .metrics import Counter
 
 logger = logging.getLogger("pitmaster")
 
+_STOP = object()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class _JsonEvent:
+    """Log message that is encoded to JSON only when formatted."""
+
+    __slots__ = ("entry",)
+
+    def __init__(self, entry: dict):
+        self.entry = entry
+
+    def __str__(self) -> str:
+        return json.dumps(self.entry, default=_json_default)
+
 
 def log_event(
     event_type: str,
@@ -13,18 +64,226 @@ def log_event(
     **kwargs,
 ) -> None:
     """Log a structured event."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    rate = settings.log_sample_rates.get(event_type)
+    if rate is not None:
+        if rate < 1.0 and random.random() >= rate:
+            return
+        kwargs["sample_rate"] = rate
     entry = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.utcnow(),
         "event": event_type,
         "session_id": session_id,
         **kwargs,
     }
-    logger.info(json.dumps(entry))
+    writer = _writer
+    if writer is not None:
+        writer.submit(entry)
+    else:
+        logger.info(_JsonEvent(entry))
+
+
+class _EventQueueHandler(QueueHandler):
+    """Hand records to the writer.
+
+    The inherited `prepare` formats each record on the caller's thread,
+    so mutable args and exc_info are captured when the record is logged
+    rather than when the writer gets to it.
+    """
+
+    def __init__(self, writer: "BatchedLogWriter"):
+        super().__init__(writer.queue)
+        self.writer = writer
+        self.setFormatter(writer.formatter)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.writer.submit(record)
+
+
+class BatchedLogWriter(threading.Thread):
+    """Background thread writing queued events and records in batches."""
+
+    def __init__(
+        self,
+        path: str = "",
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        batch_size: int = 256,
+        max_queue: int = 10_000,
+    ):
+        super().__init__(name="pitmaster-log-writer", daemon=True)
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.formatter = logging.Formatter("%(message)s")
+        self.batches = 0
+        self.rotate_failures = 0
+        self.write_failures = 0
+        self.lost = 0
+        self._stream: Optional[TextIO] = None
+
+    def submit(self, item) -> None:
+        """Queue an event dict or LogRecord; drop it if the queue is full."""
+        if self.queue.qsize() >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.put(item)
+
+    def run(self) -> None:
+        self._stream = self._open_or_stderr()
+        try:
+            while True:
+                batch = [self.queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = _STOP in batch
+                records = [r for r in batch if r is not _STOP]
+                if records:
+                    self._write(records)
+                if stop:
+                    return
+        finally:
+            if self._stream is not None and self._stream is not sys.stderr:
+                self._stream.close()
+
+    def stop(self) -> None:
+        """Write everything queued so far, then end the thread."""
+        self.queue.put(_STOP)
+        self.join()
+
+    def _open(self) -> TextIO:
+        if not self.path:
+            return sys.stderr
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _open_or_stderr(self) -> TextIO:
+        try:
+            return self._open()
+        except OSError as exc:
+            self._report_failure("log_open_failed", exc, sys.stderr)
+            return sys.stderr
+
+    def _report_failure(self, event: str, exc: OSError, stream: TextIO) -> None:
+        entry = {"timestamp": datetime.utcnow(), "event": event,
+                 "path": self.path, "error": str(exc)}
+        try:
+            stream.write(json.dumps(entry, default=_json_default) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _format(self, item) -> str:
+        if isinstance(item, dict):
+            return json.dumps(item, default=_json_default)
+        try:
+            return self.formatter.format(item)
+        except Exception:
+            return json.dumps({"event": "log_format_failed", "logger": item.name})
+
+    def _write(self, records: list) -> None:
+        text = "\n".join(self._format(record) for record in records) + "\n"
+        try:
+            self._stream.write(text)
+            self._stream.flush()
+        except OSError as exc:
+            self.write_failures += 1
+            self._write_fallback(text, len(records), exc)
+            return
+        self.batches += 1
+        if (
+            self.path
+            and self.max_bytes > 0
+            and self._stream is not sys.stderr
+            and self._stream.tell() >= self.max_bytes
+        ):
+            self._rotate()
+
+    def _write_fallback(self, text: str, count: int, exc: OSError) -> None:
+        """Send a batch the log file refused to stderr, or count it as lost."""
+        if self._stream is not sys.stderr:
+            self._report_failure("log_write_failed", exc, sys.stderr)
+            try:
+                sys.stderr.write(text)
+                sys.stderr.flush()
+                return
+            except (OSError, ValueError):
+                pass
+        self.lost += count
+
+    def _rotate(self) -> None:
+        """Shift path -> path.1 -> ... -> path.<backup_count>, like RotatingFileHandler.
+
+        If shifting fails, the current file is reopened and keeps growing;
+        if that fails too, the writer continues on stderr.
+        """
+        self._stream.close()
+        try:
+            if self.backup_count > 0:
+                for i in range(self.backup_count - 1, 0, -1):
+                    source = f"{self.path}.{i}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{self.path}.{i + 1}")
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError as exc:
+            self.rotate_failures += 1
+            self._stream = self._open_or_stderr()
+            self._report_failure("log_rotate_failed", exc, self._stream)
+            return
+        self._stream = self._open_or_stderr()
+
+
+_handler: Optional[_EventQueueHandler] = None
+_writer: Optional[BatchedLogWriter] = None
+
+Counter("pitmaster_log_records_dropped_total", "Log records dropped on a full queue.",
+        function=lambda: _writer.dropped if _writer is not None else 0)
+Counter("pitmaster_log_write_failures_total", "Log batches the log file could not take.",
+        function=lambda: _writer.write_failures if _writer is not None else 0)
+Counter("pitmaster_log_records_lost_total", "Log records lost to write errors.",
+        function=lambda: _writer.lost if _writer is not None else 0)
 
 
 def setup_logging() -> None:
-    """Configure structured logging."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(message)s",
+    """Route all logging through the queue to a background batched writer."""
+    global _handler, _writer
+    if _writer is not None:
+        return
+    writer = BatchedLogWriter(
+        path=settings.log_path,
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count,
+        batch_size=settings.log_batch_size,
+        max_queue=settings.log_queue_size,
     )
+    writer.start()
+    _handler = _EventQueueHandler(writer)
+    _writer = writer
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(logging.INFO)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _handler, _writer
+    if _writer is None:
+        return
+    writer = _writer
+    logging.getLogger().removeHandler(_handler)
+    _handler = _writer = None
+    writer.stop()
@@ -0,0 +1,381 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+A deliberately small registry (counters, gauges, histograms) instead of
+a client library: recording is a dict lookup at most, a `bisect` and
+two additions, cheap enough for the heat solver's inner call and every
+repository function. Labelled children are resolved once where possible
+(`timed` and `instrument_functions` bind them when wrapping), and
+scrape-time values come from callbacks rather than being pushed.
+
+Metrics are recorded from `asyncio.to_thread` workers as well as the
+event loop (Monte Carlo runs and the heat solver run off the loop), so
+each child updates under its own lock, and a scrape copies a
+histogram's buckets, sum and count under that lock so they agree.
+
+All metrics live in the module-level REGISTRY, rendered by GET /metrics
+(routers/metrics.py). The hot-path metrics themselves are defined at
+the bottom of this module so every component records into the same
+names.
+"""
+
+import asyncio
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from ..config import settings
+
+# Seconds; spans sub-millisecond queries up to multi-second MC runs
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    """Named metrics, rendered together in registration order."""
+
+    def __init__(self):
+        self._metrics: dict[str, "_Metric"] = {}
+
+    def register(self, metric: "_Metric") -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional["_Metric"]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        registry: Optional[MetricsRegistry] = REGISTRY,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str):
+        """The child for one combination of label values (created on first use)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _child_items(self) -> list[tuple[tuple[str, ...], object]]:
+        """Children as a list, safe against concurrent `labels()` inserts."""
+        with self._lock:
+            return list(self._children.items())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    """Monotonic count. `function` makes it read an existing counter at scrape time."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY,
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames, registry)
+        self._function = function
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> list[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        return [
+            f"{self.name}{_label_text(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in self._child_items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, set directly or read at scrape time."""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        child = self.labels()
+        child.inc()
+        try:
+            yield
+        finally:
+            child.dec()
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, upper_bounds: tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        bucket = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        """Bucket counts, sum and count as of one instant."""
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations (e.g. latencies in seconds)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY,
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> list[str]:
+        lines = []
+        for key, child in self._child_items():
+            counts, total, n = child.snapshot()
+            cumulative = 0
+            bounds = self.buckets + (math.inf,)
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {n}")
+        return lines
+
+
+def timed(histogram: Histogram, *label_values: str):
+    """Decorator recording a function's wall time (sync or async) in seconds."""
+    child = histogram.labels(*label_values)
+
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    child.observe(time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+
+    return decorate
+
+
+def instrument_functions(namespace: dict, histogram: Histogram) -> None:
+    """Time every public coroutine function defined in a module.
+
+    Call at the end of the module with `globals()`; each function is
+    labelled with its name.
+    """
+    module = namespace["__name__"]
+    for name, fn in list(namespace.items()):
+        if (
+            not name.startswith("_")
+            and inspect.iscoroutinefunction(fn)
+            and fn.__module__ == module
+        ):
+            namespace[name] = timed(histogram, name)(fn)
+
+
+# Event-loop lag
+
+_lag_task: Optional[asyncio.Task] = None
+
+
+async def _monitor_loop_lag(interval_s: float) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval_s)
+        lag = max(time.perf_counter() - start - interval_s, 0.0)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+
+
+def start_loop_lag_monitor() -> None:
+    """Start sampling event-loop lag (no-op if disabled)."""
+    global _lag_task
+    interval = settings.metrics_loop_lag_interval_s
+    if interval <= 0 or (_lag_task is not None and not _lag_task.done()):
+        return
+    _lag_task = asyncio.create_task(_monitor_loop_lag(interval))
+
+
+async def stop_loop_lag_monitor() -> None:
+    """Cancel the lag sampler and wait for it to stop."""
+    global _lag_task
+    if _lag_task is None:
+        return
+    _lag_task.cancel()
+    try:
+        await _lag_task
+    except asyncio.CancelledError:
+        pass
+    _lag_task = None
+
+
+# Hot-path metrics
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "pitmaster_http_request_duration_seconds",
+    "Time from request to response start, by route template.",
+    ("method", "route", "status"),
+)
+MONTE_CARLO_SECONDS = Histogram(
+    "pitmaster_monte_carlo_duration_seconds",
+    "Wall time of one run_monte_carlo call.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+MONTE_CARLO_IN_PROGRESS = Gauge(
+    "pitmaster_monte_carlo_in_progress",
+    "Prediction jobs (Monte Carlo runs) currently executing.",
+)
+MONTE_CARLO_ITERATIONS = Counter(
+    "pitmaster_monte_carlo_iterations_total",
+    "Monte Carlo iterations run.",
+)
+MONTE_CARLO_UNFINISHED = Counter(
+    "pitmaster_monte_carlo_unfinished_iterations_total",
+    "Iterations that did not reach the target temperature within the horizon.",
+)
+MONTE_CARLO_P50_STDERR = Histogram(
+    "pitmaster_monte_carlo_p50_stderr_minutes",
+    "Estimated standard error of the P50 finish time (convergence error).",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 60.0),
+)
+HEAT_SOLVER_SECONDS = Histogram(
+    "pitmaster_heat_solver_duration_seconds",
+    "Wall time of one solve_1d_heat call.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+REPOSITORY_SECONDS = Histogram(
+    "pitmaster_repository_duration_seconds",
+    "Wall time of repository functions, by function.",
+    ("function",),
+)
+WEATHER_FETCH_SECONDS = Histogram(
+    "pitmaster_weather_fetch_duration_seconds",
+    "Wall time of fetch_weather, including cache hits.",
+)
+EVENT_LOOP_LAG = Histogram(
+    "pitmaster_event_loop_lag_seconds",
+    "How late the lag sampler's sleep wakes up.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "pitmaster_event_loop_lag_last_seconds",
+    "Most recent event-loop lag sample.",
+)
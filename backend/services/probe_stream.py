@@ -0,0 +1,138 @@
+"""In-memory per-minute downsampling for high-frequency probes.
+
+Newer wireless probes push samples at ~1 Hz. Rather than storing every
+raw sample, each session folds samples into a per-minute bucket (min,
+max, mean, last). When a sample lands in a later minute, the open bucket
+is closed and emitted as a single ProbeReading, which is what gets
+persisted and fed to the state machine and MC engine. Storage and CPU
+therefore scale with cook duration, not probe frequency.
+
+A buffer is a handful of scalars, so the service stages each request's
+samples on a `copy()` and keeps it only once the closed minutes are
+committed.
+"""
+
+import copy
+import math
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..database.timestamps import to_naive_utc
+from ..models.dataclasses import ProbeReading
+
+
+class ProbeStreamBuffer:
+    """The currently open minute bucket of one session's sample stream."""
+
+    def __init__(
+        self,
+        session_id: str,
+        origin: datetime,
+        first_open_minute: int = 0,
+    ):
+        """
+        Args:
+            session_id: Owning cook session.
+            origin: Timestamp corresponding to elapsed_minutes == 0.
+            first_open_minute: Earliest minute that may still be emitted;
+                samples from earlier minutes are dropped as late.
+        """
+        self.session_id = session_id
+        self.origin = origin
+
+        self._minute = first_open_minute
+        self._n = 0
+        self._min = math.inf
+        self._max = -math.inf
+        self._sum = 0.0
+        self._smoker_sum = 0.0
+        self._smoker_n = 0
+        self._last_temp = 0.0
+        self._last_elapsed = 0.0
+        self._last_timestamp: Optional[datetime] = None
+
+    @classmethod
+    def for_readings(
+        cls, session_id: str, readings: list[ProbeReading], now: datetime
+    ) -> "ProbeStreamBuffer":
+        """Create a buffer that continues after a session's stored readings.
+
+        Only the latest reading is used, so the session's tail is enough.
+        """
+        if not readings:
+            return cls(session_id, origin=to_naive_utc(now))
+        last = readings[-1]
+        return cls(
+            session_id,
+            origin=last.timestamp - timedelta(minutes=last.elapsed_minutes),
+            first_open_minute=math.floor(last.elapsed_minutes) + 1,
+        )
+
+    def copy(self) -> "ProbeStreamBuffer":
+        """An independent buffer in the same state."""
+        return copy.copy(self)
+
+    def add(
+        self,
+        timestamp: datetime,
+        temp_f: float,
+        smoker_temp_f: Optional[float] = None,
+    ) -> list[ProbeReading]:
+        """Buffer one raw sample.
+
+        Timezone-aware timestamps are converted to naive UTC first.
+
+        Returns:
+            Aggregated readings for any minute buckets this sample closed
+            (empty for most samples).
+        """
+        timestamp = to_naive_utc(timestamp)
+        elapsed = (timestamp - self.origin).total_seconds() / 60.0
+        minute = math.floor(elapsed)
+        if minute < self._minute:
+            return []  # late sample for an already-emitted minute
+
+        closed: list[ProbeReading] = []
+        if minute > self._minute:
+            aggregate = self.flush()
+            if aggregate is not None:
+                closed.append(aggregate)
+            self._minute = minute
+
+        self._n += 1
+        self._min = min(self._min, temp_f)
+        self._max = max(self._max, temp_f)
+        self._sum += temp_f
+        if smoker_temp_f is not None:
+            self._smoker_sum += smoker_temp_f
+            self._smoker_n += 1
+        self._last_temp = temp_f
+        self._last_elapsed = elapsed
+        self._last_timestamp = timestamp
+        return closed
+
+    def flush(self) -> Optional[ProbeReading]:
+        """Close the open minute bucket, returning its aggregate if any."""
+        if self._n == 0:
+            return None
+        reading = ProbeReading(
+            session_id=self.session_id,
+            timestamp=self._last_timestamp,
+            temp_f=self._last_temp,
+            smoker_temp_f=(
+                self._smoker_sum / self._smoker_n if self._smoker_n else None
+            ),
+            elapsed_minutes=round(self._last_elapsed, 4),
+            temp_min_f=self._min,
+            temp_max_f=self._max,
+            temp_mean_f=self._sum / self._n,
+            sample_count=self._n,
+        )
+        self._minute += 1
+        self._n = 0
+        self._min = math.inf
+        self._max = -math.inf
+        self._sum = 0.0
+        self._smoker_sum = 0.0
+        self._smoker_n = 0
+        return reading
@@ -0,0 +1,145 @@
+"""On-demand profiling of single requests.
+
+While a profiled request runs, a background thread samples the stack
+of the event-loop thread every `profile_sample_interval_ms` (via
+`sys._current_frames`) into a flamegraph-compatible profile in
+collapsed-stack format (one "frame;frame;frame count" line per
+distinct stack), readable by flamegraph.pl, speedscope or inferno.
+
+The samples show where the loop thread spends CPU, not where a request
+waits: while a coroutine awaits the database thread or a Monte Carlo
+worker, the loop sits in the selector and every sample lands in
+`selectors:...select`. Wall time per layer (router, service,
+repository, simulation, other) therefore comes from the request's
+span tree (services/tracing.py) instead, which times those awaits
+where they happen; see `layer_seconds`.
+
+The whole loop thread is sampled, so concurrent requests on the same
+loop appear in the flamegraph too; only one request is profiled at a
+time. Monte Carlo runs in worker threads (see admission.py) and is
+missing from the flamegraph, though not from the layer times; set
+`prediction_max_concurrent` to 0 to sample it inline.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .tracing import Span
+
+# Span name, or its "prefix." -> layer reported in Server-Timing. Other
+# spans (service stages such as "load" or "save") count toward the
+# layer of the span they are nested in.
+SPAN_LAYERS = {
+    "service": "service",
+    "repository": "repository",
+    "monte_carlo": "simulation",
+    "backward_plan": "simulation",
+}
+LAYER_ORDER = ("router", "service", "repository", "simulation", "other")
+
+
+@dataclass
+class StackProfile:
+    """Sampled stacks of one profiled interval."""
+    wall_s: float = 0.0
+    interval_s: float = 0.001
+    stacks: Counter = field(default_factory=Counter)  # root-first frame tuples
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, the input format of flamegraph tools."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+def layer_seconds(root: Span) -> dict[str, float]:
+    """Wall time per layer from a profiled request's span tree.
+
+    Each span's self time (its duration minus its children's) goes to
+    its layer. `root` itself counts as "other" (middleware outside the
+    request span) and the spans directly below it as "router" unless
+    named in SPAN_LAYERS. The layers add up to the root's duration.
+    """
+    totals = dict.fromkeys(LAYER_ORDER, 0.0)
+
+    def walk(node: Span, layer: str) -> None:
+        inherited = "router" if node is root else layer
+        children_ms = 0.0
+        for child in node.children:
+            walk(child, SPAN_LAYERS.get(child.name.split(".", 1)[0], inherited))
+            children_ms += child.duration_ms
+        # Concurrent children (gathered awaits) can exceed their parent
+        totals[layer] += max(node.duration_ms - children_ms, 0.0) / 1000.0
+
+    walk(root, "other")
+    return totals
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{frame.f_globals.get('__name__', '?')}:{name}"
+
+
+class StackSampler:
+    """Samples one thread's stack from a background thread."""
+
+    def __init__(self, thread_id: int, interval_s: float):
+        self.thread_id = thread_id
+        self.profile = StackProfile(interval_s=interval_s)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="pitmaster-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> StackProfile:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.profile.wall_s = time.perf_counter() - self._started
+        return self.profile
+
+    def _run(self) -> None:
+        interval = self.profile.interval_s
+        stacks = self.profile.stacks
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                stacks[tuple(reversed(labels))] += 1
+
+
+_active_lock = threading.Lock()
+
+
+def try_start_sampler(interval_s: float) -> Optional[StackSampler]:
+    """Start sampling the calling thread, unless a profile is already running."""
+    if not _active_lock.acquire(blocking=False):
+        return None
+    sampler = StackSampler(threading.get_ident(), interval_s)
+    sampler.start()
+    return sampler
+
+
+def finish_sampler(sampler: StackSampler) -> StackProfile:
+    """Stop a sampler from `try_start_sampler` and release the slot."""
+    try:
+        return sampler.stop()
+    finally:
+        _active_lock.release()
@@ -0,0 +1,103 @@
+"""Background retention for prediction history and finished sessions.
+
+save_prediction stores one row per reading, but only the latest is read
+while cooking. A periodic pass keeps that history bounded:
+
+- Active sessions keep full resolution for the most recent
+  `prediction_full_resolution_minutes` (relative to their latest
+  prediction); older predictions are downsampled to one per
+  `prediction_downsample_minutes` plus every state change.
+- Finished sessions are compacted once to a summary: the first
+  prediction, every state change and the final prediction.
+- Compacted sessions older than `archive_after_days` are moved out of
+  the hot tables into monthly archive files (database/archive_store.py);
+  loaders read them from there transparently.
+- Freed pages are returned to the filesystem with an incremental vacuum.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..config import settings
+from ..database import repository as repo
+from ..database.timestamps import to_epoch_ms
+from ..services.logging_service import log_event
+
+# Finished sessions compacted (and archived) per pass, to bound each pass
+COMPACT_BATCH = 500
+ARCHIVE_BATCH = 200
+
+_task: Optional[asyncio.Task] = None
+
+
+async def run_retention_pass() -> dict[str, int]:
+    """Run one retention pass over all sessions."""
+    full_resolution_ms = int(settings.prediction_full_resolution_minutes * 60_000)
+    bucket_ms = max(int(settings.prediction_downsample_minutes * 60_000), 1)
+
+    active, finished = await repo.list_retention_candidates(COMPACT_BATCH)
+    downsampled = 0
+    for session_id in active:
+        downsampled += await repo.downsample_predictions(
+            session_id, full_resolution_ms, bucket_ms
+        )
+    compacted = 0
+    for session_id in finished:
+        compacted += await repo.compact_predictions(session_id)
+
+    archived = 0
+    if settings.archive_after_days > 0:
+        cutoff = datetime.utcnow() - timedelta(days=settings.archive_after_days)
+        archived = await repo.archive_finished_sessions(
+            to_epoch_ms(cutoff), ARCHIVE_BATCH
+        )
+
+    changed = bool(downsampled or compacted or archived)
+    free_pages = 0
+    if changed:
+        free_pages = await repo.incremental_vacuum(settings.retention_vacuum_pages)
+
+    stats = {
+        "sessions_downsampled": len(active),
+        "sessions_compacted": len(finished),
+        "sessions_archived": archived,
+        "predictions_deleted": downsampled + compacted,
+        "free_pages": free_pages,
+    }
+    if changed:
+        log_event("prediction_retention", **stats)
+    return stats
+
+
+async def _run_forever(interval_s: float) -> None:
+    while True:
+        try:
+            await run_retention_pass()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            log_event("prediction_retention_failed", error=str(exc))
+        await asyncio.sleep(interval_s)
+
+
+def start_retention() -> None:
+    """Start the background retention loop (no-op if disabled)."""
+    global _task
+    interval = settings.prediction_retention_interval_s
+    if interval <= 0 or (_task is not None and not _task.done()):
+        return
+    _task = asyncio.create_task(_run_forever(interval))
+
+
+async def stop_retention() -> None:
+    """Cancel the background retention loop and wait for it to stop."""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,72 @@
+"""In-process pub/sub of live session updates.
+
+Write paths in cook_session_service publish a prediction, state and
+stall event after each committed update; the /cook/{id}/stream endpoint
+subscribes and pushes them to the client. Subscribers are plain asyncio
+queues, so an idle connection costs nothing between updates, and when
+nobody is subscribed to a session publishing is skipped entirely.
+
+Each event is encoded once (`SessionEvent.frame`) and the same bytes are
+sent to every subscriber. Queues are bounded: a subscriber that falls
+behind loses its oldest events rather than holding memory, which is
+safe because every event is a full snapshot. The bus only reaches
+clients connected to this process.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+# Events buffered per subscriber before the oldest is dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+@dataclass(eq=False)
+class SessionEvent:
+    """One update pushed to a session's subscribers."""
+    kind: str  # "prediction", "state" or "stall"
+    payload: Any  # PredictionResult, or SessionSummary for state/stall
+    session_created_at: Optional[datetime] = None
+    frame: Optional[bytes] = None  # wire encoding, shared by all subscribers
+
+
+class SessionEventBus:
+    """Fan-out of session events to per-subscriber queues."""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def has_subscribers(self, session_id: str) -> bool:
+        return bool(self._subscribers.get(session_id))
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(session_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[session_id]
+
+    def publish(self, session_id: str, event: SessionEvent) -> None:
+        for queue in self._subscribers.get(session_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+        self.published += 1
+
+
+session_events = SessionEventBus()
@@ -0,0 +1,175 @@
+"""Lightweight nested spans for per-stage timing.
+
+A span times one stage of work. Spans opened while another is active
+become its children, following the `contextvars` context, so they nest
+across `await` the same way the code does: the HTTP request
+(TracingMiddleware, routers/tracing.py) contains the service call,
+which contains its stages (load, state machine, Monte Carlo, trust,
+save) and the repository functions they call.
+
+Finished request traces are kept in a bounded in-memory buffer and can
+be exported as JSON (GET /api/v1/traces). Services attach the timing
+breakdown of their own span to structured log events via
+`span_breakdown()`.
+
+Opening a span costs an object allocation, two `perf_counter` calls and
+a context-variable set/reset.
+"""
+
+import functools
+import inspect
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from ..config import settings
+
+_current: ContextVar[Optional["Span"]] = ContextVar("_current_span", default=None)
+
+
+class Span:
+    """One timed stage and the stages nested in it."""
+
+    __slots__ = ("name", "start", "end", "children", "attributes")
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: list[Span] = []
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000.0
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    def to_dict(self, origin: Optional[float] = None) -> dict:
+        """JSON-ready tree; offsets are relative to the root's start."""
+        origin = self.start if origin is None else origin
+        data = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000.0, 3),
+            "duration_ms": round(self.duration_ms, 3),
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.children:
+            data["children"] = [child.to_dict(origin) for child in self.children]
+        return data
+
+
+class Trace:
+    """A finished root span with an ID and wall-clock start."""
+
+    __slots__ = ("trace_id", "started_at", "root")
+
+    def __init__(self, root: Span, started_at: datetime):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = started_at
+        self.root = root
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_at.isoformat(),
+            **self.root.to_dict(),
+        }
+
+
+recent_traces: deque[Trace] = deque(maxlen=settings.trace_buffer_size)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time a stage as a child of the active span (or as a new root)."""
+    parent = _current.get()
+    child = Span(name, **attributes)
+    if parent is not None and parent.end is None:
+        parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        _current.reset(token)
+
+
+def traced(name: str):
+    """Decorator running a function (sync or async) inside a span."""
+
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def trace_functions(namespace: dict, prefix: str) -> None:
+    """Run every public coroutine function of a module in a span.
+
+    Call at the end of the module with `globals()`; spans are named
+    "<prefix>.<function>".
+    """
+    module = namespace["__name__"]
+    for name, fn in list(namespace.items()):
+        if (
+            not name.startswith("_")
+            and inspect.iscoroutinefunction(fn)
+            and fn.__module__ == module
+        ):
+            namespace[name] = traced(f"{prefix}.{name}")(fn)
+
+
+def span_breakdown(root: Optional[Span] = None) -> dict[str, float]:
+    """Milliseconds per nested stage of `root` (default: the active span).
+
+    Keys are slash-separated paths below the root, e.g. "save" and
+    "save/repository.save_reading"; repeated names are summed. "total"
+    is the root's duration so far.
+    """
+    root = root or _current.get()
+    if root is None:
+        return {}
+    breakdown: dict[str, float] = {}
+
+    def walk(node: Span, prefix: str) -> None:
+        for child in node.children:
+            path = f"{prefix}{child.name}"
+            breakdown[path] = breakdown.get(path, 0.0) + child.duration_ms
+            walk(child, path + "/")
+
+    walk(root, "")
+    breakdown = {path: round(ms, 3) for path, ms in breakdown.items()}
+    breakdown["total"] = round(root.duration_ms, 3)
+    return breakdown
+
+
+def export_traces(limit: Optional[int] = None) -> list[dict]:
+    """Most recent finished request traces, newest first, as JSON-ready dicts."""
+    traces = list(reversed(recent_traces))
+    if limit is not None:
+        traces = traces[:limit]
+    return [trace.to_dict() for trace in traces]
@@ -6,6 +6,7 @@ from typing import Optional
 
 from ..config import settings
 from ..models.dataclasses import WeatherSnapshot
+from .metrics import WEATHER_FETCH_SECONDS, timed
 
 
 # Cache weather for 30 minutes
@@ -14,6 +15,7 @@ CACHE_TTL_MINUTES = 30
 _weather_cache: dict[str, tuple[WeatherSnapshot, datetime]] = {}
 
 
+@timed(WEATHER_FETCH_SECONDS)
 async def fetch_weather(
     latitude: float, longitude: float
 ) -> Optional[WeatherSnapshot]:
@@ -16,6 +16,14 @@ from ..models.dataclasses import (
     PredictionResult,
     WeatherSnapshot,
 )
+from ..services.metrics import (
+    MONTE_CARLO_IN_PROGRESS,
+    MONTE_CARLO_ITERATIONS,
+    MONTE_CARLO_P50_STDERR,
+    MONTE_CARLO_SECONDS,
+    MONTE_CARLO_UNFINISHED,
+    timed,
+)
 from .physics import solve_1d_heat
 from .biological_noise import sample_diffusivity, sample_smoker_temp_noise
 from .stall_model import stall_probability
@@ -30,6 +38,7 @@ EQUIPMENT_TEMP_VARIANCE: dict[EquipmentType, float] = {
 }
 
 
+@timed(MONTE_CARLO_SECONDS)
 def run_monte_carlo(
     session: CookSession,
     n_iterations: int = 5000,
@@ -45,6 +54,13 @@ def run_monte_carlo(
     Returns:
         PredictionResult with P10/P50/P90 finish times.
     """
+    with MONTE_CARLO_IN_PROGRESS.track_inprogress():
+        return _run_monte_carlo(session, n_iterations, seed)
+
+
+def _run_monte_carlo(
+    session: CookSession, n_iterations: int, seed: int | None
+) -> PredictionResult:
     rng = np.random.default_rng(seed)
 
     # Determine current state from readings
@@ -113,6 +129,7 @@ def run_monte_carlo(
 
     # Filter out infinite values (didn't finish in time)
     valid = finish_times[np.isfinite(finish_times)]
+    _record_run(n_iterations, valid)
     if len(valid) < n_iterations * 0.5:
         # More than half didn't finish — very uncertain
         p10 = float(np.percentile(finish_times[np.isfinite(finish_times)], 10)) if len(valid) > 0 else max_remaining + elapsed
@@ -136,16 +153,26 @@ def run_monte_carlo(
         confidence=confidence,
         current_state=session.current_state,
         stall_probability=round(stall_prob, 3),
-        readings_count=len(session.readings),
+        readings_count=session.readings_count,
     )
 
 
+def _record_run(n_iterations: int, valid: np.ndarray) -> None:
+    """Iteration counts and the P50's sampling error, for /metrics."""
+    MONTE_CARLO_ITERATIONS.inc(n_iterations)
+    MONTE_CARLO_UNFINISHED.inc(n_iterations - len(valid))
+    if len(valid) > 1:
+        # Asymptotic standard error of a sample median: sqrt(pi/2) * sd / sqrt(n)
+        stderr = 1.2533 * float(np.std(valid, ddof=1)) / np.sqrt(len(valid))
+        MONTE_CARLO_P50_STDERR.observe(stderr)
+
+
 def _compute_confidence(
     valid_times: np.ndarray, session: CookSession
 ) -> ConfidenceTier:
     """Determine confidence tier based on spread and data."""
     spread = float(np.percentile(valid_times, 90) - np.percentile(valid_times, 10))
-    n_readings = len(session.readings)
+    n_readings = session.readings_count
 
     if n_readings >= 10 and spread < 60:
         return ConfidenceTier.HIGH
@@ -10,6 +10,7 @@ so the stall model is *coupled*, not post-hoc.
 
 import numpy as np
 from ..models.enums import CutType, WrapType
+from ..services.metrics import HEAT_SOLVER_SECONDS, timed
 from .altitude import boiling_point_at_altitude
 
 # Thermal diffusivity lookup table (mm²/s) per cut type.
@@ -46,6 +47,7 @@ N_NODES = 50
 BIOT_NUMBER = 0.3
 
 
+@timed(HEAT_SOLVER_SECONDS)
 def solve_1d_heat(
     cut_type: CutType,
     thickness_inches: float,
@@ -6,8 +6,13 @@ A slope detection override triggers stall state when observed temp slope
 falls below 0.02°F/min for 10+ consecutive minutes.
 """
 
+from collections.abc import Sequence
+from datetime import datetime
+
 import numpy as np
 
+from ..models.dataclasses import SlopeHistory, SlopeWindow
+
 
 # Logistic hazard function coefficients (from spec)
 BETA_0 = -8.0   # intercept
@@ -20,6 +25,9 @@ MIN_STALL_DURATION_MIN = 10  # consecutive minutes below threshold to confirm
 STALL_TEMP_LOW = 140.0
 STALL_TEMP_HIGH = 185.0
 
+# Trailing window for the least-squares slope estimators
+SLOPE_WINDOW_MINUTES = 10.0
+
 
 def stall_probability(temp_f: float) -> float:
     """Compute the probability that the meat is in a stall at given temp.
@@ -39,7 +47,7 @@ def stall_probability(temp_f: float) -> float:
 
 
 def detect_stall_override(
-    slope_history: list[float],
+    slope_history: SlopeHistory | Sequence[float],
     current_temp_f: float,
 ) -> bool:
     """Determine if stall should be forced based on observed slope.
@@ -48,7 +56,8 @@ def detect_stall_override(
     and temperature is in the stall zone.
 
     Args:
-        slope_history: Recent temperature slopes (°F/min), newest last.
+        slope_history: A SlopeHistory ring buffer (checked in O(1)) or a
+            plain sequence of recent slopes (°F/min), newest last.
         current_temp_f: Current probe temperature.
 
     Returns:
@@ -57,6 +66,9 @@ def detect_stall_override(
     if current_temp_f < STALL_TEMP_LOW or current_temp_f > STALL_TEMP_HIGH:
         return False
 
+    if isinstance(slope_history, SlopeHistory):
+        return slope_history.below_threshold_run >= MIN_STALL_DURATION_MIN
+
     if len(slope_history) < MIN_STALL_DURATION_MIN:
         return False
 
@@ -79,6 +91,39 @@ def compute_slope(temps: list[float], dt_minutes: float = 1.0) -> float:
     return (temps[-1] - temps[-2]) / dt_minutes
 
 
+def push_slope(history: SlopeHistory, slope: float) -> None:
+    """Append a slope to the ring buffer in O(1), overwriting the oldest."""
+    history.values[history.head] = slope
+    history.head = (history.head + 1) % history.capacity
+    history.count = min(history.count + 1, history.capacity)
+    if slope < SLOPE_THRESHOLD:
+        history.below_threshold_run += 1
+    else:
+        history.below_threshold_run = 0
+
+
+def update_slope_history(history: SlopeHistory, temp_f: float, minutes: float) -> None:
+    """Record a probe reading taken at `minutes`, pushing the windowed slope.
+
+    The slope is fitted over the readings of the trailing window, so it
+    follows their real spacing. Nothing is pushed until the window holds
+    two readings.
+    """
+    slope = window_update(history.window, minutes, temp_f)
+    if len(history.window.samples) >= 2:
+        push_slope(history, slope)
+    history.last_temp_f = temp_f
+
+
+def recent_slopes(history: SlopeHistory) -> list[float]:
+    """Return the buffered slopes in chronological order, oldest first."""
+    start = (history.head - history.count) % history.capacity
+    return [
+        history.values[(start + i) % history.capacity]
+        for i in range(history.count)
+    ]
+
+
 def compute_slope_history(
     temps: list[float], window: int = 15, dt_minutes: float = 1.0
 ) -> list[float]:
@@ -95,8 +140,152 @@ def compute_slope_history(
     if len(temps) < 2:
         return []
 
-    start = max(0, len(temps) - window - 1)
-    slopes = []
-    for i in range(start + 1, len(temps)):
-        slopes.append((temps[i] - temps[i - 1]) / dt_minutes)
+    recent = np.asarray(temps[-(window + 1):], dtype=np.float64)
+    return (np.diff(recent) / dt_minutes).tolist()
+
+
+def window_update(window: SlopeWindow, t: float, temp_f: float) -> float:
+    """Add a sample at `t` minutes to a slope window and return its slope.
+
+    Samples at or before `t - window.window_minutes` are evicted, with
+    their contribution subtracted from the running sums. The sums are
+    kept with the window's first sample as the time origin, as
+    `rolling_slopes` does, so they stay well conditioned however long
+    the cook runs.
+    """
+    origin = window.samples[0][0] if window.samples else t
+    window.samples.append((t, temp_f))
+    dt = t - origin
+    window.sum_t += dt
+    window.sum_y += temp_f
+    window.sum_tt += dt * dt
+    window.sum_ty += dt * temp_f
+
+    cutoff = t - window.window_minutes
+    if window.samples[0][0] <= cutoff:
+        while window.samples[0][0] <= cutoff:
+            old_t, old_y = window.samples.popleft()
+            old_dt = old_t - origin
+            window.sum_t -= old_dt
+            window.sum_y -= old_y
+            window.sum_tt -= old_dt * old_dt
+            window.sum_ty -= old_dt * old_y
+        _rebase_window(window, window.samples[0][0] - origin)
+
+    return window_slope(window)
+
+
+def _rebase_window(window: SlopeWindow, shift: float) -> None:
+    """Move the sums' time origin `shift` minutes later."""
+    n = len(window.samples)
+    window.sum_tt += -2.0 * shift * window.sum_t + n * shift * shift
+    window.sum_ty -= shift * window.sum_y
+    window.sum_t -= n * shift
+
+
+def window_slope(window: SlopeWindow) -> float:
+    """Least-squares slope of the windowed samples, 0.0 if undefined."""
+    n = len(window.samples)
+    if n < 2:
+        return 0.0
+    denom = n * window.sum_tt - window.sum_t * window.sum_t
+    if denom <= 1e-12:
+        return 0.0
+    return (n * window.sum_ty - window.sum_t * window.sum_y) / denom
+
+
+class RollingSlopeEstimator:
+    """Streaming least-squares slope over a trailing time window.
+
+    Samples are weighted by their real spacing, so irregular or
+    high-frequency probe intervals are handled. Running sums make each
+    update O(1) amortized regardless of the window's sample count.
+    """
+
+    def __init__(self, window_minutes: float = SLOPE_WINDOW_MINUTES):
+        self.window = SlopeWindow(window_minutes=window_minutes)
+        self._origin: datetime | None = None
+
+    @property
+    def n(self) -> int:
+        """Number of samples currently inside the window."""
+        return len(self.window.samples)
+
+    def update(self, when: datetime | float, temp_f: float) -> float:
+        """Add a sample and return the current slope (°F/min).
+
+        Args:
+            when: Reading timestamp, or elapsed minutes as a float.
+            temp_f: Probe temperature.
+        """
+        return window_update(self.window, self._to_minutes(when), temp_f)
+
+    @property
+    def slope(self) -> float:
+        """Least-squares slope of the windowed samples, 0.0 if undefined."""
+        return window_slope(self.window)
+
+    def _to_minutes(self, when: datetime | float) -> float:
+        if not isinstance(when, datetime):
+            return float(when)
+        if self._origin is None:
+            self._origin = when
+        return (when - self._origin).total_seconds() / 60.0
+
+
+def rolling_slopes(
+    minutes: Sequence[float] | np.ndarray,
+    temps: Sequence[float] | np.ndarray,
+    window_minutes: float = SLOPE_WINDOW_MINUTES,
+) -> np.ndarray:
+    """Vectorized trailing-window least-squares slopes for a whole history.
+
+    Element i matches what RollingSlopeEstimator returns after the i-th
+    sample: a regression over samples with t in (t_i - window, t_i].
+
+    Args:
+        minutes: Sample times in minutes, non-decreasing.
+        temps: Probe temperatures, same length as `minutes`.
+        window_minutes: Trailing window width.
+
+    Returns:
+        Array of slopes (°F/min), 0.0 where fewer than 2 samples or no
+        time spread fall inside the window.
+    """
+    t = np.asarray(minutes, dtype=np.float64)
+    y = np.asarray(temps, dtype=np.float64)
+    if t.size == 0:
+        return np.zeros(0)
+
+    # Shift the origin to keep the running sums well conditioned
+    t = t - t[0]
+    zero = np.zeros(1)
+    cs_t = np.concatenate((zero, np.cumsum(t)))
+    cs_y = np.concatenate((zero, np.cumsum(y)))
+    cs_tt = np.concatenate((zero, np.cumsum(t * t)))
+    cs_ty = np.concatenate((zero, np.cumsum(t * y)))
+
+    end = np.arange(1, t.size + 1)
+    start = np.searchsorted(t, t - window_minutes, side="right")
+    n = (end - start).astype(np.float64)
+    s_t = cs_t[end] - cs_t[start]
+    s_y = cs_y[end] - cs_y[start]
+    s_tt = cs_tt[end] - cs_tt[start]
+    s_ty = cs_ty[end] - cs_ty[start]
+
+    denom = n * s_tt - s_t * s_t
+    valid = (n >= 2) & (denom > 1e-12)
+    slopes = np.zeros(t.size)
+    slopes[valid] = (n[valid] * s_ty[valid] - s_t[valid] * s_y[valid]) / denom[valid]
     return slopes
+
+
+def timestamps_to_minutes(timestamps: Sequence[datetime]) -> np.ndarray:
+    """Convert reading timestamps to minutes since the first one."""
+    if not timestamps:
+        return np.zeros(0)
+    origin = timestamps[0]
+    return np.array(
+        [(ts - origin).total_seconds() / 60.0 for ts in timestamps],
+        dtype=np.float64,
+    )
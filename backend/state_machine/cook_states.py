@@ -8,7 +8,7 @@ Transitions are driven by probe temperature readings and time.
 
 from ..models.enums import CookState
 from ..models.dataclasses import CookSession, ProbeReading
-from ..simulation.stall_model import detect_stall_override, compute_slope
+from ..simulation.stall_model import detect_stall_override, update_slope_history
 
 # Temperature thresholds for state transitions
 PREHEAT_SMOKER_TEMP_THRESHOLD = 200.0  # smoker must be above this
@@ -112,11 +112,10 @@ class CookStateMachine:
                 # Invalid transition — stay in current state
                 new_state = current
 
-        # Update slope history
-        temps = [r.temp_f for r in self.session.readings]
-        if len(temps) >= 2:
-            slope = compute_slope(temps[-2:])
-            self.session.stall.slope_history.append(slope)
+        # Update the windowed slope (constant time, no rescan of readings)
+        update_slope_history(
+            self.session.stall.slope_history, temp, reading.elapsed_minutes
+        )
 
         return self.session.current_state
 
@@ -0,0 +1,219 @@
+"""Vectorized offline replay of the cook state machine and trust rules.
+
+For backtesting and bulk imports: given whole reading histories as NumPy
+arrays, compute the per-reading state sequence, stall interval and
+anomaly flags without constructing a ProbeReading per row. Results match
+feeding the same readings one at a time through CookStateMachine.advance
+and TrustEvaluator.evaluate on a fresh session.
+
+The state machine only moves forward, one transition per reading, so
+each transition is the first reading at or after the previous one that
+satisfies that state's exit condition. Conditions are evaluated as
+boolean arrays and each transition is located with a single
+np.flatnonzero / np.searchsorted lookup.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from ..models.enums import CookState
+from ..simulation.stall_model import (
+    MIN_STALL_DURATION_MIN,
+    SLOPE_THRESHOLD,
+    SLOPE_WINDOW_MINUTES,
+    STALL_TEMP_HIGH,
+    STALL_TEMP_LOW,
+    rolling_slopes,
+)
+from .cook_states import (
+    APPROACHING_THRESHOLD_DELTA,
+    EARLY_COOK_TEMP,
+    PRE_STALL_TEMP,
+    STALL_ENTRY_TEMP,
+    STALL_EXIT_TEMP,
+)
+
+# Integer codes for the returned state sequence, in lifecycle order
+STATE_ORDER: tuple[CookState, ...] = tuple(CookState)
+STATE_CODES: dict[CookState, int] = {s: i for i, s in enumerate(STATE_ORDER)}
+
+# Anomaly thresholds, mirroring TrustEvaluator._check_anomalies
+ANOMALY_DROP_F = -5.0
+ANOMALY_JUMP_F = 20.0
+ANOMALY_SMOKER_DELTA_F = 50.0
+# Normal readings needed to lift an anomaly freeze
+FREEZE_RECOVERY_READINGS = 3
+
+
+@dataclass
+class ReplayResult:
+    """Per-reading outcome of an offline replay."""
+    states: np.ndarray  # int codes into STATE_ORDER, state after each reading
+    anomalies: np.ndarray  # bool, trust anomaly rule fired on this reading
+    confidence_frozen: np.ndarray  # bool, confidence held at VERY_LOW
+    stall_start_index: Optional[int] = None
+    stall_end_index: Optional[int] = None  # reading that exited the stall
+    stall_start_temp_f: Optional[float] = None
+    stall_start_minutes: Optional[float] = None
+    stall_duration_minutes: float = 0.0
+
+    @property
+    def final_state(self) -> Optional[CookState]:
+        return STATE_ORDER[int(self.states[-1])] if self.states.size else None
+
+    def state_at(self, index: int) -> CookState:
+        return STATE_ORDER[int(self.states[index])]
+
+
+def replay_readings(
+    temp_f: np.ndarray,
+    smoker_temp_f: np.ndarray,
+    elapsed_minutes: np.ndarray,
+    target_temp_f: float,
+    smoker_set_point_f: float,
+    initial_state: CookState = CookState.PREHEAT,
+) -> ReplayResult:
+    """Replay a reading history through the state machine and trust rules.
+
+    Args:
+        temp_f: Probe temperatures, one per reading.
+        smoker_temp_f: Smoker temperatures; NaN where not reported.
+        elapsed_minutes: Minutes since cook start for each reading.
+        target_temp_f: Session target temperature.
+        smoker_set_point_f: Session smoker set point (for anomaly rules).
+        initial_state: State before the first reading. Sessions created
+            through the API start in PREHEAT.
+
+    Returns:
+        ReplayResult with the state after each reading, anomaly and
+        freeze flags, and the stall interval if one occurred.
+    """
+    temp = np.asarray(temp_f, dtype=np.float64)
+    smoker = np.asarray(smoker_temp_f, dtype=np.float64)
+    elapsed = np.asarray(elapsed_minutes, dtype=np.float64)
+    n = temp.size
+
+    states = np.empty(n, dtype=np.int8)
+    result = ReplayResult(
+        states=states,
+        anomalies=_anomaly_flags(temp, smoker, smoker_set_point_f),
+        confidence_frozen=np.zeros(n, dtype=bool),
+    )
+    result.confidence_frozen = _frozen_flags(result.anomalies)
+    if n == 0:
+        return result
+
+    # Slope history as seen *before* each reading: consecutive count of
+    # below-threshold windowed slopes ending at the previous reading. A
+    # slope is only pushed once its window holds two readings.
+    idx = np.arange(n)
+    slopes = rolling_slopes(elapsed, temp, SLOPE_WINDOW_MINUTES)
+    window_start = np.searchsorted(elapsed, elapsed - SLOPE_WINDOW_MINUTES, side="right")
+    pushed = idx + 1 - window_start >= 2
+    below = pushed & (slopes < SLOPE_THRESHOLD)
+    below_count = np.cumsum(below)
+    last_reset = np.maximum.accumulate(np.where(pushed & ~below, idx, -1))
+    run = below_count - np.where(last_reset >= 0, below_count[last_reset], 0)
+    run_before = np.zeros(n, dtype=np.int64)
+    run_before[1:] = run[:-1]
+
+    stall_entry = (
+        (temp >= STALL_ENTRY_TEMP)
+        & (temp >= STALL_TEMP_LOW)
+        & (temp <= STALL_TEMP_HIGH)
+        & (run_before >= MIN_STALL_DURATION_MIN)
+    )
+    exit_conditions: dict[CookState, np.ndarray] = {
+        CookState.PREHEAT: np.flatnonzero(temp >= EARLY_COOK_TEMP),
+        CookState.EARLY_COOK: np.flatnonzero(temp >= PRE_STALL_TEMP),
+        CookState.PRE_STALL: np.flatnonzero(
+            stall_entry | (temp >= STALL_EXIT_TEMP)
+        ),
+        CookState.STALL: np.flatnonzero(temp >= STALL_EXIT_TEMP),
+        CookState.POST_STALL: np.flatnonzero(
+            temp >= target_temp_f - APPROACHING_THRESHOLD_DELTA
+        ),
+        CookState.APPROACHING_TARGET: np.flatnonzero(temp >= target_temp_f),
+    }
+
+    state = initial_state
+    pos = 0
+    if state == CookState.STALL:
+        result.stall_start_minutes = 0.0
+    while pos < n:
+        if state == CookState.SETUP:
+            at = pos
+        elif state in exit_conditions:
+            hits = exit_conditions[state]
+            k = np.searchsorted(hits, pos)
+            if k == hits.size:
+                break
+            at = int(hits[k])
+        else:
+            break  # REST and DONE never advance on a reading
+
+        states[pos:at] = STATE_CODES[state]
+        state = _next_state(state, at, stall_entry)
+        states[at] = STATE_CODES[state]
+
+        if state == CookState.STALL:
+            result.stall_start_index = at
+            result.stall_start_temp_f = float(temp[at])
+            result.stall_start_minutes = float(elapsed[at])
+        elif result.stall_start_minutes is not None and state == CookState.POST_STALL:
+            result.stall_end_index = at
+            result.stall_duration_minutes = float(
+                elapsed[at] - result.stall_start_minutes
+            )
+        pos = at + 1
+
+    if pos < n:
+        states[pos:] = STATE_CODES[state]
+        if state == CookState.STALL:
+            # Duration keeps updating on every reading while stalled
+            result.stall_duration_minutes = float(
+                elapsed[n - 1] - result.stall_start_minutes
+            )
+    return result
+
+
+def _next_state(state: CookState, at: int, stall_entry: np.ndarray) -> CookState:
+    """Transition taken when `state`'s exit condition fires at reading `at`."""
+    if state == CookState.SETUP:
+        return CookState.PREHEAT
+    if state == CookState.PREHEAT:
+        return CookState.EARLY_COOK
+    if state == CookState.EARLY_COOK:
+        return CookState.PRE_STALL
+    if state == CookState.PRE_STALL:
+        return CookState.STALL if stall_entry[at] else CookState.POST_STALL
+    if state == CookState.STALL:
+        return CookState.POST_STALL
+    if state == CookState.POST_STALL:
+        return CookState.APPROACHING_TARGET
+    return CookState.DONE
+
+
+def _anomaly_flags(
+    temp: np.ndarray, smoker: np.ndarray, set_point: float
+) -> np.ndarray:
+    """Trust anomaly rules, evaluated against the previous reading."""
+    flags = np.zeros(temp.size, dtype=bool)
+    if temp.size < 2:
+        return flags
+    delta = np.diff(temp)
+    with np.errstate(invalid="ignore"):
+        smoker_off = np.abs(smoker[1:] - set_point) > ANOMALY_SMOKER_DELTA_F
+    flags[1:] = (delta < ANOMALY_DROP_F) | (delta > ANOMALY_JUMP_F) | smoker_off
+    return flags
+
+
+def _frozen_flags(anomalies: np.ndarray) -> np.ndarray:
+    """Confidence is frozen on an anomaly and for the next two normal readings."""
+    counts = np.cumsum(anomalies, dtype=np.int64)
+    lagged = np.zeros_like(counts)
+    lag = FREEZE_RECOVERY_READINGS
+    lagged[lag:] = counts[:-lag] if counts.size > lag else lagged[lag:]
+    return (counts - lagged) > 0
@@ -39,22 +39,32 @@ class TrustEvaluator:
         Returns:
             Updated confidence tier.
         """
-        # Check for anomalies first
+        if self.observe(session):
+            return ConfidenceTier.VERY_LOW
+
+        # Use prediction's computed confidence as baseline
+        return prediction.confidence
+
+    def observe(self, session: CookSession) -> bool:
+        """Update anomaly and freeze bookkeeping for the latest reading.
+
+        Used directly when replaying readings that have no prediction of
+        their own (e.g. batch uploads).
+
+        Returns:
+            True if confidence is frozen at VERY_LOW.
+        """
         if self._check_anomalies(session):
             self.anomaly_count += 1
             self.consecutive_normal = 0
             self.frozen = True
-            return ConfidenceTier.VERY_LOW
+            return True
 
         self.consecutive_normal += 1
         if self.frozen and self.consecutive_normal >= 3:
             self.frozen = False
 
-        if self.frozen:
-            return ConfidenceTier.VERY_LOW
-
-        # Use prediction's computed confidence as baseline
-        return prediction.confidence
+        return self.frozen
 
     def _check_anomalies(self, session: CookSession) -> bool:
         """Check for anomalous readings."""
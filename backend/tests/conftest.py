@@ -0,0 +1,42 @@
+"""Shared fixtures for the backend test suite."""
+
+import asyncio
+
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database.session_cache import session_cache
+from backend.services import cook_session_service as svc
+from backend.simulation import monte_carlo
+
+
+def run_async(coro):
+    """Run a coroutine to completion on a fresh event loop."""
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def db_config():
+    """Override in a test module to adjust settings before the database opens."""
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch, db_config):
+    """Point the repository at a fresh SQLite file for one test."""
+    monkeypatch.setattr(settings, "database_path", str(tmp_path / "test.db"))
+    session_cache.clear()
+    run_async(db.init_db())
+    yield tmp_path
+    run_async(db.close_db())
+    session_cache.clear()
+
+
+@pytest.fixture
+def fast_monte_carlo(monkeypatch):
+    """Make the session service run 20 seeded Monte Carlo iterations."""
+    original = monte_carlo.run_monte_carlo
+    monkeypatch.setattr(
+        svc, "run_monte_carlo",
+        lambda session, n_iterations=1000: original(session, n_iterations=20, seed=1),
+    )
@@ -0,0 +1,165 @@
+"""Tests for prediction admission control."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from backend.config import settings
+from backend.database import repository as repo
+from backend.main import app
+from backend.models.dataclasses import CookSession, PredictionResult
+from backend.models.schemas import (
+    BatchProbeReading,
+    ProbeReadingBatchRequest,
+    ProbeReadingRequest,
+)
+from backend.services import cook_session_service as svc
+from backend.services.admission import PredictionAdmission, PredictionOverloaded
+from backend.tests.conftest import run_async
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "prediction_max_concurrent", 1)
+    monkeypatch.setattr(settings, "prediction_degrade_queue_depth", 1)
+    monkeypatch.setattr(settings, "prediction_queue_depth", 2)
+    monkeypatch.setattr(settings, "prediction_degraded_iterations", 50)
+
+
+def test_caps_concurrency_degrades_and_rejects(limits):
+    admission = PredictionAdmission()
+    release = threading.Event()
+    calls: list[tuple[str, int]] = []
+
+    def simulate(session, n_iterations):
+        calls.append((session.id, n_iterations))
+        release.wait(5)
+        return PredictionResult(session_id=session.id)
+
+    async def scenario():
+        tasks = []
+        for i in range(3):
+            tasks.append(asyncio.create_task(
+                admission.run(simulate, CookSession(id=f"s{i}"), n_iterations=1000)
+            ))
+            await asyncio.sleep(0.05)
+        assert admission.running == 1 and admission.queue_depth == 2
+        with pytest.raises(PredictionOverloaded) as exc:
+            admission.check()
+        assert exc.value.retry_after_s >= 1
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert [r.session_id for r in results] == ["s0", "s1", "s2"]
+
+    asyncio.run(scenario())
+    # s1 found an empty queue; s2 found one run already waiting
+    assert calls == [("s0", 1000), ("s1", 1000), ("s2", 50)]
+    assert admission.running == 0 and admission.queue_depth == 0
+    assert admission.degraded == 1 and admission.rejected == 1
+
+
+def test_cancelled_waiter_leaves_queue(limits):
+    admission = PredictionAdmission()
+    release = threading.Event()
+
+    def simulate(session, n_iterations):
+        release.wait(5)
+        return PredictionResult(session_id=session.id)
+
+    async def scenario():
+        first = asyncio.create_task(admission.run(simulate, CookSession(id="a"), 100))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(admission.run(simulate, CookSession(id="b"), 100))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        assert admission.queue_depth == 0
+        release.set()
+        await first
+        assert admission.running == 0
+        # The slot is free again
+        result = await admission.run(simulate, CookSession(id="c"), 100)
+        assert result.session_id == "c"
+
+    asyncio.run(scenario())
+
+
+def test_overloaded_write_gets_retry_after_and_health_reports_queue(monkeypatch):
+    from backend.services import admission
+
+    monkeypatch.setattr(settings, "prediction_queue_depth", 0)
+    monkeypatch.setattr(admission.prediction_admission, "average_run_s", 2.0)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            reading = await client.post(
+                "/api/v1/cook/any/reading", json={"temp_f": 150.0}
+            )
+            health = await client.get("/api/v1/health")
+        return reading, health
+
+    reading, health = asyncio.run(scenario())
+    assert reading.status_code == 503
+    assert reading.headers["retry-after"] == "2"
+    assert health.json()["prediction_queue_depth"] == 0
+    assert health.json()["prediction_queue_limit"] == 0
+
+
+def test_concurrent_writes_to_one_session_are_serialized(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "prediction_max_concurrent", 4)
+
+    def slow_monte_carlo(session, n_iterations):
+        time.sleep(0.05)
+        return PredictionResult(session_id=session.id, p50_minutes=float(len(session.readings)))
+
+    monkeypatch.setattr(svc, "run_monte_carlo", slow_monte_carlo)
+
+    async def scenario():
+        await repo.save_session(CookSession(id="busy"))
+        await asyncio.gather(
+            svc.add_reading("busy", ProbeReadingRequest(temp_f=100.0)),
+            svc.add_reading("busy", ProbeReadingRequest(temp_f=101.0)),
+            svc.add_readings_batch("busy", ProbeReadingBatchRequest(readings=[
+                BatchProbeReading(temp_f=102.0), BatchProbeReading(temp_f=103.0),
+            ])),
+            svc.add_reading("busy", ProbeReadingRequest(temp_f=104.0)),
+        )
+        return await repo.load_session("busy")
+
+    session = run_async(scenario())
+    # Each write saw the previous one's reading, so elapsed time advances
+    elapsed = [r.elapsed_minutes for r in session.readings]
+    assert len(elapsed) == 5 and elapsed == sorted(elapsed) and elapsed[-1] > 0.0
+    assert sorted(r.temp_f for r in session.readings) == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert not svc._session_locks
+
+
+@pytest.mark.parametrize("same_session", [False, True])
+def test_concurrent_burst_is_bounded_by_queue_depth(temp_db, limits, monkeypatch, same_session):
+    def slow_monte_carlo(session, n_iterations):
+        time.sleep(0.05)
+        return PredictionResult(session_id=session.id)
+
+    monkeypatch.setattr(svc, "run_monte_carlo", slow_monte_carlo)
+    admission = svc.prediction_admission
+    ids = ["one"] * 6 if same_session else [f"s{i}" for i in range(6)]
+
+    async def scenario():
+        for session_id in set(ids):
+            await repo.save_session(CookSession(id=session_id))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            responses = await asyncio.gather(*(
+                client.post(f"/api/v1/cook/{session_id}/reading", json={"temp_f": 150.0})
+                for session_id in ids
+            ))
+        return [r.status_code for r in responses]
+
+    statuses = run_async(scenario())
+    # One run executes, two wait; the rest are turned away
+    assert sorted(statuses) == [200, 200, 200, 503, 503, 503]
+    assert admission.reserved == 0 and admission.queue_depth == 0
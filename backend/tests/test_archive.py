@@ -0,0 +1,206 @@
+"""Tests for archiving finished sessions out of the hot tables."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.database import unit_of_work as uow
+from backend.database.archive_store import (
+    ArchivedRows,
+    archive_store,
+    decode_segment,
+    encode_segment,
+)
+from backend.database.reading_chunks import ReadingColumns
+from backend.database.session_cache import session_cache
+from backend.database.timestamps import to_epoch_ms
+from backend.models.dataclasses import (
+    CookSession,
+    InterventionEvent,
+    LidOpenEvent,
+    PredictionResult,
+    ProbeReading,
+)
+from backend.models.enums import CookState, WrapType
+from backend.services.retention_service import run_retention_pass
+from backend.tests.conftest import run_async
+
+START = datetime(2026, 3, 14, 8, 0)
+
+
+@pytest.fixture
+def db_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path / "archive"))
+    monkeypatch.setattr(settings, "archive_after_days", 30.0)
+
+
+async def _seed(session_id: str, finished: bool) -> None:
+    await repo.save_session(CookSession(
+        id=session_id, created_at=START, current_state=CookState.PREHEAT,
+    ))
+    for minute in range(0, 300, 5):
+        await repo.save_reading(ProbeReading(
+            session_id=session_id,
+            timestamp=START + timedelta(minutes=minute),
+            temp_f=40.0 + minute * 0.5,
+            smoker_temp_f=250.0 if minute % 2 else None,
+            elapsed_minutes=float(minute),
+        ))
+        await repo.save_prediction(PredictionResult(
+            session_id=session_id,
+            timestamp=START + timedelta(minutes=minute),
+            p50_minutes=600.0 - minute,
+            current_state=CookState.EARLY_COOK,
+            readings_count=minute // 5 + 1,
+        ))
+    await repo.save_lid_event(LidOpenEvent(
+        session_id=session_id, timestamp=START + timedelta(minutes=90),
+    ))
+    await repo.save_intervention(InterventionEvent(
+        session_id=session_id, timestamp=START + timedelta(minutes=200),
+        wrap_type=WrapType.FOIL, temp_at_wrap_f=165.0, elapsed_minutes=200.0,
+    ))
+    if finished:
+        await repo.finish_session(session_id)
+
+
+async def _hot_rows(session_id: str) -> int:
+    conn = await db.get_db()
+    total = 0
+    for table in ("cook_sessions", "probe_readings", "predictions",
+                  "lid_open_events", "intervention_events"):
+        key = "id" if table == "cook_sessions" else "session_id"
+        cursor = await conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE {key} = ?", (session_id,)
+        )
+        total += (await cursor.fetchone())[0]
+    return total
+
+
+def test_segment_round_trip():
+    rows = ArchivedRows(
+        session={"id": "s", "stall_state": b"\x00\x01", "weight_lbs": 12.5},
+        lid_open_events=[{"id": 1, "session_id": "s", "timestamp": 1000}],
+        intervention_events=[],
+        predictions=[{"id": 7, "session_id": "s", "p50_minutes": 42.0}],
+        readings=ReadingColumns.from_readings([
+            ProbeReading(session_id="s", timestamp=START, temp_f=150.25,
+                         elapsed_minutes=10.0),
+        ]),
+    )
+
+    restored = decode_segment(encode_segment(rows))
+
+    assert restored.session == rows.session
+    assert restored.lid_open_events == rows.lid_open_events
+    assert restored.predictions == rows.predictions
+    assert restored.readings.timestamp_ms.tolist() == [to_epoch_ms(START)]
+    assert restored.readings.temp_f.tolist() == [150.25]
+
+
+def test_archived_session_reads_transparently(temp_db):
+    async def scenario():
+        await _seed("done", finished=True)
+        await repo.compact_predictions("done")
+        before = (
+            await repo.load_session("done"),
+            await repo.count_session_rows("done"),
+            await repo.load_latest_prediction("done"),
+            await repo.load_reading_columns("done"),
+        )
+        archived = await repo.archive_session("done")
+        session_cache.clear()
+        after = (
+            await repo.load_session("done"),
+            await repo.count_session_rows("done"),
+            await repo.load_latest_prediction("done"),
+            await repo.load_reading_columns("done", readonly=True),
+        )
+        tail = await repo.load_session_tail("done", 10)
+        return before, archived, after, tail, await _hot_rows("done")
+
+    before, archived, after, tail, hot_rows = run_async(scenario())
+    assert archived is True
+    assert hot_rows == 0
+    session, counts, latest, columns = before
+    a_session, a_counts, a_latest, a_columns = after
+    assert a_session.is_finished and a_session.created_at == session.created_at
+    assert [r.temp_f for r in a_session.readings] == [r.temp_f for r in session.readings]
+    assert [r.timestamp for r in a_session.readings] == [r.timestamp for r in session.readings]
+    assert a_session.lid_events[0].timestamp == session.lid_events[0].timestamp
+    assert a_session.interventions[0].wrap_type == WrapType.FOIL
+    assert a_counts == counts
+    assert a_latest.readings_count == latest.readings_count == 60
+    np.testing.assert_array_equal(a_columns.elapsed_minutes, columns.elapsed_minutes)
+    np.testing.assert_array_equal(
+        np.isnan(a_columns.smoker_temp_f), np.isnan(columns.smoker_temp_f)
+    )
+    assert len(tail.readings) == 10 and tail.earlier_readings_count == 50
+
+
+def test_retention_pass_archives_only_old_finished_sessions(temp_db):
+    async def scenario():
+        await _seed("done", finished=True)
+        await _seed("live", finished=False)
+        await repo.save_session(CookSession(id="recent", is_finished=True))
+        first = await run_retention_pass()  # compacts "done" and "recent"
+        second = await run_retention_pass()
+        conn = await db.get_db()
+        cursor = await conn.execute("SELECT session_id FROM archived_sessions")
+        return first, second, [row[0] for row in await cursor.fetchall()]
+
+    first, second, archived = run_async(scenario())
+    assert first["sessions_archived"] == 1
+    assert second["sessions_archived"] == 0
+    assert archived == ["done"]
+    assert list((temp_db / "archive").iterdir())[0].name == "sessions-2026-03.parc"
+
+
+def test_segment_is_flushed_outside_the_write_lock(temp_db, monkeypatch):
+    append = archive_store.append
+    lock_held = []
+
+    def checking_append(file, segment):
+        lock_held.append(uow._state.lock.locked())
+        return append(file, segment)
+
+    monkeypatch.setattr(archive_store, "append", checking_append)
+
+    async def scenario():
+        await _seed("done", finished=True)
+        return await repo.archive_session("done")
+
+    assert run_async(scenario()) is True
+    assert lock_held == [False]
+
+
+def test_unrecorded_segment_is_discarded(temp_db, monkeypatch):
+    record = repo._record_archived
+    calls = []
+
+    async def interfering_record(session_id, *args):
+        calls.append(session_id)
+        if len(calls) == 1:
+            # A write lands between reading the rows and recording them
+            await repo.save_lid_event(LidOpenEvent(session_id=session_id, timestamp=START))
+            return await record(session_id, *args)
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr(repo, "_record_archived", interfering_record)
+
+    async def scenario():
+        await _seed("done", finished=True)
+        changed = await repo.archive_session("done")
+        with pytest.raises(RuntimeError):
+            await repo.archive_session("done")
+        return changed, await _hot_rows("done")
+
+    changed, hot_rows = run_async(scenario())
+    assert changed is False
+    assert hot_rows > 0
+    archive_file = temp_db / "archive" / "sessions-2026-03.parc"
+    assert archive_file.stat().st_size == 0
@@ -0,0 +1,110 @@
+"""Tests for the multi-session batch state endpoint."""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from backend.config import settings
+from backend.database import repository as repo
+from backend.database.session_cache import session_cache
+from backend.main import app
+from backend.models.dataclasses import CookSession, PredictionResult, ProbeReading
+from backend.models.enums import CookState
+from backend.tests.conftest import run_async
+
+START = datetime(2026, 5, 2, 7, 0)
+
+
+@pytest.fixture
+def db_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path / "archive"))
+
+
+async def _seed() -> None:
+    for i in range(3):
+        session_id = f"cook-{i}"
+        await repo.save_session(CookSession(
+            id=session_id, created_at=START, current_state=CookState.EARLY_COOK,
+        ))
+        for minute in range(i):
+            await repo.save_reading(ProbeReading(
+                session_id=session_id, temp_f=110.0 + minute,
+                elapsed_minutes=float(minute),
+            ))
+        for minute in range(2):
+            await repo.save_prediction(PredictionResult(
+                session_id=session_id, timestamp=START + timedelta(minutes=minute),
+                p50_minutes=500.0 + 10 * i + minute,
+            ))
+    session_cache.clear()
+
+
+async def _post(body: dict) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        return await client.post("/api/v1/cook/batch-state", json=body)
+
+
+def test_batch_state_returns_all_sessions(temp_db):
+    async def scenario():
+        await _seed()
+        return await _post({"session_ids": ["cook-2", "nope", "cook-0", "cook-1"]})
+
+    response = run_async(scenario())
+    assert response.status_code == 200
+    body = response.json()
+    assert [s["session_id"] for s in body["sessions"]] == ["cook-2", "cook-0", "cook-1"]
+    assert body["missing"] == ["nope"]
+    cook2, cook0, _ = body["sessions"]
+    assert cook2["state"]["readings_count"] == 2
+    assert cook2["prediction"]["p50_minutes"] == 521.0
+    assert cook2["prediction"]["p50_time"] == (START + timedelta(minutes=521)).isoformat()
+    assert cook2["last_reading"] == {"temp_f": 111.0, "elapsed_minutes": 1.0}
+    assert "last_reading" not in cook0
+
+
+def test_batch_state_field_selection(temp_db):
+    async def scenario():
+        await _seed()
+        return await _post({"session_ids": ["cook-1"], "fields": ["prediction"]})
+
+    body = run_async(scenario()).json()
+    assert set(body["sessions"][0]) == {"session_id", "prediction"}
+
+
+def test_latest_predictions_in_one_query(temp_db):
+    async def scenario():
+        await _seed()
+        return await repo.load_latest_predictions(["cook-0", "cook-1", "nope"])
+
+    latest = run_async(scenario())
+    assert {k: p.p50_minutes for k, p in latest.items()} == {
+        "cook-0": 501.0, "cook-1": 511.0,
+    }
+
+
+def test_archived_sessions_fetched_in_one_lookup(temp_db, monkeypatch):
+    async def scenario():
+        await _seed()
+        for i in range(3):
+            await repo.finish_session(f"cook-{i}")
+            assert await repo.archive_session(f"cook-{i}")
+        session_cache.clear()
+
+        async def per_id_lookup(*args):
+            raise AssertionError("archived sessions looked up one by one")
+
+        monkeypatch.setattr(repo, "_fetch_archived", per_id_lookup)
+        ids = ["cook-0", "cook-1", "cook-2", "nope", "gone"]
+        return (
+            await repo.load_session_summaries(ids),
+            await repo.load_latest_predictions(ids),
+        )
+
+    summaries, latest = run_async(scenario())
+    assert sorted(summaries) == ["cook-0", "cook-1", "cook-2"]
+    assert summaries["cook-2"].readings_count == 2
+    assert {k: p.p50_minutes for k, p in latest.items()} == {
+        "cook-0": 501.0, "cook-1": 511.0, "cook-2": 521.0,
+    }
@@ -0,0 +1,97 @@
+"""Tests for revision-based conditional GETs."""
+
+import httpx
+
+from backend.database import repository as repo
+from backend.database.unit_of_work import unit_of_work
+from backend.main import app
+from backend.models.dataclasses import CookSession, PredictionResult, ProbeReading
+from backend.tests.conftest import run_async
+
+
+async def _get(client: httpx.AsyncClient, path: str, **headers) -> httpx.Response:
+    return await client.get(f"/api/v1{path}", headers=headers)
+
+
+def test_revision_bumps_once_per_unit_of_work(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="rev"))
+        first = await repo.load_session_revision("rev")
+        async with unit_of_work():
+            await repo.save_reading(ProbeReading(session_id="rev", temp_f=90.0))
+            await repo.save_prediction(PredictionResult(session_id="rev"))
+        second = await repo.load_session_revision("rev", readonly=True)
+        missing = await repo.load_session_revision("nope")
+        return first, second, missing
+
+    first, second, missing = run_async(scenario())
+    assert second.revision == first.revision + 1
+    assert second.updated_at >= first.updated_at
+    assert missing is None
+
+
+def test_conditional_get_returns_304_until_session_changes(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="poll"))
+        await repo.save_prediction(PredictionResult(session_id="poll", p50_minutes=300.0))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            fresh = await _get(client, "/cook/poll/state")
+            etag = fresh.headers["etag"]
+            same = await _get(client, "/cook/poll/state", **{"If-None-Match": etag})
+            prediction = await _get(client, "/cook/poll/prediction", **{"If-None-Match": etag})
+            by_date = await _get(client, "/cook/poll/state", **{
+                "If-Modified-Since": fresh.headers["last-modified"],
+            })
+            await repo.save_reading(ProbeReading(session_id="poll", temp_f=95.0))
+            changed = await _get(client, "/cook/poll/state", **{"If-None-Match": etag})
+            missing = await _get(client, "/cook/nope/state", **{"If-None-Match": etag})
+        return fresh, same, prediction, by_date, changed, missing
+
+    fresh, same, prediction, by_date, changed, missing = run_async(scenario())
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"].startswith('W/"')
+    assert fresh.headers["cache-control"] == "no-cache"
+    assert same.status_code == 304 and same.content == b""
+    assert same.headers["etag"] == fresh.headers["etag"]
+    assert prediction.status_code == 304
+    assert by_date.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != fresh.headers["etag"]
+    assert changed.json()["readings_count"] == 1
+    assert missing.status_code == 404
+
+
+def test_cook_report_is_conditional_and_reads_revision_once(temp_db, monkeypatch):
+    lookups = []
+    load_revision = repo.load_session_revision
+
+    async def counting(session_id, readonly=False):
+        lookups.append(session_id)
+        return await load_revision(session_id, readonly=readonly)
+
+    monkeypatch.setattr(repo, "load_session_revision", counting)
+
+    async def scenario():
+        await repo.save_session(CookSession(id="done"))
+        for minute in range(40):
+            await repo.save_reading(ProbeReading(
+                session_id="done", temp_f=40.0 + 4 * minute, elapsed_minutes=float(minute),
+            ))
+        await repo.finish_session("done")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            lookups.clear()
+            fresh = await client.get("/api/v1/cook/done/report?max_points=10")
+            fresh_lookups = len(lookups)
+            same = await client.get(
+                "/api/v1/cook/done/report?max_points=10",
+                headers={"If-None-Match": fresh.headers["etag"]},
+            )
+        return fresh, fresh_lookups, same
+
+    fresh, fresh_lookups, same = run_async(scenario())
+    assert fresh.status_code == 200
+    assert len(fresh.json()["actual_temps"]) <= 10
+    assert fresh_lookups == 1
+    assert same.status_code == 304 and same.content == b""
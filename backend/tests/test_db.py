@@ -0,0 +1,74 @@
+"""Tests for connection management and the reader pool."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.database.session_cache import session_cache
+from backend.models.dataclasses import CookSession, ProbeReading
+from backend.tests.conftest import run_async
+
+
+@pytest.fixture
+def db_config(monkeypatch):
+    monkeypatch.setattr(settings, "db_reader_connections", 2)
+
+
+def test_reader_sees_committed_rows_and_rejects_writes(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="pool-1"))
+        writer = await db.get_db()
+        async with db.read_connection() as reader:
+            assert reader is not writer
+            cursor = await reader.execute("SELECT id FROM cook_sessions")
+            ids = [row["id"] for row in await cursor.fetchall()]
+            with pytest.raises(sqlite3.OperationalError):
+                await reader.execute("DELETE FROM cook_sessions")
+        return ids
+
+    assert run_async(scenario()) == ["pool-1"]
+
+
+def test_reader_pool_is_bounded(temp_db):
+    async def scenario():
+        async def hold():
+            async with db.read_connection() as reader:
+                await reader.execute("SELECT 1")
+                await asyncio.sleep(0.01)
+                return reader
+
+        readers = await asyncio.gather(*(hold() for _ in range(6)))
+        return {id(r) for r in readers}
+
+    assert len(run_async(scenario())) == 2
+
+
+def test_readonly_load_does_not_populate_cache(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="pool-2"))
+        await repo.save_reading(ProbeReading(
+            session_id="pool-2", temp_f=120.0, elapsed_minutes=5.0,
+        ))
+        session_cache.clear()
+        session = await repo.load_session("pool-2", readonly=True)
+        tail = await repo.load_session_tail("pool-2", readonly=True)
+        return session, tail
+
+    session, tail = run_async(scenario())
+    assert [r.temp_f for r in session.readings] == [120.0]
+    assert tail.readings_count == 1
+    assert "pool-2" not in session_cache
+
+
+def test_reads_fall_back_to_writer_when_pool_disabled(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "db_reader_connections", 0)
+
+    async def scenario():
+        async with db.read_connection() as conn:
+            return conn is await db.get_db()
+
+    assert run_async(scenario()) is True
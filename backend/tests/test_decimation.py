@@ -0,0 +1,114 @@
+"""Tests for series decimation and decimated reports."""
+
+import numpy as np
+import pytest
+
+from backend.database import repository as repo
+from backend.models.dataclasses import CookSession, ProbeReading, StallState
+from backend.models.schemas import FinishCookRequest
+from backend.services import cook_session_service as svc
+from backend.services.decimation import decimate_indices, lttb_indices, minmax_indices
+from backend.tests.conftest import run_async
+
+
+def _cook_curve(n: int = 1200) -> tuple[np.ndarray, np.ndarray]:
+    x = np.arange(n, dtype=float)
+    y = 40.0 + 163.0 * (1.0 - np.exp(-x / (n / 3.0)))
+    start, end = n * 5 // 12, n * 7 // 12
+    y[start:end] = y[start]  # stall plateau
+    y[end:] += np.linspace(0.0, 10.0, n - end)
+    return x, y
+
+
+@pytest.fixture
+def db_config():
+    svc._decimated_reports.clear()
+    yield
+    svc._decimated_reports.clear()
+
+
+def test_lttb_keeps_ends_and_budget():
+    x, y = _cook_curve()
+    indices = lttb_indices(x, y, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert np.array_equal(lttb_indices(x[:30], y[:30], 50), np.arange(30))
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    assert 437 in lttb_indices(x, y, 40)
+
+
+def test_minmax_keeps_envelope():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1000)
+    indices = minmax_indices(y, 60)
+    assert len(indices) <= 60
+    assert int(np.argmin(y)) in indices and int(np.argmax(y)) in indices
+    assert indices[0] == 0 and indices[-1] == 999
+
+
+def test_decimate_pins_plateau_bounds():
+    x, y = _cook_curve()
+    for method in ("lttb", "minmax"):
+        indices = decimate_indices(x, y, 40, method, keep=[500, 699, 5000])
+        assert len(indices) <= 40
+        assert {0, 500, 699, 1199} <= set(indices.tolist())
+    with pytest.raises(ValueError):
+        decimate_indices(x, y, 40, "every_other")
+
+
+def test_decimated_report_is_aligned_and_cached(temp_db):
+    x, y = _cook_curve(300)
+
+    async def scenario():
+        await repo.save_session(CookSession(
+            id="long", stall=StallState(stall_start_minutes=125.0, stall_duration_minutes=50.0),
+        ))
+        for minute, temp in zip(x, y):
+            await repo.save_reading(ProbeReading(
+                session_id="long", temp_f=float(temp), elapsed_minutes=float(minute),
+            ))
+        await repo.finish_session("long")
+        full = await svc.get_report("long")
+        small = await svc.get_report("long", max_points=30)
+        again = await svc.get_report("long", max_points=30)
+        await repo.save_reading(ProbeReading(
+            session_id="long", temp_f=205.0, elapsed_minutes=300.0,
+        ))
+        after_write = await svc.get_report("long", max_points=30)
+        missing = await svc.get_report("nope", max_points=30)
+        return full, small, again, after_write, missing
+
+    full, small, again, after_write, missing = run_async(scenario())
+    assert len(full.actual_temps) == 300 and full.elapsed_minutes == x.tolist()
+    assert len(small.actual_temps) <= 30
+    assert len(small.predicted_temps) == len(small.residuals) == len(small.elapsed_minutes)
+    assert small.elapsed_minutes[0] == 0.0 and small.elapsed_minutes[-1] == 299.0
+    assert {125.0, 175.0} <= set(small.elapsed_minutes)
+    assert small.readings_count == 300
+    assert again is small
+    assert after_write is not small and after_write.elapsed_minutes[-1] == 300.0
+    assert missing is None
+
+
+def test_open_stall_reported_the_same_on_both_paths(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(
+            id="open", stall=StallState(in_stall=True, stall_start_minutes=40.0),
+        ))
+        for minute in range(45):
+            await repo.save_reading(ProbeReading(
+                session_id="open", temp_f=150.0 + min(minute, 40) * 0.5,
+                elapsed_minutes=float(minute),
+            ))
+        finished = await svc.finish_cook("open", FinishCookRequest())
+        return finished, await svc.get_report("open"), await svc.get_report("open", 20)
+
+    finished, stored, decimated = run_async(scenario())
+    assert finished.stall_occurred is True
+    assert stored.stall_occurred is True and decimated.stall_occurred is True
@@ -0,0 +1,113 @@
+"""Tests for the streaming bulk export."""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.models.dataclasses import CookSession, PredictionResult, ProbeReading
+from backend.models.enums import CutType, EquipmentType
+from backend.services.export_service import ExportQuery, stream_export
+from backend.tests.conftest import run_async
+
+START = datetime(2026, 2, 1, 9, 0)
+
+
+@pytest.fixture
+def db_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path / "archive"))
+
+
+@pytest.fixture
+def seeded_db(temp_db):
+    run_async(_seed())
+
+
+async def _seed() -> None:
+    cooks = [
+        ("old-brisket", CutType.BRISKET, EquipmentType.OFFSET, START),
+        ("ribs", CutType.PORK_RIBS, EquipmentType.PELLET, START + timedelta(days=20)),
+        ("brisket", CutType.BRISKET, EquipmentType.PELLET, START + timedelta(days=40)),
+    ]
+    for session_id, cut, equipment, created in cooks:
+        await repo.save_session(CookSession(
+            id=session_id, created_at=created, cut_type=cut, equipment_type=equipment,
+        ))
+        for minute in range(3):
+            await repo.save_reading(ProbeReading(
+                session_id=session_id,
+                timestamp=created + timedelta(minutes=minute),
+                temp_f=100.0 + minute,
+                smoker_temp_f=250.0 if minute else None,
+                elapsed_minutes=float(minute),
+            ))
+        await repo.save_prediction(PredictionResult(
+            session_id=session_id, timestamp=created, p50_minutes=500.0,
+        ))
+    await repo.finish_session("old-brisket")
+    assert await repo.archive_session("old-brisket")
+
+
+async def _export(fmt: str, **filters) -> bytes:
+    chunks = [c async for c in stream_export(ExportQuery(**filters), fmt)]
+    return b"".join(chunks)
+
+
+def test_ndjson_readings_include_archived_sessions(seeded_db):
+    body = run_async(_export("ndjson", table="readings", cut_type=CutType.BRISKET))
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+
+    assert [r["session_id"] for r in rows] == ["old-brisket"] * 3 + ["brisket"] * 3
+    assert rows[0]["timestamp"] == "2026-02-01T09:00:00Z"
+    assert rows[0]["smoker_temp_f"] is None
+    assert rows[1]["smoker_temp_f"] == 250.0
+    assert rows[2]["temp_f"] == 102.0
+
+
+def test_csv_sessions_filtered_by_date_and_equipment(seeded_db):
+    body = run_async(_export(
+        "csv", table="sessions", equipment_type=EquipmentType.PELLET,
+        since=START + timedelta(days=10), until=START + timedelta(days=30),
+    ))
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+
+    assert [r["session_id"] for r in rows] == ["ribs"]
+    assert rows[0]["cut_type"] == "pork_ribs"
+    assert rows[0]["is_finished"] == "False"
+
+
+def test_csv_with_no_rows_has_header(seeded_db):
+    body = run_async(_export("csv", table="predictions", since=START + timedelta(days=90)))
+    assert body.decode().splitlines() == [
+        "session_id,timestamp,p10_minutes,p50_minutes,p90_minutes,"
+        "confidence,current_state,stall_probability,readings_count"
+    ]
+
+
+def test_arrow_stream_round_trip(seeded_db):
+    pa = pytest.importorskip("pyarrow")
+    body = run_async(_export("arrow", table="predictions"))
+    table = pa.ipc.open_stream(body).read_all()
+
+    assert table.column("session_id").to_pylist() == ["old-brisket", "ribs", "brisket"]
+    assert table.schema.field("timestamp").type == pa.timestamp("ms")
+    assert table.column("timestamp").to_pylist()[0] == START
+
+
+def test_rows_are_paged_without_pinning_a_reader(seeded_db):
+    async def scenario():
+        seen, idle = [], []
+        async for rows in repo.iter_session_rows(readings=True, predictions=True, batch=1):
+            seen.append((rows.session["id"], len(rows.readings.temp_f), len(rows.predictions)))
+            pool = db._readers
+            idle.append(pool._idle.qsize() == len(pool.connections))
+        return seen, idle
+
+    seen, idle = run_async(scenario())
+    assert seen == [("old-brisket", 3, 1), ("ribs", 3, 1), ("brisket", 3, 1)]
+    assert all(idle)
@@ -0,0 +1,64 @@
+"""Tests for the fast JSON response path."""
+
+import gzip
+import json
+
+from fastapi import Response
+from starlette.requests import Request
+
+from backend.benchmarks.response_serialization import build_report
+from backend.config import settings
+from backend.models.schemas import ReportResponse
+from backend.routers.fast_response import _accepted_codings, fast_json_response
+from backend.routers.report import report_to_response
+
+
+def _request(accept_encoding: str = "") -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_fast_path_matches_validated_serialization():
+    report = report_to_response(build_report(1200, seed=1))
+    validated = ReportResponse(**dict(report))
+
+    response = fast_json_response(report, _request())
+    assert response.body == validated.model_dump_json().encode()
+    assert response.headers["content-type"] == "application/json"
+    assert "content-encoding" not in response.headers
+
+
+def test_large_bodies_are_gzipped_when_accepted(monkeypatch):
+    monkeypatch.setattr(settings, "response_compression_min_bytes", 1024)
+    report = report_to_response(build_report(600, seed=2))
+
+    response = fast_json_response(report, _request("br;q=0, gzip"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(response.body)
+    assert json.loads(gzip.decompress(response.body))["readings_count"] == 600
+
+    refused = fast_json_response(report, _request("gzip;q=0"))
+    assert "content-encoding" not in refused.headers
+
+    monkeypatch.setattr(settings, "response_compression_min_bytes", 0)
+    disabled = fast_json_response(report, _request("gzip"))
+    assert "content-encoding" not in disabled.headers
+    assert "vary" not in disabled.headers
+
+
+def test_small_bodies_and_endpoint_headers():
+    sub_response = Response()
+    sub_response.headers["ETag"] = 'W/"3"'
+    report = report_to_response(build_report(2, seed=3))
+
+    response = fast_json_response(report, _request("gzip"), sub_response)
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == 'W/"3"'
+    assert response.headers.getlist("content-length") == [str(len(response.body))]
+
+
+def test_accepted_codings():
+    assert _accepted_codings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert _accepted_codings("GZIP;q=0.5, br;q=0, x;q=bad") == {"gzip"}
+    assert _accepted_codings("") == set()
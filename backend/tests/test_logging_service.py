@@ -0,0 +1,173 @@
+"""Tests for the queued, batched structured logger."""
+
+import io
+import json
+import logging
+import sys
+
+from backend.config import settings
+from backend.services import logging_service
+from backend.services.logging_service import (
+    BatchedLogWriter,
+    _EventQueueHandler,
+    log_event,
+)
+
+
+def _record(message) -> logging.LogRecord:
+    return logging.LogRecord("pitmaster", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_writer_batches_and_rotates(tmp_path):
+    path = tmp_path / "logs" / "pitmaster.log"
+    writer = BatchedLogWriter(
+        path=str(path), max_bytes=150, backup_count=2, batch_size=8
+    )
+    for i in range(40):
+        writer.submit({"event": "e", "i": i})
+    writer.start()
+    writer.stop()
+
+    assert writer.batches == 5
+    assert sorted(p.name for p in path.parent.iterdir()) == [
+        "pitmaster.log", "pitmaster.log.1", "pitmaster.log.2",
+    ]
+    lines = (path.parent / "pitmaster.log.1").read_text().splitlines()
+    assert len(lines) == 8
+    assert [json.loads(line)["i"] for line in lines] == list(range(32, 40))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    writer = BatchedLogWriter(max_queue=1)
+    handler = _EventQueueHandler(writer)
+    for i in range(3):
+        handler.emit(_record(f"line {i}"))
+    writer.submit({"event": "e"})
+    assert writer.dropped == 3
+    assert writer.queue.get_nowait().getMessage() == "line 0"
+
+
+def test_event_sampling(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "log_sample_rates", {"noisy": 0.0, "kept": 1.0})
+    with caplog.at_level(logging.INFO, logger="pitmaster"):
+        log_event("noisy", session_id="s")
+        log_event("kept", session_id="s", temp=110.0)
+        log_event("other")
+    events = [json.loads(r.getMessage()) for r in caplog.records]
+    assert [e["event"] for e in events] == ["kept", "other"]
+    assert events[0]["sample_rate"] == 1.0 and events[0]["temp"] == 110.0
+    assert "sample_rate" not in events[1]
+
+
+def test_setup_routes_events_to_file(tmp_path, monkeypatch):
+    path = tmp_path / "events.log"
+    monkeypatch.setattr(settings, "log_path", str(path))
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    try:
+        logging_service.setup_logging()
+        log_event("reading_added", session_id="abc", temp=150.0)
+        logging.getLogger("other").info("plain %s", "text")
+        logging_service.shutdown_logging()
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    first, second = path.read_text().splitlines()
+    event = json.loads(first)
+    assert event["event"] == "reading_added" and event["session_id"] == "abc"
+    assert "T" in event["timestamp"]
+    assert second == "plain text"
+
+
+def test_failed_rotation_keeps_appending(tmp_path, monkeypatch):
+    path = tmp_path / "pitmaster.log"
+
+    def refuse(source, target):
+        raise PermissionError("locked")
+
+    monkeypatch.setattr(logging_service.os, "replace", refuse)
+    writer = BatchedLogWriter(path=str(path), max_bytes=50, backup_count=2, batch_size=4)
+    for i in range(12):
+        writer.submit({"event": "e", "i": i})
+    writer.start()
+    writer.stop()
+
+    assert writer.batches == 3 and writer.rotate_failures == 3
+    assert [p.name for p in tmp_path.iterdir()] == ["pitmaster.log"]
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["i"] for e in entries if e["event"] == "e"] == list(range(12))
+    assert sum(e["event"] == "log_rotate_failed" for e in entries) == 3
+
+
+def test_unopenable_log_file_falls_back_to_stderr(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "pitmaster.log"
+    opened = []
+
+    def open_once(*args, **kwargs):
+        if opened:
+            raise PermissionError("read-only")
+        opened.append(args)
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(logging_service, "open", open_once, raising=False)
+    writer = BatchedLogWriter(path=str(path), max_bytes=50, backup_count=1, batch_size=4)
+    for i in range(8):
+        writer.submit({"event": "e", "i": i})
+    writer.start()
+    writer.stop()
+
+    assert writer.batches == 2
+    rotated = (tmp_path / "pitmaster.log.1").read_text().splitlines()
+    assert [json.loads(line)["i"] for line in rotated] == [0, 1, 2, 3]
+    err = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert err[0]["event"] == "log_open_failed"
+    assert [e["i"] for e in err[1:]] == [4, 5, 6, 7]
+
+
+def test_handler_formats_records_when_logged():
+    writer = BatchedLogWriter()
+    handler = _EventQueueHandler(writer)
+    items = [1]
+    handler.handle(logging.LogRecord(
+        "pitmaster", logging.INFO, __file__, 1, "items %s", (items,), None))
+    items.append(2)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        handler.handle(logging.LogRecord(
+            "pitmaster", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()))
+
+    first, second = writer.queue.get_nowait(), writer.queue.get_nowait()
+    assert writer._format(first) == "items [1]"
+    assert second.exc_info is None and second.args is None
+    assert "ValueError: boom" in writer._format(second)
+
+
+class _FullDisk(io.StringIO):
+    def write(self, text):
+        raise OSError(28, "No space left on device")
+
+
+def test_refused_batch_goes_to_stderr(tmp_path, capsys):
+    writer = BatchedLogWriter(path=str(tmp_path / "pitmaster.log"))
+    writer._stream = _FullDisk()
+    writer._write([{"event": "e", "i": 0}, _record("plain")])
+
+    assert writer.write_failures == 1 and writer.lost == 0
+    err = capsys.readouterr().err.splitlines()
+    assert json.loads(err[0])["event"] == "log_write_failed"
+    assert err[1:] == ['{"event": "e", "i": 0}', "plain"]
+
+
+def test_batch_refused_everywhere_is_counted_lost(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "stderr", _FullDisk())
+    writer = BatchedLogWriter(path=str(tmp_path / "pitmaster.log"))
+    writer._stream = _FullDisk()
+    writer._write([{"event": "e"}, _record("one"), _record("two")])
+
+    assert writer.write_failures == 1 and writer.lost == 3
+    assert writer.batches == 0
@@ -0,0 +1,139 @@
+"""Tests for the in-process metrics registry and /metrics."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from backend.database import repository as repo
+from backend.main import app
+from backend.models.dataclasses import CookSession
+from backend.services.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    instrument_functions,
+    timed,
+)
+from backend.tests.conftest import run_async
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = Histogram("t_seconds", "Test.", ("op",), registry, buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.labels('a"b').observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP t_seconds Test.", "# TYPE t_seconds histogram"]
+    assert 't_seconds_bucket{op="a\\"b",le="0.1"} 2' in lines
+    assert 't_seconds_bucket{op="a\\"b",le="1.0"} 3' in lines
+    assert 't_seconds_bucket{op="a\\"b",le="+Inf"} 4' in lines
+    assert 't_seconds_sum{op="a\\"b"} 3.65' in lines
+    assert 't_seconds_count{op="a\\"b"} 4' in lines
+    with pytest.raises(ValueError):
+        hist.labels()
+    with pytest.raises(ValueError):
+        Histogram("t_seconds", "Duplicate.", registry=registry)
+
+
+def test_counters_gauges_and_callbacks():
+    registry = MetricsRegistry()
+    counter = Counter("t_total", "Count.", registry=registry)
+    gauge = Gauge("t_jobs", "Jobs.", registry=registry)
+    Gauge("t_ratio", "Ratio.", registry=registry, function=lambda: 0.25)
+    counter.inc(3)
+    with gauge.track_inprogress():
+        assert gauge.labels().value == 1
+    text = registry.render()
+    assert "t_total 3.0" in text
+    assert "t_jobs 0.0" in text
+    assert "t_ratio 0.25" in text
+
+
+def test_timed_and_instrument_functions():
+    registry = MetricsRegistry()
+    hist = Histogram("t_fn_seconds", "Fn.", ("function",), registry)
+
+    @timed(hist, "sync")
+    def double(x):
+        return 2 * x
+
+    async def public(x):
+        return x + 1
+
+    async def _private(x):
+        return x
+
+    namespace = {"__name__": __name__, "public": public, "_private": _private}
+    public.__module__ = _private.__module__ = __name__
+    instrument_functions(namespace, hist)
+
+    assert double(2) == 4
+    assert run_async(namespace["public"](1)) == 2
+    assert namespace["_private"] is _private
+    assert namespace["public"].__name__ == "public"
+    assert hist.labels("sync").count == 1
+    assert hist.labels("public").count == 1
+
+
+def test_metrics_endpoint_reports_routes_and_repository(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="m1"))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            await client.get("/api/v1/cook/m1/state")
+            await client.get("/api/v1/no/such/path")
+            return await client.get("/metrics")
+
+    response = run_async(scenario())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'pitmaster_http_request_duration_seconds_count'
+        '{method="GET",route="/api/v1/cook/{session_id}/state",status="200"}'
+    ) in text
+    assert 'route="unmatched",status="404"' in text
+    assert 'pitmaster_repository_duration_seconds_count{function="save_session"}' in text
+    assert "pitmaster_session_cache_hit_ratio " in text
+    assert "# TYPE pitmaster_monte_carlo_in_progress gauge" in text
+
+
+def test_concurrent_recording_is_exact_and_scrapes_agree():
+    registry = MetricsRegistry()
+    hist = Histogram("t_conc_seconds", "Conc.", ("op",), registry, buckets=(0.5,))
+    counter = Counter("t_conc_total", "Conc.", registry=registry)
+    per_thread = 20_000
+    stop = threading.Event()
+    mismatches = []
+
+    def record(op):
+        child = hist.labels(op)
+        for i in range(per_thread):
+            child.observe(0.25 if i % 2 else 1.0)
+            counter.inc()
+
+    def scrape():
+        while not stop.is_set():
+            lines = registry.render().splitlines()
+            inf = {l.split("{")[1].split(",")[0]: l.rsplit(" ", 1)[1]
+                   for l in lines if 'le="+Inf"' in l}
+            count = {l.split("{")[1].split("}")[0]: l.rsplit(" ", 1)[1]
+                     for l in lines if l.startswith("t_conc_seconds_count")}
+            if inf != count:
+                mismatches.append((inf, count))
+
+    scraper = threading.Thread(target=scrape)
+    scraper.start()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(record, ["a", "b", "a", "b"]))
+    stop.set()
+    scraper.join()
+
+    assert not mismatches
+    assert hist.labels("a").count == hist.labels("b").count == 2 * per_thread
+    assert hist.labels("a").counts == [per_thread, per_thread]
+    assert counter.labels().value == 4 * per_thread
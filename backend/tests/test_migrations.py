@@ -0,0 +1,141 @@
+"""Tests for versioned schema migrations."""
+
+import struct
+from datetime import datetime
+
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.database.migrations import SCHEMA_VERSION, migrate, schema_version
+from backend.database.session_cache import session_cache
+from backend.tests.conftest import run_async
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "database_path", str(tmp_path / "test.db"))
+    session_cache.clear()
+    yield
+    run_async(db.close_db())
+    session_cache.clear()
+
+
+async def _seed_legacy_database() -> None:
+    """Baseline schema with ISO-8601 text timestamps, as before versioning."""
+    conn = await db.get_db()
+    await migrate(conn, target=1)
+    await conn.execute(
+        """
+        INSERT INTO cook_sessions
+            (id, created_at, meat_category, cut_type, weight_lbs,
+             thickness_inches, equipment_type, smoker_temp_f, target_temp_f,
+             dinner_time)
+        VALUES ('old-1', '2025-06-01T08:30:00.250000', 'beef', 'brisket',
+                12.0, 3.0, 'offset', 250.0, 203.0, '2025-06-01T19:00:00')
+        """
+    )
+    for minute, stamp in enumerate(["2025-06-01T09:00:00", "2025-06-01T09:01:00.5"]):
+        await conn.execute(
+            """
+            INSERT INTO probe_readings
+                (session_id, timestamp, temp_f, elapsed_minutes)
+            VALUES ('old-1', ?, ?, ?)
+            """,
+            (stamp, 60.0 + minute, float(minute)),
+        )
+    await conn.execute(
+        """
+        INSERT INTO predictions
+            (session_id, timestamp, p10_minutes, p50_minutes, p90_minutes,
+             confidence, current_state)
+        VALUES ('old-1', '2025-06-01T09:01:00', 500, 600, 700, 'low', 'preheat')
+        """
+    )
+    await conn.commit()
+
+
+def test_fresh_database_is_created_at_latest_version(db_path):
+    async def scenario():
+        await db.init_db()
+        conn = await db.get_db()
+        cursor = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+        )
+        indexes = {row["name"] for row in await cursor.fetchall()}
+        return await schema_version(conn), indexes
+
+    version, indexes = run_async(scenario())
+    assert version == SCHEMA_VERSION
+    assert "idx_predictions_session_ts" in indexes
+    assert "idx_probe_readings_session" in indexes
+
+
+def test_legacy_database_is_backfilled_in_place(db_path):
+    async def scenario():
+        await _seed_legacy_database()
+        await db.init_db()
+        await db.init_db()  # already current: no-op
+        conn = await db.get_db()
+        cursor = await conn.execute(
+            "SELECT typeof(timestamp) AS kind FROM probe_readings"
+        )
+        kinds = {row["kind"] for row in await cursor.fetchall()}
+        session = await repo.load_session("old-1")
+        summary = await repo.load_session_summary("old-1", readonly=True)
+        return await schema_version(conn), kinds, session, summary
+
+    version, kinds, session, summary = run_async(scenario())
+    assert version == SCHEMA_VERSION
+    assert kinds == {"integer"}
+    assert session.created_at == datetime(2025, 6, 1, 8, 30, 0, 250000)
+    assert session.dinner_time == datetime(2025, 6, 1, 19, 0)
+    assert [r.timestamp for r in session.readings] == [
+        datetime(2025, 6, 1, 9, 0), datetime(2025, 6, 1, 9, 1, 0, 500000),
+    ]
+    assert session.predictions[0].p50_minutes == 600
+    assert summary.readings_count == 2
+    assert (summary.last_temp_f, summary.last_elapsed_minutes) == (61.0, 1.0)
+    assert summary.latest_p50_minutes == 600
+
+
+def test_summary_backfill_reads_version_1_stall_state(db_path):
+    async def scenario():
+        await _seed_legacy_database()
+        conn = await db.get_db()
+        await migrate(conn, target=7)
+        blob = struct.pack("<BBHHHHdddd", 1, 1, 2, 1, 1, 1, 151.0, 240.0, 35.0, 152.0)
+        await conn.execute(
+            "UPDATE cook_sessions SET stall_state = ? WHERE id = 'old-1'",
+            (blob + struct.pack("<dd", 0.01, 0.0),),
+        )
+        await conn.commit()
+        await db.init_db()
+        return await repo.load_session_summary("old-1", readonly=True)
+
+    summary = run_async(scenario())
+    assert summary.stall_active is True
+    assert summary.stall_start_minutes == 240.0
+    assert summary.stall_duration_minutes == 35.0
+
+
+def test_latest_prediction_query_uses_index(db_path):
+    async def scenario():
+        await db.init_db()
+        conn = await db.get_db()
+        cursor = await conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM predictions WHERE session_id = ? "
+            "ORDER BY timestamp DESC LIMIT 1",
+            ("x",),
+        )
+        return " ".join(row["detail"] for row in await cursor.fetchall())
+
+    plan = run_async(scenario())
+    assert "idx_predictions_session_ts" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_epoch_ms_round_trip():
+    stamp = datetime(2026, 3, 8, 14, 5, 9, 123000)
+    assert repo.from_epoch_ms(repo.to_epoch_ms(stamp)) == stamp
@@ -0,0 +1,243 @@
+"""Tests for high-frequency probe sample downsampling."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from backend.config import settings
+from backend.database import repository as repo
+from backend.main import app
+from backend.models.dataclasses import CookSession, ProbeReading
+from backend.models.schemas import (
+    BatchProbeReading,
+    FinishCookRequest,
+    ProbeReadingBatchRequest,
+    ProbeReadingRequest,
+    ProbeSample,
+    ProbeSampleBatchRequest,
+)
+from backend.services import cook_session_service as svc
+from backend.services.probe_stream import ProbeStreamBuffer
+from backend.tests.conftest import run_async
+
+START = datetime(2024, 7, 4, 8, 0, 0)
+
+
+def _feed(buffer: ProbeStreamBuffer, seconds: int, temp_at) -> list[ProbeReading]:
+    closed = []
+    for s in range(seconds):
+        closed.extend(buffer.add(START + timedelta(seconds=s), temp_at(s)))
+    return closed
+
+
+def test_one_hz_samples_aggregate_per_minute():
+    buffer = ProbeStreamBuffer("s1", origin=START)
+    closed = _feed(buffer, 150, lambda s: 100.0 + s * 0.1)
+
+    assert len(closed) == 2
+    first = closed[0]
+    assert first.sample_count == 60
+    assert first.temp_min_f == pytest.approx(100.0)
+    assert first.temp_max_f == pytest.approx(105.9)
+    assert first.temp_mean_f == pytest.approx(102.95)
+    assert first.temp_f == pytest.approx(105.9)
+    assert first.elapsed_minutes == pytest.approx(59 / 60, abs=1e-3)
+
+    tail = buffer.flush()
+    assert tail is not None and tail.sample_count == 30
+
+
+def test_late_samples_are_dropped():
+    buffer = ProbeStreamBuffer("s1", origin=START)
+    _feed(buffer, 90, lambda s: 150.0)
+    assert buffer.add(START + timedelta(seconds=10), 999.0) == []
+    tail = buffer.flush()
+    assert tail.temp_max_f == 150.0
+
+
+def test_copy_is_independent():
+    buffer = ProbeStreamBuffer("s1", origin=START)
+    _feed(buffer, 30, lambda s: 150.0)
+    staged = buffer.copy()
+    assert len(_feed(staged, 90, lambda s: 160.0)) == 1
+    tail = buffer.flush()
+    assert tail.sample_count == 30 and tail.temp_max_f == 150.0
+
+
+def test_buffer_continues_after_stored_readings():
+    readings = [
+        ProbeReading(timestamp=START + timedelta(minutes=m), temp_f=120.0,
+                     elapsed_minutes=float(m))
+        for m in range(3)
+    ]
+    buffer = ProbeStreamBuffer.for_readings("s1", readings, now=START)
+    # A sample inside an already-stored minute is late
+    assert buffer.add(START + timedelta(minutes=2, seconds=5), 121.0) == []
+    buffer.add(START + timedelta(minutes=3, seconds=5), 122.0)
+    closed = buffer.add(START + timedelta(minutes=4, seconds=1), 123.0)
+    assert len(closed) == 1
+    assert closed[0].elapsed_minutes == pytest.approx(3 + 5 / 60, abs=1e-3)
+
+
+def test_aware_and_naive_timestamps_mix():
+    readings = [ProbeReading(timestamp=START, temp_f=120.0, elapsed_minutes=0.0)]
+    buffer = ProbeStreamBuffer.for_readings("s1", readings, now=START)
+    utc = timezone.utc
+    buffer.add((START + timedelta(minutes=1, seconds=5)).replace(tzinfo=utc), 121.0)
+    # 09:02 at UTC+1 is 08:02 UTC
+    plus_one = timezone(timedelta(hours=1))
+    closed = buffer.add(START.replace(hour=9, minute=2, tzinfo=plus_one), 122.0)
+    closed += buffer.add(START + timedelta(minutes=3, seconds=1), 123.0)
+    assert [r.elapsed_minutes for r in closed] == pytest.approx([1 + 5 / 60, 2.0], abs=1e-3)
+    assert all(r.timestamp.tzinfo is None for r in closed)
+
+
+def test_samples_endpoint_accepts_utc_suffix(temp_db, fast_monte_carlo):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            setup = await client.post("/api/v1/cook/setup", json={
+                "meat_category": "beef", "cut_type": "brisket",
+                "weight_lbs": 12, "thickness_inches": 4,
+            })
+            session_id = setup.json()["session_id"]
+            await client.post(f"/api/v1/cook/{session_id}/reading", json={"temp_f": 100.0})
+            now = datetime.utcnow()
+            aware = await client.post(f"/api/v1/cook/{session_id}/samples", json={
+                "samples": [
+                    {"temp_f": 101.0, "timestamp": (now + timedelta(minutes=m)).isoformat() + "Z"}
+                    for m in (1, 2)
+                ],
+            })
+            naive = await client.post(f"/api/v1/cook/{session_id}/samples", json={
+                "samples": [{"temp_f": 102.0}],
+            })
+        return aware, naive, await repo.load_session(session_id)
+
+    aware, naive, session = run_async(scenario())
+    assert aware.status_code == 200 and aware.json()["minutes_aggregated"] == 1
+    assert naive.status_code == 200
+    assert all(r.timestamp.tzinfo is None for r in session.readings)
+
+
+class _Clock(datetime):
+    """datetime whose utcnow() is set by the test."""
+
+    current = START
+
+    @classmethod
+    def utcnow(cls):
+        return cls.current
+
+
+def test_reading_elapsed_follows_arrival_time(temp_db, fast_monte_carlo, monkeypatch):
+    monkeypatch.setattr(svc, "datetime", _Clock)
+    offsets = [timedelta(0), timedelta(seconds=10), timedelta(minutes=5, seconds=10),
+               timedelta(minutes=5, seconds=40)]
+
+    async def scenario():
+        await repo.save_session(CookSession(id="uneven", created_at=START))
+        for i, offset in enumerate(offsets):
+            _Clock.current = START + offset
+            await svc.add_reading("uneven", ProbeReadingRequest(temp_f=150.0 + i))
+        return await repo.load_session("uneven")
+
+    session = run_async(scenario())
+    assert [r.elapsed_minutes for r in session.readings] == pytest.approx(
+        [0.0, 1 / 6, 31 / 6, 34 / 6]
+    )
+    window = session.stall.slope_history.window
+    assert [t for t, _ in window.samples] == pytest.approx([0.0, 1 / 6, 31 / 6, 34 / 6])
+
+
+def test_batch_elapsed_follows_item_timestamps(temp_db, fast_monte_carlo, monkeypatch):
+    monkeypatch.setattr(svc, "datetime", _Clock)
+    _Clock.current = START
+
+    def batch(*minutes):
+        return ProbeReadingBatchRequest(readings=[
+            BatchProbeReading(temp_f=150.0 + m, timestamp=START + timedelta(minutes=m))
+            for m in minutes
+        ])
+
+    async def scenario():
+        await repo.save_session(CookSession(id="backlog", created_at=START))
+        await svc.add_readings_batch("backlog", batch(0, 0.5, 7))
+        # Out of order, one item older than the stored tail
+        await svc.add_readings_batch("backlog", batch(20, 12, 6))
+        return await repo.load_session("backlog")
+
+    session = run_async(scenario())
+    assert [r.elapsed_minutes for r in session.readings] == pytest.approx(
+        [0.0, 0.5, 7.0, 7.0, 12.0, 20.0]
+    )
+    assert [r.temp_f for r in session.readings] == [150.0, 150.5, 157.0, 156.0, 162.0, 170.0]
+
+
+def _samples(start_s: int, seconds: int) -> ProbeSampleBatchRequest:
+    return ProbeSampleBatchRequest(samples=[
+        ProbeSample(temp_f=150.0, timestamp=START + timedelta(seconds=s))
+        for s in range(start_s, start_s + seconds)
+    ])
+
+
+def test_failed_commit_keeps_samples_for_retry(temp_db, fast_monte_carlo, monkeypatch):
+    save_readings = repo.save_readings
+    failures = [RuntimeError("disk full")]
+
+    async def flaky_save(readings):
+        if failures:
+            raise failures.pop()
+        return await save_readings(readings)
+
+    monkeypatch.setattr(repo, "save_readings", flaky_save)
+
+    async def full_load(session_id, *args, **kwargs):
+        raise AssertionError("sample ingest loads only the session tail")
+
+    async def scenario():
+        await repo.save_session(CookSession(id="retry", created_at=START))
+        load_session = repo.load_session
+        monkeypatch.setattr(repo, "load_session", full_load)
+        await svc.ingest_samples("retry", _samples(0, 30))
+        with pytest.raises(RuntimeError):
+            await svc.ingest_samples("retry", _samples(30, 60))
+        _, _, minutes = await svc.ingest_samples("retry", _samples(30, 60))
+        monkeypatch.setattr(repo, "load_session", load_session)
+        return minutes, await repo.load_session("retry")
+
+    minutes, session = run_async(scenario())
+    assert minutes == 1
+    assert [r.sample_count for r in session.readings] == [60]
+
+
+def test_finish_ingests_open_minute(temp_db, fast_monte_carlo):
+    async def scenario():
+        await repo.save_session(CookSession(id="tail", created_at=START))
+        await svc.ingest_samples("tail", _samples(0, 90))
+        before = await repo.load_session("tail")
+        await svc.finish_cook("tail", FinishCookRequest())
+        return before, await repo.load_session("tail")
+
+    before, after = run_async(scenario())
+    assert [r.sample_count for r in after.readings] == [60, 30]
+    # The tail went through the state machine and got its own prediction
+    assert before.predictions[-1].readings_count == 1
+    assert after.predictions[-1].readings_count == 2
+    assert "tail" not in svc._stream_buffers
+
+
+def test_idle_buffers_are_dropped(temp_db, fast_monte_carlo, monkeypatch):
+    monkeypatch.setattr(settings, "stream_buffer_idle_s", 0.05)
+
+    async def scenario():
+        for session_id in ("idle", "busy"):
+            await repo.save_session(CookSession(id=session_id, created_at=START))
+        await svc.ingest_samples("idle", _samples(0, 10))
+        await asyncio.sleep(0.1)
+        await svc.ingest_samples("busy", _samples(0, 10))
+
+    run_async(scenario())
+    assert list(svc._stream_buffers) == ["busy"]
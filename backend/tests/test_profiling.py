@@ -0,0 +1,151 @@
+"""Tests for on-demand request profiling."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from backend.config import settings
+from backend.database import repository as repo
+from backend.main import app
+from backend.routers import profiling as profiling_router
+from backend.models.dataclasses import CookSession
+from backend.services import cook_session_service as svc
+from backend.services.profiling import StackSampler, layer_seconds
+from backend.services.tracing import Span
+from backend.tests.conftest import run_async
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_collects_collapsed_stacks():
+    sampler = StackSampler(threading.get_ident(), interval_s=0.001)
+    sampler.start()
+    _spin(0.1)
+    profile = sampler.stop()
+
+    assert profile.samples > 0
+    assert profile.wall_s >= 0.1
+    lines = profile.collapsed().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert stack.split(";")[-1].endswith(":_spin")
+
+
+def test_layers_come_from_span_self_time():
+    root = Span("profile")
+    http = Span("http")
+    service = Span("service.add_reading")
+    load = Span("load")
+    query = Span("repository.load_session")
+    monte_carlo = Span("monte_carlo")
+    root.children = [http]
+    http.children = [service]
+    service.children = [load, monte_carlo]
+    load.children = [query]
+    for node, start, end in ((root, 0.0, 1.0), (http, 0.1, 0.9), (service, 0.2, 0.8),
+                             (load, 0.2, 0.4), (query, 0.25, 0.35), (monte_carlo, 0.4, 0.7)):
+        node.start, node.end = start, end
+
+    layers = layer_seconds(root)
+    assert layers == pytest.approx({
+        "router": 0.2, "service": 0.2, "repository": 0.1,
+        "simulation": 0.3, "other": 0.2,
+    })
+    assert sum(layers.values()) == pytest.approx(1.0)
+
+
+def test_profile_header_gates_profiling(temp_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path / "profiles"))
+
+    async def scenario():
+        await repo.save_session(CookSession(id="prof"))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            path = "/api/v1/cook/prof/state"
+            profiled = await client.get(path, headers={"X-Pitmaster-Profile": "s3cret"})
+            wrong = await client.get(path, headers={"X-Pitmaster-Profile": "guess"})
+            plain = await client.get(path)
+        return profiled, wrong, plain
+
+    profiled, wrong, plain = run_async(scenario())
+    assert profiled.status_code == 200
+    timing = profiled.headers["server-timing"]
+    for layer in ("router", "service", "repository", "simulation", "other", "total"):
+        assert f"{layer};dur=" in timing
+    filename = profiled.headers["x-profile-file"]
+    assert filename.endswith("-GET-api_v1_cook_prof_state.collapsed")
+    assert (tmp_path / "profiles" / filename).exists()
+    for response in (wrong, plain):
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+
+
+def test_server_timing_attributes_awaited_work(temp_db, tmp_path, monkeypatch, fast_monte_carlo):
+    monkeypatch.setattr(settings, "profiling_token", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path / "profiles"))
+    run_monte_carlo = svc.run_monte_carlo
+
+    def slow_monte_carlo(session, n_iterations=1000):
+        time.sleep(0.05)
+        return run_monte_carlo(session, n_iterations=n_iterations)
+
+    monkeypatch.setattr(svc, "run_monte_carlo", slow_monte_carlo)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            setup = await client.post("/api/v1/cook/setup", json={
+                "meat_category": "beef", "cut_type": "brisket",
+                "weight_lbs": 12, "thickness_inches": 4,
+            })
+            return await client.post(
+                f"/api/v1/cook/{setup.json()['session_id']}/reading",
+                json={"temp_f": 100.0},
+                headers={"X-Pitmaster-Profile": "s3cret"},
+            )
+
+    response = run_async(scenario())
+    assert response.status_code == 200
+    timing = dict(
+        item.strip().split(";dur=") for item in response.headers["server-timing"].split(",")
+    )
+    timing = {layer: float(ms) for layer, ms in timing.items()}
+    assert timing["simulation"] >= 50.0
+    assert timing["repository"] > 0.0
+    layers = sum(ms for layer, ms in timing.items() if layer != "total")
+    assert layers == pytest.approx(timing["total"], abs=0.1)
+
+
+def test_profile_file_is_written_off_the_event_loop(temp_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path / "profiles"))
+    store_profile = profiling_router._store_profile
+    writers = []
+
+    def recording_store(scope, profile):
+        writers.append(threading.get_ident())
+        return store_profile(scope, profile)
+
+    monkeypatch.setattr(profiling_router, "_store_profile", recording_store)
+
+    async def scenario():
+        await repo.save_session(CookSession(id="prof"))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            response = await client.get(
+                "/api/v1/cook/prof/state", headers={"X-Pitmaster-Profile": "s3cret"}
+            )
+        return response, threading.get_ident()
+
+    response, loop_thread = run_async(scenario())
+    assert response.status_code == 200
+    assert len(writers) == 1 and writers[0] != loop_thread
+    assert (tmp_path / "profiles" / response.headers["x-profile-file"]).exists()
@@ -0,0 +1,111 @@
+"""Tests for columnar reading chunk storage."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.database.convert_readings import convert_all
+from backend.database.reading_chunks import (
+    READINGS_PER_CHUNK,
+    RECORD_DTYPE,
+    ReadingColumns,
+    append_to_chunks,
+    decode_chunks,
+)
+from backend.database.session_cache import session_cache
+from backend.models.dataclasses import CookSession, ProbeReading
+from backend.tests.conftest import run_async
+
+START = datetime(2026, 5, 2, 6, 0)
+
+
+def _readings(session_id: str, n: int, start_minute: int = 0) -> list[ProbeReading]:
+    return [
+        ProbeReading(
+            session_id=session_id,
+            timestamp=START + timedelta(minutes=m, milliseconds=250),
+            temp_f=round(40.0 + 0.7 * m, 1),
+            smoker_temp_f=None if m % 3 else 251.5,
+            elapsed_minutes=float(m),
+            temp_min_f=None,
+            temp_max_f=None,
+            temp_mean_f=None,
+            sample_count=1 + m % 60,
+        )
+        for m in range(start_minute, start_minute + n)
+    ]
+
+
+def test_record_is_packed():
+    assert RECORD_DTYPE.itemsize == 30
+
+
+def test_chunks_round_trip_across_chunk_boundary():
+    readings = _readings("s", READINGS_PER_CHUNK + 15)
+    first = append_to_chunks(None, ReadingColumns.from_readings(readings[:100]))
+    assert len(first) == 1 and first[0].n_readings == 100
+
+    more = append_to_chunks(first[-1], ReadingColumns.from_readings(readings[100:]))
+    assert [c.chunk_index for c in more] == [0, 1]
+    assert [c.n_readings for c in more] == [READINGS_PER_CHUNK, 15]
+
+    columns = decode_chunks(more)
+    assert columns.temp_f.tolist() == [r.temp_f for r in readings]
+    assert columns.to_readings("s") == readings
+
+
+def test_large_time_gap_starts_new_chunk():
+    readings = _readings("s", 2)
+    readings[1].timestamp = readings[0].timestamp + timedelta(days=40)
+    chunks = append_to_chunks(None, ReadingColumns.from_readings(readings))
+    assert [c.n_readings for c in chunks] == [1, 1]
+    decoded = decode_chunks(chunks).to_readings("s")
+    assert [r.timestamp for r in decoded] == [r.timestamp for r in readings]
+
+
+def test_chunk_storage_loads_like_row_storage(temp_db, monkeypatch):
+    async def scenario():
+        await repo.save_session(CookSession(id="rows"))
+        await repo.save_session(CookSession(id="chunks"))
+        await repo.save_readings(_readings("rows", 300))
+        monkeypatch.setattr(settings, "reading_storage", "chunks")
+        await repo.save_readings(_readings("chunks", 299))
+        await repo.save_reading(_readings("chunks", 1, start_minute=299)[0])
+        session_cache.clear()
+        return (
+            await repo.load_session("rows"),
+            await repo.load_session("chunks"),
+            await repo.load_session_tail("chunks", n_readings=3),
+            await repo.count_session_rows("chunks"),
+        )
+
+    rows, chunks, tail, counts = run_async(scenario())
+    strip = lambda rs: [(r.timestamp, r.temp_f, r.smoker_temp_f, r.elapsed_minutes,
+                         r.sample_count) for r in rs]
+    assert strip(chunks.readings) == strip(rows.readings)
+    assert [r.elapsed_minutes for r in tail.readings] == [297.0, 298.0, 299.0]
+    assert tail.readings_count == 300
+    assert counts.readings == 300
+
+
+def test_convert_existing_rows(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="old"))
+        await repo.save_readings(_readings("old", 50))
+        before = await repo.load_reading_columns("old")
+        converted = await convert_all(batch=10)
+        conn = await db.get_db()
+        cursor = await conn.execute("SELECT COUNT(*) FROM probe_readings")
+        remaining = (await cursor.fetchone())[0]
+        after = await repo.load_reading_columns("old")
+        return before, converted, remaining, after
+
+    before, converted, remaining, after = run_async(scenario())
+    assert converted == (1, 50)
+    assert remaining == 0
+    np.testing.assert_array_equal(after.temp_f, before.temp_f)
+    np.testing.assert_array_equal(after.timestamp_ms, before.timestamp_ms)
+    assert (after.id == -1).all()
@@ -0,0 +1,99 @@
+"""Tests for vectorized offline state-machine replay."""
+
+import numpy as np
+import pytest
+
+from backend.models.dataclasses import CookSession, ProbeReading
+from backend.models.enums import CookState
+from backend.state_machine.cook_states import CookStateMachine
+from backend.state_machine.replay import replay_readings
+from backend.state_machine.trust import TrustEvaluator
+
+
+def _synthetic_cook(rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Rising probe curve with an optional plateau, noise and glitches."""
+    plateau_temp = rng.uniform(145, 170)
+    plateau_len = int(rng.integers(0, 60))
+    rise = np.linspace(40, plateau_temp, int(rng.integers(40, 120)))
+    plateau = np.full(plateau_len, plateau_temp) + np.cumsum(
+        rng.uniform(0, 0.015, plateau_len)
+    )
+    finish = np.linspace(plateau_temp, 210, int(rng.integers(30, 90)))
+    temps = np.concatenate((rise, plateau, finish))
+    temps += rng.normal(0, 0.2, temps.size) * (rng.random(temps.size) < 0.3)
+    glitches = rng.random(temps.size) < 0.02
+    temps[glitches] -= rng.uniform(6, 12, glitches.sum())
+    smoker = np.where(rng.random(temps.size) < 0.5, np.nan,
+                      rng.normal(250, 25, temps.size))
+    return temps, smoker
+
+
+def _online(temps, smoker, elapsed, target):
+    session = CookSession(
+        id="replay", target_temp_f=target, smoker_temp_f=250.0,
+        current_state=CookState.PREHEAT,
+    )
+    sm = CookStateMachine(session)
+    trust = TrustEvaluator()
+    states, frozen = [], []
+    for t, s, e in zip(temps, smoker, elapsed):
+        reading = ProbeReading(
+            temp_f=float(t),
+            smoker_temp_f=None if np.isnan(s) else float(s),
+            elapsed_minutes=float(e),
+        )
+        session.readings.append(reading)
+        sm.advance(reading)
+        frozen.append(trust.observe(session))
+        states.append(session.current_state)
+    return session, states, frozen
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_replay_matches_online_advance(seed):
+    rng = np.random.default_rng(seed)
+    temps, smoker = _synthetic_cook(rng)
+    elapsed = np.arange(temps.size, dtype=float)
+    target = 203.0
+
+    session, states, frozen = _online(temps, smoker, elapsed, target)
+    result = replay_readings(temps, smoker, elapsed, target, 250.0)
+
+    assert [result.state_at(i) for i in range(temps.size)] == states
+    assert result.confidence_frozen.tolist() == frozen
+    assert result.stall_start_minutes == session.stall.stall_start_minutes
+    assert result.stall_duration_minutes == session.stall.stall_duration_minutes
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_matches_online_advance_irregular_spacing(seed):
+    rng = np.random.default_rng(100 + seed)
+    temps, smoker = _synthetic_cook(rng)
+    elapsed = np.cumsum(rng.uniform(0.2, 3.0, temps.size))
+
+    session, states, _ = _online(temps, smoker, elapsed, 203.0)
+    result = replay_readings(temps, smoker, elapsed, 203.0, 250.0)
+
+    assert [result.state_at(i) for i in range(temps.size)] == states
+    assert result.stall_start_minutes == session.stall.stall_start_minutes
+
+
+def test_replay_detects_stall_interval():
+    temps = np.concatenate((
+        np.linspace(40, 150, 60), np.full(30, 150.0), np.linspace(150, 205, 40)
+    ))
+    elapsed = np.arange(temps.size, dtype=float)
+    result = replay_readings(
+        temps, np.full(temps.size, np.nan), elapsed, 203.0, 250.0
+    )
+    assert result.stall_start_index is not None
+    assert result.stall_end_index > result.stall_start_index
+    assert result.stall_duration_minutes > 0
+    assert result.final_state == CookState.DONE
+
+
+def test_replay_empty_input():
+    empty = np.zeros(0)
+    result = replay_readings(empty, empty, empty, 203.0, 250.0)
+    assert result.final_state is None
+    assert result.anomalies.size == 0
@@ -0,0 +1,196 @@
+"""Tests for the repository and its serialization helpers."""
+
+import struct
+from array import array
+
+import pytest
+
+from backend.config import settings
+from backend.database import repository as repo
+from backend.database.repository import decode_stall_state, encode_stall_state
+from backend.database.session_cache import session_cache
+from backend.models.dataclasses import (
+    CookSession,
+    LidOpenEvent,
+    PredictionResult,
+    ProbeReading,
+    SlopeHistory,
+    StallState,
+)
+from backend.models.enums import CookState
+from backend.simulation.stall_model import push_slope, recent_slopes, window_update
+from backend.tests.conftest import run_async
+
+
+def test_stall_state_round_trip():
+    history = SlopeHistory(capacity=8, last_temp_f=152.5)
+    for slope in [0.5, 0.01, 0.0, 0.01]:
+        push_slope(history, slope)
+    for minute in range(4):
+        window_update(history.window, float(minute), 150.0 + minute)
+    stall = StallState(
+        in_stall=True,
+        stall_start_temp_f=151.0,
+        stall_start_minutes=240.0,
+        stall_duration_minutes=35.0,
+        slope_history=history,
+    )
+
+    restored = decode_stall_state(encode_stall_state(stall))
+
+    assert restored.in_stall is True
+    assert restored.stall_start_temp_f == 151.0
+    assert restored.stall_start_minutes == 240.0
+    assert restored.stall_duration_minutes == 35.0
+    assert restored.slope_history.below_threshold_run == 3
+    assert restored.slope_history.last_temp_f == 152.5
+    assert recent_slopes(restored.slope_history) == [0.5, 0.01, 0.0, 0.01]
+    assert restored.slope_history.window == history.window
+    assert window_update(restored.slope_history.window, 4.0, 154.0) == pytest.approx(1.0)
+
+
+def test_stall_state_rebuilds_version_3_window_sums():
+    # Version 3 stored the window sums from minute 0, not from the
+    # window's first sample
+    history = SlopeHistory(capacity=2)
+    for minute in range(600, 604):
+        window_update(history.window, float(minute), 150.0 + 0.5 * minute)
+    blob = bytearray(encode_stall_state(StallState(slope_history=history)))
+    samples = history.window.samples
+    absolute = (
+        sum(t for t, _ in samples),
+        sum(y for _, y in samples),
+        sum(t * t for t, _ in samples),
+        sum(t * y for t, y in samples),
+    )
+    struct.pack_into("<dddd", blob, struct.calcsize("<BBIIIIdddddI"), *absolute)
+    blob[0] = 3
+
+    window = decode_stall_state(bytes(blob)).slope_history.window
+
+    assert window == history.window
+    assert window_update(window, 604.0, 452.0) == pytest.approx(0.5)
+
+
+def test_stall_state_long_below_threshold_run():
+    history = SlopeHistory(capacity=4, below_threshold_run=100_000)
+    restored = decode_stall_state(encode_stall_state(StallState(slope_history=history)))
+    assert restored.slope_history.below_threshold_run == 100_000
+
+
+def test_stall_state_reads_version_1_blobs():
+    nan = float("nan")
+    blob = struct.pack("<BBHHHHdddd", 1, 1, 2, 1, 1, 1, 151.0, nan, 5.0, 152.0)
+    restored = decode_stall_state(blob + array("d", [0.01, 0.0]).tobytes())
+    assert restored.in_stall is True
+    assert restored.stall_start_minutes is None
+    assert restored.slope_history.last_temp_f == 152.0
+    assert recent_slopes(restored.slope_history) == [0.01]
+
+
+def test_stall_state_defaults_when_missing():
+    restored = decode_stall_state(None)
+    assert restored.in_stall is False
+    assert restored.stall_start_minutes is None
+    assert restored.slope_history.count == 0
+
+
+def test_cached_session_matches_database(temp_db):
+    async def scenario():
+        session = CookSession(id="cache-1", current_state=CookState.PREHEAT)
+        await repo.save_session(session)
+        for minute in range(3):
+            await repo.save_reading(ProbeReading(
+                session_id="cache-1", temp_f=100.0 + minute,
+                elapsed_minutes=float(minute),
+            ))
+        await repo.save_prediction(PredictionResult(
+            session_id="cache-1", p50_minutes=600.0,
+        ))
+        await repo.update_session_state("cache-1", "early_cook", "moderate")
+
+        cached = await repo.load_session("cache-1")
+        session_cache.clear()
+        stored = await repo.load_session("cache-1")
+        return cached, stored
+
+    cached, stored = run_async(scenario())
+    assert [r.temp_f for r in cached.readings] == [r.temp_f for r in stored.readings]
+    assert cached.predictions[0].p50_minutes == stored.predictions[0].p50_minutes
+    assert cached.current_state == stored.current_state == CookState.EARLY_COOK
+    assert cached.confidence == stored.confidence
+
+
+def test_projection_loaders(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="proj-1"))
+        await repo.save_readings([
+            ProbeReading(session_id="proj-1", temp_f=100.0 + m,
+                         elapsed_minutes=float(m))
+            for m in range(5)
+        ])
+        await repo.save_prediction(PredictionResult(
+            session_id="proj-1", p50_minutes=480.0,
+        ))
+        from_cache = await repo.load_session_tail("proj-1", n_readings=2)
+        session_cache.clear()
+        from_db = await repo.load_session_tail("proj-1", n_readings=2)
+        counts = await repo.count_session_rows("proj-1")
+        header = await repo.load_session_header("proj-1")
+        missing = await repo.load_session_tail("nope")
+        return from_cache, from_db, counts, header, missing
+
+    from_cache, from_db, counts, header, missing = run_async(scenario())
+    for tail in (from_cache, from_db):
+        assert [r.temp_f for r in tail.readings] == [103.0, 104.0]
+        assert tail.readings_count == 5
+        assert tail.predictions[0].p50_minutes == 480.0
+    assert counts.readings == 5 and counts.lid_events == 0
+    assert header.readings == [] and header.id == "proj-1"
+    assert missing is None
+
+
+def test_session_summary_tracks_writes(temp_db, monkeypatch):
+    async def scenario():
+        await repo.save_session(CookSession(id="sum-1"))
+        await repo.save_session(CookSession(id="sum-2"))
+        await repo.save_readings([
+            ProbeReading(session_id="sum-1", temp_f=100.0 + m,
+                         elapsed_minutes=float(m))
+            for m in range(5)
+        ])
+        monkeypatch.setattr(settings, "reading_storage", "chunks")
+        await repo.save_reading(ProbeReading(
+            session_id="sum-1", temp_f=150.0, elapsed_minutes=9.0,
+        ))
+        # An out-of-order reading does not replace the latest one
+        await repo.save_reading(ProbeReading(
+            session_id="sum-1", temp_f=120.0, elapsed_minutes=7.0,
+        ))
+        await repo.save_lid_event(LidOpenEvent(session_id="sum-1"))
+        await repo.save_prediction(PredictionResult(
+            session_id="sum-1", p10_minutes=400.0, p50_minutes=480.0,
+            p90_minutes=560.0,
+        ))
+        stall = StallState(in_stall=True, stall_start_minutes=6.0,
+                           stall_duration_minutes=3.0)
+        await repo.update_session_state("sum-1", "stall", "moderate", stall=stall)
+        cached = await repo.load_session_summary("sum-1")
+        session_cache.clear()
+        from_db = await repo.load_session_summary("sum-1", readonly=True)
+        many = await repo.load_session_summaries(["sum-2", "sum-1", "nope"])
+        return cached, from_db, many
+
+    cached, from_db, many = run_async(scenario())
+    assert from_db == cached
+    assert from_db.readings_count == 7
+    assert from_db.last_temp_f == 150.0 and from_db.last_elapsed_minutes == 9.0
+    assert from_db.lid_opens_count == 1
+    assert from_db.stall_active and from_db.stall_start_minutes == 6.0
+    assert from_db.stall_duration_minutes == 3.0
+    assert from_db.current_state == CookState.STALL
+    assert (from_db.latest_p10_minutes, from_db.latest_p50_minutes,
+            from_db.latest_p90_minutes) == (400.0, 480.0, 560.0)
+    assert set(many) == {"sum-1", "sum-2"}
+    assert many["sum-1"] == from_db
+    assert many["sum-2"].readings_count == 0 and many["sum-2"].last_temp_f is None
@@ -0,0 +1,95 @@
+"""Tests for prediction history retention."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.models.dataclasses import CookSession, PredictionResult
+from backend.models.enums import CookState
+from backend.services.retention_service import run_retention_pass
+from backend.tests.conftest import run_async
+
+START = datetime(2026, 7, 4, 6, 0)  # aligned to a 15-minute bucket
+
+
+def _state_at(minute: int) -> CookState:
+    if minute < 40:
+        return CookState.EARLY_COOK
+    if minute < 100:
+        return CookState.PRE_STALL
+    return CookState.STALL
+
+
+@pytest.fixture
+def db_config(monkeypatch):
+    monkeypatch.setattr(settings, "prediction_full_resolution_minutes", 60.0)
+    monkeypatch.setattr(settings, "prediction_downsample_minutes", 15.0)
+
+
+async def _seed(session_id: str, minutes: int) -> None:
+    await repo.save_session(CookSession(id=session_id))
+    for minute in range(minutes):
+        await repo.save_prediction(PredictionResult(
+            session_id=session_id,
+            timestamp=START + timedelta(minutes=minute),
+            p50_minutes=600.0 - minute,
+            current_state=_state_at(minute),
+            readings_count=minute + 1,
+        ))
+
+
+async def _kept_minutes(session_id: str) -> list[int]:
+    conn = await db.get_db()
+    cursor = await conn.execute(
+        "SELECT readings_count FROM predictions WHERE session_id = ? ORDER BY timestamp",
+        (session_id,),
+    )
+    return [row[0] - 1 for row in await cursor.fetchall()]
+
+
+def test_active_session_is_downsampled(temp_db):
+    async def scenario():
+        await _seed("active", 180)
+        stats = await run_retention_pass()
+        again = await run_retention_pass()
+        return stats, again, await _kept_minutes("active")
+
+    stats, again, kept = run_async(scenario())
+    # Full resolution for the last 60 minutes (latest is minute 179)
+    assert kept[-60:] == list(range(120, 180))
+    # Older: first, state changes, and the last prediction in each bucket
+    assert kept[:-60] == [0, 14, 29, 40, 44, 59, 74, 89, 100, 104, 119]
+    assert stats["predictions_deleted"] == 180 - len(kept)
+    assert again["predictions_deleted"] == 0
+
+
+def test_finished_session_is_compacted_to_summary(temp_db):
+    async def scenario():
+        await _seed("done", 150)
+        await repo.finish_session("done")
+        await run_retention_pass()
+        kept = await _kept_minutes("done")
+        latest = await repo.load_latest_prediction("done")
+        active, finished = await repo.list_retention_candidates(10)
+        return kept, latest, finished
+
+    kept, latest, finished = run_async(scenario())
+    assert kept == [0, 40, 100, 149]
+    assert latest.readings_count == 150
+    assert finished == []
+
+
+def test_database_uses_incremental_auto_vacuum(temp_db):
+    async def scenario():
+        conn = await db.get_db()
+        cursor = await conn.execute("PRAGMA auto_vacuum")
+        mode = (await cursor.fetchone())[0]
+        free = await repo.incremental_vacuum(100)
+        return mode, free
+
+    mode, free = run_async(scenario())
+    assert mode == 2  # INCREMENTAL
+    assert free == 0
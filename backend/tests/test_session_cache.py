@@ -0,0 +1,62 @@
+"""Tests for the write-through session cache."""
+
+from backend.database.session_cache import SessionCache, estimate_session_bytes
+from backend.models.dataclasses import CookSession, ProbeReading
+
+
+def _session(session_id: str, n_readings: int = 0) -> CookSession:
+    session = CookSession(id=session_id)
+    session.readings = [
+        ProbeReading(temp_f=100.0 + i, elapsed_minutes=float(i))
+        for i in range(n_readings)
+    ]
+    return session
+
+
+def test_get_returns_isolated_copy():
+    cache = SessionCache(max_sessions=10, max_bytes=10**9)
+    cache.put(_session("a", 3))
+
+    loaded = cache.get("a")
+    loaded.readings.append(ProbeReading(temp_f=200.0))
+    loaded.stall.slope_history.below_threshold_run = 99
+
+    fresh = cache.get("a")
+    assert len(fresh.readings) == 3
+    assert fresh.stall.slope_history.below_threshold_run == 0
+    assert cache.hits == 2 and cache.misses == 0
+
+
+def test_update_writes_through():
+    cache = SessionCache(max_sessions=10, max_bytes=10**9)
+    cache.put(_session("a"))
+    cache.update("a", lambda s: s.readings.append(ProbeReading(temp_f=150.0)))
+    cache.update("missing", lambda s: s.readings.append(ProbeReading()))
+
+    assert len(cache.get("a").readings) == 1
+    assert "missing" not in cache
+
+
+def test_lru_eviction_by_count():
+    cache = SessionCache(max_sessions=2, max_bytes=10**9)
+    cache.put(_session("a"))
+    cache.put(_session("b"))
+    cache.get("a")  # a becomes most recently used
+    cache.put(_session("c"))
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_eviction_by_memory_cap():
+    big = _session("big", 1000)
+    cap = estimate_session_bytes(big) + estimate_session_bytes(_session("x"))
+    cache = SessionCache(max_sessions=100, max_bytes=cap)
+    cache.put(big)
+    cache.put(_session("small"))
+    assert len(cache) == 2
+
+    cache.update("small", lambda s: s.readings.extend(_session("y", 10).readings))
+    assert "big" not in cache
+    assert cache.total_bytes <= cap
@@ -0,0 +1,65 @@
+"""Tests for live session update streaming."""
+
+import json
+
+import pytest
+
+from backend.database import repository as repo
+from backend.models.dataclasses import CookSession, PredictionResult
+from backend.models.enums import CookState
+from backend.models.schemas import ProbeReadingRequest
+from backend.routers.cook import _event_stream
+from backend.services import cook_session_service as svc
+from backend.services.session_events import SessionEvent, SessionEventBus, session_events
+from backend.tests.conftest import run_async
+
+
+@pytest.fixture
+def db_config(fast_monte_carlo):
+    pass
+
+
+def _parse(frame: bytes) -> tuple[str, dict]:
+    event, data = frame.decode().strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_bus_fans_out_and_drops_oldest_when_full():
+    async def scenario():
+        bus = SessionEventBus(queue_size=2)
+        fast, slow = bus.subscribe("s"), bus.subscribe("s")
+        other = bus.subscribe("t")
+        for i in range(3):
+            bus.publish("s", SessionEvent("state", i))
+        kept = [slow.get_nowait().payload for _ in range(slow.qsize())]
+        bus.unsubscribe("s", fast)
+        bus.unsubscribe("s", slow)
+        return kept, other.qsize(), bus.has_subscribers("s"), bus.dropped
+
+    kept, other_size, subscribed, dropped = run_async(scenario())
+    assert kept == [1, 2]
+    assert other_size == 0
+    assert not subscribed
+    assert dropped == 2
+
+
+def test_stream_sends_snapshot_then_pushed_updates(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="live", current_state=CookState.PREHEAT))
+        await repo.save_prediction(PredictionResult(session_id="live", p50_minutes=600.0))
+        stream = _event_stream("live")
+        frames = [await anext(stream), await anext(stream)]
+        subscribed = session_events.has_subscribers("live")
+        await svc.add_reading("live", ProbeReadingRequest(temp_f=110.0))
+        frames += [await anext(stream), await anext(stream)]
+        await stream.aclose()
+        return frames, subscribed, session_events.has_subscribers("live")
+
+    frames, subscribed, still_subscribed = run_async(scenario())
+    events = [_parse(f) for f in frames]
+    assert [kind for kind, _ in events] == ["state", "prediction", "prediction", "state"]
+    assert events[0][1]["readings_count"] == 0
+    assert events[1][1]["p50_minutes"] == 600.0
+    assert events[3][1]["readings_count"] == 1
+    assert events[3][1]["current_state"] == "early_cook"
+    assert subscribed and not still_subscribed
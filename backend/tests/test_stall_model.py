@@ -1,5 +1,8 @@
 """Tests for the stall model."""
 
+from datetime import datetime, timedelta
+
+import numpy as np
 import pytest
 
 from backend.simulation.stall_model import (
@@ -7,7 +10,14 @@ from backend.simulation.stall_model import (
     detect_stall_override,
     compute_slope,
     compute_slope_history,
+    push_slope,
+    recent_slopes,
+    rolling_slopes,
+    RollingSlopeEstimator,
+    timestamps_to_minutes,
+    update_slope_history,
 )
+from backend.models.dataclasses import SlopeHistory
 
 
 def test_stall_probability_below_zone():
@@ -64,3 +74,96 @@ def test_compute_slope_history():
     assert len(slopes) > 0
     # Slopes should decrease as temp plateaus
     assert slopes[-1] < slopes[0]
+
+
+def test_slope_history_ring_wraps():
+    history = SlopeHistory(capacity=4)
+    for slope in [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]:
+        push_slope(history, slope)
+    assert history.count == 4
+    assert recent_slopes(history) == [3.0, 4.0, 5.0, 6.0]
+
+
+def test_slope_history_tracks_below_threshold_run():
+    history = SlopeHistory()
+    for _ in range(12):
+        push_slope(history, 0.01)
+    assert history.below_threshold_run == 12
+    push_slope(history, 0.5)
+    assert history.below_threshold_run == 0
+
+
+def test_detect_stall_override_with_slope_history():
+    history = SlopeHistory(capacity=8)
+    update_slope_history(history, 150.0, 0.0)
+    for minute in range(1, 11):
+        update_slope_history(history, 150.0, float(minute))
+    # Run length is tracked independently of the ring capacity
+    assert history.count == 8
+    assert detect_stall_override(history, 150.0) is True
+    assert detect_stall_override(history, 120.0) is False
+
+
+def test_slope_history_uses_reading_spacing():
+    # 0.03 °F/min sampled every 30 s: a two-point slope assuming 1-minute
+    # spacing would read 0.015 and count towards a stall
+    history = SlopeHistory()
+    for i in range(30):
+        update_slope_history(history, 150.0 + 0.015 * i, 0.5 * i)
+    assert recent_slopes(history)[-1] == pytest.approx(0.03)
+    assert history.below_threshold_run == 0
+    assert len(history.window.samples) == 20
+
+
+def test_rolling_slope_irregular_timestamps():
+    start = datetime(2024, 7, 4, 8, 0)
+    offsets = [0, 0.5, 3, 3.25, 7, 9.5]  # minutes, irregular spacing
+    est = RollingSlopeEstimator(window_minutes=30)
+    for m in offsets:
+        slope = est.update(start + timedelta(minutes=m), 150.0 + 0.4 * m)
+    assert slope == pytest.approx(0.4)
+
+
+def test_rolling_slope_window_evicts_old_samples():
+    est = RollingSlopeEstimator(window_minutes=5)
+    for m in range(10):
+        est.update(float(m), 100.0 + 2.0 * m)  # steep climb
+    for m in range(10, 20):
+        est.update(float(m), 120.0)  # plateau
+    assert est.n == 5
+    assert est.slope == pytest.approx(0.0)
+
+
+def test_rolling_slopes_matches_streaming():
+    rng = np.random.default_rng(7)
+    minutes = np.cumsum(rng.uniform(0.02, 2.0, size=300))
+    temps = 140.0 + 0.05 * minutes + rng.normal(0, 0.3, size=300)
+
+    est = RollingSlopeEstimator(window_minutes=10)
+    streamed = [est.update(float(m), float(t)) for m, t in zip(minutes, temps)]
+    vectorized = rolling_slopes(minutes, temps, window_minutes=10)
+
+    np.testing.assert_allclose(vectorized, streamed, atol=1e-9)
+
+
+def test_rolling_slopes_matches_streaming_over_long_cook():
+    # 12 hours of 1-second readings: the running sums must not lose
+    # precision as elapsed minutes grow
+    rng = np.random.default_rng(11)
+    minutes = np.arange(12 * 60 * 60 + 1) / 60.0
+    temps = 40.0 + 160.0 * (1.0 - np.exp(-minutes / 300.0)) + rng.normal(0, 0.2, minutes.size)
+
+    est = RollingSlopeEstimator(window_minutes=10)
+    streamed = np.array([est.update(float(m), float(t)) for m, t in zip(minutes, temps)])
+    vectorized = rolling_slopes(minutes, temps, window_minutes=10)
+
+    np.testing.assert_allclose(streamed, vectorized, rtol=0, atol=1e-8)
+    tail = np.polyfit(minutes[-600:], temps[-600:], 1)[0]
+    assert streamed[-1] == pytest.approx(tail, abs=1e-10)
+    assert est.window.sum_t == pytest.approx(sum(m - minutes[-600] for m in minutes[-600:]))
+
+
+def test_timestamps_to_minutes():
+    start = datetime(2024, 7, 4, 8, 0)
+    stamps = [start, start + timedelta(seconds=30), start + timedelta(minutes=2)]
+    np.testing.assert_allclose(timestamps_to_minutes(stamps), [0.0, 0.5, 2.0])
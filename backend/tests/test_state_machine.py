@@ -105,6 +105,16 @@ def test_full_walkthrough():
     assert session.current_state == CookState.DONE
 
 
+def test_flat_readings_enter_stall():
+    session = _make_session(CookState.PRE_STALL)
+    sm = CookStateMachine(session)
+    for minute in range(12):
+        sm.advance(_reading(150.0, elapsed=minute))
+    assert session.current_state == CookState.STALL
+    assert session.stall.in_stall is True
+    assert session.stall.stall_start_minutes == 11
+
+
 def test_finish_method():
     session = _make_session(CookState.APPROACHING_TARGET)
     sm = CookStateMachine(session)
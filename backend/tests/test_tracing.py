@@ -0,0 +1,84 @@
+"""Tests for span tracing and trace export."""
+
+import asyncio
+import json
+import logging
+
+import httpx
+import pytest
+
+from backend.database import repository as repo
+from backend.main import app
+from backend.models.dataclasses import CookSession
+from backend.models.schemas import ProbeReadingRequest
+from backend.services import cook_session_service as svc
+from backend.services.tracing import recent_traces, span, span_breakdown, traced
+from backend.simulation import monte_carlo
+from backend.tests.conftest import run_async
+
+
+@pytest.fixture
+def db_config(fast_monte_carlo):
+    pass
+
+
+def test_spans_nest_across_awaits_and_tasks():
+    @traced("leaf")
+    async def leaf():
+        await asyncio.sleep(0)
+
+    async def scenario():
+        with span("root") as root:
+            with span("stage"):
+                await leaf()
+                await asyncio.gather(leaf(), leaf())
+            with span("stage"):
+                pass
+            return root, span_breakdown()
+
+    root, breakdown = run_async(scenario())
+    assert [child.name for child in root.children] == ["stage", "stage"]
+    assert [child.name for child in root.children[0].children] == ["leaf"] * 3
+    assert set(breakdown) == {"stage", "stage/leaf", "total"}
+    assert breakdown["total"] >= breakdown["stage"] >= breakdown["stage/leaf"]
+    tree = root.to_dict()
+    assert tree["children"][0]["children"][0]["offset_ms"] >= 0
+    assert span_breakdown() == {}
+
+
+def test_reading_added_event_carries_stage_durations(temp_db, caplog):
+    async def scenario():
+        await repo.save_session(CookSession(id="traced"))
+        await svc.add_reading("traced", ProbeReadingRequest(temp_f=110.0))
+
+    with caplog.at_level(logging.INFO, logger="pitmaster"):
+        run_async(scenario())
+    events = [json.loads(r.getMessage()) for r in caplog.records if r.name == "pitmaster"]
+    added = next(e for e in events if e["event"] == "reading_added")
+    spans = added["spans_ms"]
+    for stage in ("load", "state_machine", "monte_carlo", "trust", "save", "publish"):
+        assert stage in spans
+    assert "load/repository.load_session_tail" in spans
+    assert "save/repository.save_reading" in spans
+    assert spans["total"] >= spans["monte_carlo"]
+
+
+def test_requests_are_traced_and_exported(temp_db):
+    async def scenario():
+        await repo.save_session(CookSession(id="exp"))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            await client.get("/api/v1/cook/exp/state")
+            return await client.get("/api/v1/traces", params={"limit": 1})
+
+    recent_traces.clear()
+    response = run_async(scenario())
+    assert response.status_code == 200
+    (trace,) = response.json()
+    assert trace["name"] == "GET /api/v1/cook/{session_id}/state"
+    assert trace["attributes"]["status"] == 200
+    assert len(trace["trace_id"]) == 16
+    revision, summary = trace["children"]
+    assert revision["name"] == "service.get_session_revision"
+    assert summary["name"] == "service.get_session_summary"
+    assert summary["children"][0]["name"] == "repository.load_session_summary"
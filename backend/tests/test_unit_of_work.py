@@ -0,0 +1,106 @@
+"""Tests for the unit of work and group commit."""
+
+import asyncio
+
+import pytest
+
+from backend.config import settings
+from backend.database import db
+from backend.database import repository as repo
+from backend.database import unit_of_work as uow
+from backend.database.session_cache import session_cache
+from backend.models.dataclasses import CookSession, ProbeReading
+from backend.tests.conftest import run_async
+
+
+@pytest.fixture
+def db_config(monkeypatch):
+    """Fresh per-loop commit state for each test."""
+    monkeypatch.setattr(uow, "_state", None)
+
+
+def _reading(session_id: str, minute: int) -> ProbeReading:
+    return ProbeReading(
+        session_id=session_id, temp_f=100.0 + minute, elapsed_minutes=float(minute)
+    )
+
+
+async def _stored_reading_count(session_id: str) -> int:
+    conn = await db.get_db()
+    cursor = await conn.execute(
+        "SELECT COUNT(*) FROM probe_readings WHERE session_id = ?", (session_id,)
+    )
+    return (await cursor.fetchone())[0]
+
+
+@pytest.mark.parametrize("mode", ["immediate", "group", "deferred"])
+def test_failed_unit_rolls_back_and_evicts_cache(temp_db, monkeypatch, mode):
+    monkeypatch.setattr(settings, "db_commit_mode", mode)
+
+    async def scenario():
+        await repo.save_session(CookSession(id="uow-1"))
+        await repo.load_session("uow-1")  # populate the cache
+        with pytest.raises(RuntimeError):
+            async with uow.unit_of_work():
+                await repo.save_reading(_reading("uow-1", 0))
+                await repo.save_reading(_reading("uow-1", 1))
+                raise RuntimeError("MC failed")
+        await uow.flush_pending_commits()
+        cached = "uow-1" in session_cache
+        return cached, await _stored_reading_count("uow-1")
+
+    cached, stored = run_async(scenario())
+    assert cached is False
+    assert stored == 0
+
+
+def test_nested_units_commit_once(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "db_commit_mode", "group")
+
+    async def scenario():
+        async with uow.unit_of_work():
+            await repo.save_session(CookSession(id="uow-2"))
+            for minute in range(5):
+                await repo.save_reading(_reading("uow-2", minute))
+        return uow.group_commit_stats(), await _stored_reading_count("uow-2")
+
+    stats, stored = run_async(scenario())
+    assert stored == 5
+    assert stats["commits"] == 1
+    assert stats["units_committed"] == 1
+
+
+def test_group_mode_coalesces_concurrent_units(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "db_commit_mode", "group")
+    monkeypatch.setattr(settings, "db_group_commit_window_ms", 50.0)
+
+    async def scenario():
+        await repo.save_session(CookSession(id="uow-3"))
+        await asyncio.gather(*(
+            repo.save_reading(_reading("uow-3", minute)) for minute in range(20)
+        ))
+        return uow.group_commit_stats(), await _stored_reading_count("uow-3")
+
+    stats, stored = run_async(scenario())
+    assert stored == 20
+    assert stats["units_committed"] == 21
+    assert stats["commits"] < 21
+    assert stats["pending"] == 0
+
+
+def test_deferred_units_are_committed_on_flush(temp_db, monkeypatch):
+    monkeypatch.setattr(settings, "db_commit_mode", "deferred")
+    monkeypatch.setattr(settings, "db_group_commit_window_ms", 10_000.0)
+
+    async def scenario():
+        await repo.save_session(CookSession(id="uow-4"))
+        await repo.save_reading(_reading("uow-4", 0))
+        pending = uow.group_commit_stats()["pending"]
+        await uow.flush_pending_commits()
+        conn = await db.get_db()
+        return pending, conn.in_transaction, uow.group_commit_stats()
+
+    pending, in_transaction, stats = run_async(scenario())
+    assert pending == 2
+    assert in_transaction is False
+    assert stats["pending"] == 0 and stats["units_committed"] == 2
@@ -17,3 +17,8 @@ export async function apiFetch<T>(
 
   return res.json();
 }
+
+/** URL of a session's server-sent prediction stream. */
+export function streamUrl(sessionId: string): string {
+  return `${API_BASE}/cook/${sessionId}/stream`;
+}
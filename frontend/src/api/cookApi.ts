@@ -57,8 +57,9 @@ export const cookApi = {
     });
   },
 
-  getReport(sessionId: string) {
-    return apiFetch<ReportResponse>(`/cook/${sessionId}/report`);
+  getReport(sessionId: string, maxPoints?: number) {
+    const query = maxPoints ? `?max_points=${maxPoints}` : '';
+    return apiFetch<ReportResponse>(`/cook/${sessionId}/report${query}`);
   },
 
   getEquipmentPresets() {
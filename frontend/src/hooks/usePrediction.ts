@@ -1,20 +1,31 @@
-import { useEffect, useRef } from 'react';
+import { useEffect } from 'react';
+import { streamUrl } from '../api/client';
 import { cookApi } from '../api/cookApi';
 import type { PredictionResponse } from '../types/cook';
 
 /**
- * Auto-poll prediction endpoint every `intervalMs` while a session is active.
+ * Subscribe to pushed prediction updates for an active session.
+ *
+ * Uses the server-sent event stream; if the browser lacks EventSource,
+ * falls back to polling the prediction endpoint every `intervalMs`.
  */
 export function usePrediction(
   sessionId: string | null,
   onUpdate: (pred: PredictionResponse) => void,
   intervalMs = 30000,
 ) {
-  const timerRef = useRef<ReturnType<typeof setInterval>>();
-
   useEffect(() => {
     if (!sessionId) return;
 
+    if (typeof EventSource !== 'undefined') {
+      // EventSource reconnects on its own after network drops
+      const source = new EventSource(streamUrl(sessionId));
+      source.addEventListener('prediction', (event) => {
+        onUpdate(JSON.parse((event as MessageEvent).data));
+      });
+      return () => source.close();
+    }
+
     const poll = async () => {
       try {
         const pred = await cookApi.getPrediction(sessionId);
@@ -24,7 +35,7 @@ export function usePrediction(
       }
     };
 
-    timerRef.current = setInterval(poll, intervalMs);
-    return () => clearInterval(timerRef.current);
+    const timer = setInterval(poll, intervalMs);
+    return () => clearInterval(timer);
   }, [sessionId, onUpdate, intervalMs]);
 }
@@ -111,6 +111,7 @@ export interface ReportResponse {
   predicted_temps: number[];
   actual_temps: number[];
   residuals: number[];
+  elapsed_minutes?: number[];
 }
 
 export interface EquipmentPresetResponse {